@@ -96,6 +96,10 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5MB limit
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5MB limit
 
+# Resume text extraction budget (pages read from a PDF, characters kept from any upload)
+RESUME_MAX_PDF_PAGES = int(os.getenv('RESUME_MAX_PDF_PAGES', '10'))
+RESUME_MAX_TEXT_CHARS = int(os.getenv('RESUME_MAX_TEXT_CHARS', '60000'))
+
 ROOT_URLCONF = '_core.urls'
 
 TEMPLATES = [
@@ -202,6 +206,85 @@ CELERY_BROKER_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')  # R
 CELERY_RESULT_BACKEND = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')  # Replace with Render/Redis Cloud URL
 CELERY_TIMEZONE = 'UTC'
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Extracted resume text and parse results keyed by file hash (see api.resume_cache).
+    # Entries expire after RESUME_CACHE_TTL seconds; configure Redis with maxmemory-policy
+    # allkeys-lru so the least recently used entries are evicted first under memory pressure.
+    'resumes': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+        'TIMEOUT': int(os.getenv('RESUME_CACHE_TTL', 7 * 24 * 60 * 60)),
+        'KEY_PREFIX': 'smartapplicant',
+        'VERSION': 1,  # bump when parser output changes
+        'OPTIONS': {'socket_connect_timeout': 1, 'socket_timeout': 1},
+    },
+    # Parsed job descriptions keyed by the hash of the normalized posting (see api.jd_cache).
+    # Same Redis and eviction policy as above, with a shorter TTL since postings close.
+    'job_descriptions': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+        'TIMEOUT': int(os.getenv('JD_CACHE_TTL', 24 * 60 * 60)),
+        'KEY_PREFIX': 'smartapplicant',
+        'VERSION': 2,  # bump when parser output changes
+        'OPTIONS': {'socket_connect_timeout': 1, 'socket_timeout': 1},
+    },
+    # Gemini responses keyed by prompt hash, plus the in-flight locks that let concurrent
+    # identical prompts share one upstream call (see api.ai_cache).
+    'ai_responses': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+        'TIMEOUT': int(os.getenv('AI_CACHE_TTL', 3 * 24 * 60 * 60)),
+        'KEY_PREFIX': 'smartapplicant',
+        'VERSION': 1,  # bump when prompts or models change meaning
+        'OPTIONS': {'socket_connect_timeout': 1, 'socket_timeout': 1},
+    },
+    # Generated resumes keyed by task id until downloaded or expired (see api.document_store).
+    # Shared by all web nodes and workers; a FileBasedCache on a shared path can stand in
+    # for Redis in local development.
+    'documents': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+        'TIMEOUT': int(os.getenv('DOCUMENT_TTL', 60 * 60)),
+        'KEY_PREFIX': 'smartapplicant',
+        'OPTIONS': {'socket_connect_timeout': 1, 'socket_timeout': 5},
+    },
+    # PDF renderings keyed by the hash of the source DOCX's contents, so the same
+    # document is never converted twice (see api.pdf_renderer). They hold the same
+    # personal data as the documents above, so they expire with them by default.
+    'pdf_renders': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+        'TIMEOUT': int(os.getenv('PDF_CACHE_TTL', os.getenv('DOCUMENT_TTL', 60 * 60))),
+        'KEY_PREFIX': 'smartapplicant',
+        'OPTIONS': {'socket_connect_timeout': 1, 'socket_timeout': 5},
+    },
+}
+
+# Gemini requests per minute and burst size per model, shared by all workers (see api.ai_limits)
+GEMINI_RATE_LIMITS = {
+    'gemini-flash-lite-latest': {
+        'rpm': int(os.getenv('GEMINI_LITE_RPM', 30)),
+        'burst': int(os.getenv('GEMINI_LITE_BURST', 10)),
+    },
+    'gemini-flash-latest': {
+        'rpm': int(os.getenv('GEMINI_FLASH_RPM', 10)),
+        'burst': int(os.getenv('GEMINI_FLASH_BURST', 5)),
+    },
+}
+
+# Warm headless LibreOffice processes per Celery worker process for PDF output (see api.pdf_renderer).
+# A prefork child runs one task at a time, so one converter each is enough; raise it only
+# for threaded workers.
+LIBREOFFICE_PATH = os.getenv('LIBREOFFICE_PATH', 'soffice')
+PDF_CONVERTER_WORKERS = int(os.getenv('PDF_CONVERTER_WORKERS', 1))
+PDF_CONVERSION_TIMEOUT = int(os.getenv('PDF_CONVERSION_TIMEOUT', 60))  # seconds per job before the process is killed
+PDF_QUEUE_TIMEOUT = int(os.getenv('PDF_QUEUE_TIMEOUT', 30))  # seconds to wait for an idle converter
+PDF_WORKER_MAX_JOBS = int(os.getenv('PDF_WORKER_MAX_JOBS', 100))  # conversions before a process is recycled
+
+
 EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')  # Default to SMTP backend
 EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')  # Default to Gmail SMTP
 EMAIL_PORT = os.getenv('EMAIL_PORT', '587')  # Default SMTP port for TLS
@@ -2,10 +2,16 @@ from dotenv import load_dotenv
 import os
 import json
 import requests
+from . import http_client
+from .ai_cache import cached_completion, forget_response
+from .ai_limits import MAX_QUEUE_WAIT, admit, report
 
 # Load environment variables
 load_dotenv()
 
+GEMINI_MODEL = "gemini-flash-lite-latest"
+GEMINI_FALLBACK_MODEL = "gemini-flash-latest"
+
 # context = {}
 def get_available_models() -> list[str]:
     """Fetch the list of models available to the account using the API key."""
@@ -15,7 +21,7 @@ def get_available_models() -> list[str]:
 
     url = f"https://generativelanguage.googleapis.com/v1beta/models?key={api_key}"
     try:
-        response = requests.get(url, timeout=30)
+        response = http_client.get(url, timeout=(5, 30))
         response.raise_for_status()
         data = response.json()
 
@@ -27,14 +33,31 @@ def get_available_models() -> list[str]:
         print(f"Error fetching models: {e}")
         return []
 
-def call_gemini(prompt: str) -> str:
-    """Call Gemini API with retry on 4xx errors using available models."""
+def call_gemini(prompt: str, use_cache: bool = True, max_wait: float = MAX_QUEUE_WAIT) -> str:
+    """
+    Call Gemini API, reusing the response to an identical prompt.
+
+    Responses are cached by prompt hash and concurrent identical prompts share one
+    upstream call (see api.ai_cache). Pass use_cache=False to always call upstream.
+    max_wait is how long each model may wait for a rate-limit slot; callers answering a
+    web request pass api.ai_limits.REQUEST_QUEUE_WAIT so the request is not held up.
+    """
+    if not use_cache:
+        return _request_gemini(prompt, max_wait)
+    return cached_completion(GEMINI_MODEL, prompt, lambda: _request_gemini(prompt, max_wait))
+
+def forget_gemini_response(prompt: str):
+    """Drop the cached response to prompt, e.g. after it failed to parse, so a retry calls Gemini again."""
+    forget_response(GEMINI_MODEL, prompt)
+
+def _request_gemini(prompt: str, max_wait: float = MAX_QUEUE_WAIT) -> str:
+    """Call Gemini API, falling back to GEMINI_FALLBACK_MODEL within the shared rate limits (see api.ai_limits)."""
     api_key = os.getenv("GEMENAI_API_KEY")
     if not api_key:
         raise ValueError("GEMENAI_API_KEY not set in environment variables.")
 
     # Default model (your old one)
-    model_id = "gemini-flash-lite-latest"
+    model_id = GEMINI_MODEL
 
     def _make_request(model: str) -> requests.Response:
         url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
@@ -44,27 +67,30 @@ def call_gemini(prompt: str) -> str:
                 {"parts": [{"text": prompt}]}
             ]
         }
-        return requests.post(url, headers=headers, json=payload, timeout=60)
-
+        return http_client.post(url, headers=headers, json=payload, timeout=(5, 60))
+
+    # Primary model first; fall back when it is rate limited, its circuit is open, or it fails
+    response = None
+    for model in (model_id, GEMINI_FALLBACK_MODEL):
+        if not admit(model, max_wait):
+            print(f"[Warning] {model} skipped: circuit open or rate limit reached")
+            continue
+        try:
+            response = _make_request(model)
+        except requests.exceptions.RequestException as e:
+            print(f"Request error ({model}): {e}")
+            report(model, None)
+            continue
+        report(model, response.status_code)
+        if response.ok:
+            break
+        if model != GEMINI_FALLBACK_MODEL:
+            print(f"{model} failed with {response.status_code}, retrying with fallback model: {GEMINI_FALLBACK_MODEL}")
+
+    if response is None:
+        print("Gemini unavailable: no model accepted the request")
+        return ""
     try:
-        response = _make_request(model_id)
-
-        # If a 4xx error happens, try a fallback model
-        if 400 <= response.status_code < 500:
-            # print(f"[Warning] {model_id} failed with {response.status_code}, retrying with available models...")
-
-            # models = get_available_models()
-            # if not models:
-            #     print("No available models found to retry.")
-            #     response.raise_for_status()  # re-raise the original error
-
-            # pick one model at random for retry (could be smarter, e.g. prefer flash/pro)
-            # fallback_model = models[0]
-            fallback_model = 'gemini-flash-latest'
-            print(f"Retrying with fallback model: {fallback_model}")
-
-            response = _make_request(fallback_model)
-
         response.raise_for_status()  # Raise for any remaining 4xx/5xx
         data = response.json()
 
@@ -74,7 +100,7 @@ def call_gemini(prompt: str) -> str:
         return ""
     except (KeyError, IndexError) as parse_err:
         print(f"Error parsing Gemini response: {parse_err}")
-        print(response.text if 'response' in locals() else "")
+        print(response.text)
         return ""    
 
 def save_context(text, response, user_id):
@@ -258,20 +284,25 @@ def match_resume_to_jd_with_ai(resume_text:str, job_description:str):
         text = text.replace('```', '')
         response = json.loads(text)
     except Exception as e:
+        forget_gemini_response(prompt)
         response = ''
     
     return response
 
+def parse_structured_response(text: str):
+    """Decode a JSON answer from Gemini, stripping the code fences it sometimes adds."""
+    text = text.replace('```json', '')
+    text = text.replace('```', '')
+    return json.loads(text)
+
 def get_structured_data_from_gemini(prompt: str):
     """This method will call gemini api directly and return the structured data."""
     response = ''
     try:
-        text = call_gemini(prompt)
-        text = text.replace('```json', '')
-        text = text.replace('```', '')
-        response = json.loads(text)
+        response = parse_structured_response(call_gemini(prompt))
     except Exception as e:
         print(f'Error parsing Gemini response: {e}')
+        forget_gemini_response(prompt)
         response = ''
     
     return response
\ No newline at end of file
@@ -0,0 +1,162 @@
+import asyncio
+import os
+from typing import List, Optional, Sequence
+import httpx
+from .ai import GEMINI_MODEL, GEMINI_FALLBACK_MODEL
+from .ai_cache import get_cached_response, store_response
+from .ai_limits import admit, report
+
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+MAX_CONCURRENCY = 8  # prompts in flight at once; keep within the account's requests-per-minute quota
+
+
+class AsyncGeminiClient:
+    """
+    Concurrent Gemini client for batches of independent prompts.
+
+    At most max_concurrency prompts are in flight at once; connections are pooled and
+    kept alive for the whole batch. Like call_gemini, a failed or skipped primary request
+    is retried on the fallback model. With hedge_after (seconds), a prompt whose primary
+    request has not answered by then also goes to the fallback model, and the first
+    non-empty answer wins; this trades extra tokens for tail latency, so it is off by default.
+    Every request goes through the shared per-model rate limit and circuit breaker.
+    Failed prompts give "" rather than raising, like call_gemini.
+
+        async with AsyncGeminiClient() as client:
+            answers = await client.gather(prompts)
+    """
+
+    def __init__(self, api_key: Optional[str] = None, max_concurrency: int = MAX_CONCURRENCY,
+                 hedge_after: Optional[float] = None, model: str = GEMINI_MODEL,
+                 fallback_model: str = GEMINI_FALLBACK_MODEL):
+        self.api_key = api_key or os.getenv("GEMENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError("GEMENAI_API_KEY not set in environment variables.")
+        self.model = model
+        self.fallback_model = fallback_model
+        self.hedge_after = hedge_after
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60, connect=5),
+            limits=httpx.Limits(max_connections=self.max_concurrency * 2,
+                                max_keepalive_connections=self.max_concurrency),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    async def _request(self, model: str, prompt: str) -> httpx.Response:
+        return await self._client.post(
+            GEMINI_URL.format(model=model),
+            params={'key': self.api_key},
+            json={"contents": [{"parts": [{"text": prompt}]}]},
+        )
+
+    @staticmethod
+    def _text(response: httpx.Response) -> str:
+        response.raise_for_status()
+        return response.json()['candidates'][0]['content']['parts'][0]['text']
+
+    async def _limited_request(self, model: str, prompt: str) -> Optional[httpx.Response]:
+        """Request within the shared rate limit and circuit breaker (see api.ai_limits); None if not admitted."""
+        if not await asyncio.to_thread(admit, model):
+            print(f"[Warning] {model} skipped: circuit open or rate limit reached")
+            return None
+        try:
+            response = await self._request(model, prompt)
+        except httpx.TransportError:
+            await asyncio.to_thread(report, model, None)
+            raise
+        await asyncio.to_thread(report, model, response.status_code)
+        return response
+
+    async def _primary_then_fallback(self, prompt: str) -> str:
+        try:
+            response = await self._limited_request(self.model, prompt)
+        except httpx.TransportError as e:
+            print(f"Request error: {e}")
+            response = None
+        if response is None or not response.is_success:
+            print(f"Retrying with fallback model: {self.fallback_model}")
+            response = await self._limited_request(self.fallback_model, prompt) or response
+        if response is None:
+            raise httpx.HTTPError("no model accepted the request")
+        return self._text(response)
+
+    async def _fallback(self, prompt: str) -> str:
+        response = await self._limited_request(self.fallback_model, prompt)
+        return self._text(response) if response is not None else ''
+
+    async def _hedged(self, prompt: str) -> str:
+        primary = asyncio.ensure_future(self._primary_then_fallback(prompt))
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+        if done:
+            return primary.result()
+
+        pending = {primary, asyncio.ensure_future(self._fallback(prompt))}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and task.result():
+                        return task.result()
+                    error = task.exception() or error
+            if error is not None:
+                raise error
+            return ''
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def generate(self, prompt: str) -> str:
+        async with self._semaphore:
+            try:
+                if self.hedge_after is None:
+                    return await self._primary_then_fallback(prompt)
+                return await self._hedged(prompt)
+            except httpx.HTTPError as e:
+                print(f"Request error: {e}")
+            except (KeyError, IndexError, ValueError) as parse_err:
+                print(f"Error parsing Gemini response: {parse_err}")
+            return ''
+
+    async def gather(self, prompts: Sequence[str]) -> List[str]:
+        """Answers for prompts, in order."""
+        return list(await asyncio.gather(*(self.generate(prompt) for prompt in prompts)))
+
+
+def gather_prompts(prompts: Sequence[str], max_concurrency: int = MAX_CONCURRENCY,
+                   hedge_after: Optional[float] = None, use_cache: bool = True) -> List[str]:
+    """
+    Send prompts to Gemini concurrently and return the answers in order ("" for failures).
+
+    Synchronous entry point for Celery tasks and management commands. With use_cache,
+    prompts already answered (see api.ai_cache) are not sent, repeated prompts in the
+    batch are sent once, and new non-empty answers are cached.
+    """
+    answers = {}
+    if use_cache:
+        for prompt in prompts:
+            if prompt not in answers:
+                cached = get_cached_response(GEMINI_MODEL, prompt)
+                if cached is not None:
+                    answers[prompt] = cached
+    missing = list(dict.fromkeys(prompt for prompt in prompts if prompt not in answers))
+
+    if missing:
+        async def run():
+            async with AsyncGeminiClient(max_concurrency=max_concurrency, hedge_after=hedge_after) as client:
+                return await client.gather(missing)
+
+        for prompt, answer in zip(missing, asyncio.run(run())):
+            answers[prompt] = answer
+            if use_cache:
+                store_response(GEMINI_MODEL, prompt, answer)
+    return [answers[prompt] for prompt in prompts]
@@ -0,0 +1,133 @@
+import hashlib
+import time
+import uuid
+from typing import Callable
+from django.core.cache import caches
+
+# Cache alias configured in settings.CACHES
+AI_CACHE_ALIAS = 'ai_responses'
+LOCK_TIMEOUT = 150    # longest a leader may hold a prompt: two upstream attempts of 60 s plus slack
+POLL_INTERVAL = 0.25  # how often followers check for the leader's result
+RETRY_AFTER = 30      # seconds the cache is skipped after an error, so calls don't each wait on a dead Redis
+
+_unavailable_until = 0.0
+
+
+def _available() -> bool:
+    return time.monotonic() >= _unavailable_until
+
+
+def _mark_unavailable(error: Exception) -> None:
+    global _unavailable_until
+    _unavailable_until = time.monotonic() + RETRY_AFTER
+    print(f'AI response cache unavailable: {error}')
+
+
+def prompt_digest(model: str, prompt: str) -> str:
+    return hashlib.sha256(f'{model}\n{prompt}'.encode('utf-8')).hexdigest()
+
+
+def _result_key(digest: str) -> str:
+    return f'ai:response:{digest}'
+
+
+def _lock_key(digest: str) -> str:
+    return f'ai:inflight:{digest}'
+
+
+def cached_completion(model: str, prompt: str, compute: Callable[[], str],
+                      lock_timeout: float = LOCK_TIMEOUT, poll_interval: float = POLL_INTERVAL) -> str:
+    """
+    Return the cached response for (model, prompt), or compute it with single-flight coalescing.
+
+    The first caller to miss takes a short-lived lock (an atomic cache.add) and calls
+    compute(); concurrent callers with the same prompt, in any process or Celery worker,
+    wait for its result instead of calling upstream themselves. Empty responses (failed
+    calls) are not cached. If the cache is unavailable, or the leader does not finish
+    within lock_timeout, callers fall back to compute(); after a cache error the cache is
+    skipped for RETRY_AFTER seconds.
+    """
+    if not _available():
+        return compute()
+    digest = prompt_digest(model, prompt)
+    try:
+        cache = caches[AI_CACHE_ALIAS]
+        cached = cache.get(_result_key(digest))
+    except Exception as e:
+        _mark_unavailable(e)
+        return compute()
+    if cached is not None:
+        return cached
+
+    deadline = time.monotonic() + lock_timeout
+    token = uuid.uuid4().hex
+    while True:
+        try:
+            leader = cache.add(_lock_key(digest), token, timeout=lock_timeout)
+        except Exception as e:
+            _mark_unavailable(e)
+            return compute()
+        if leader:
+            return _compute_as_leader(cache, digest, token, compute)
+
+        # Another caller is fetching this prompt: wait for its result. If it fails (lock
+        # released without a result), the next add() makes this caller the leader.
+        time.sleep(poll_interval)
+        try:
+            cached = cache.get(_result_key(digest))
+        except Exception as e:
+            _mark_unavailable(e)
+            return compute()
+        if cached is not None:
+            return cached
+        if time.monotonic() >= deadline:
+            return compute()
+
+
+def _compute_as_leader(cache, digest: str, token: str, compute: Callable[[], str]) -> str:
+    try:
+        response = compute()
+        if response:
+            try:
+                cache.set(_result_key(digest), response)
+            except Exception as e:
+                _mark_unavailable(e)
+        return response
+    finally:
+        try:
+            # Release only our own lock; an expired lock may have been taken over meanwhile
+            if cache.get(_lock_key(digest)) == token:
+                cache.delete(_lock_key(digest))
+        except Exception as e:
+            _mark_unavailable(e)
+
+
+def forget_response(model: str, prompt: str) -> None:
+    """Drop a cached response, e.g. one the caller could not parse, so the next call goes upstream."""
+    if not _available():
+        return
+    try:
+        caches[AI_CACHE_ALIAS].delete(_result_key(prompt_digest(model, prompt)))
+    except Exception as e:
+        _mark_unavailable(e)
+
+
+
+def get_cached_response(model: str, prompt: str):
+    """The cached response for (model, prompt), or None; for batch callers that skip coalescing."""
+    if not _available():
+        return None
+    try:
+        return caches[AI_CACHE_ALIAS].get(_result_key(prompt_digest(model, prompt)))
+    except Exception as e:
+        _mark_unavailable(e)
+        return None
+
+
+def store_response(model: str, prompt: str, response: str) -> None:
+    if not response or not _available():
+        return
+    try:
+        caches[AI_CACHE_ALIAS].set(_result_key(prompt_digest(model, prompt)), response)
+    except Exception as e:
+        _mark_unavailable(e)
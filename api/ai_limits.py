@@ -0,0 +1,227 @@
+import os
+import threading
+import time
+from typing import Optional
+import redis
+from django.conf import settings
+from django.core.cache import caches
+from .ai_cache import AI_CACHE_ALIAS, _available as _cache_available, _mark_unavailable as _mark_cache_unavailable
+
+# Requests per minute and burst size per model, overridable with settings.GEMINI_RATE_LIMITS
+DEFAULT_RATE_LIMITS = {
+    'gemini-flash-lite-latest': {'rpm': 30, 'burst': 10},
+    'gemini-flash-latest': {'rpm': 10, 'burst': 5},
+}
+MAX_QUEUE_WAIT = 20       # seconds a call may wait for a token before it is rejected
+REQUEST_QUEUE_WAIT = 0    # the same for calls made while a web request waits on the answer
+FAILURE_THRESHOLD = 5     # 429/5xx answers within FAILURE_WINDOW that open a model's circuit
+FAILURE_WINDOW = 60
+OPEN_SECONDS = 30         # how long an open circuit skips the model before one probe is let through
+RETRY_AFTER = 30          # seconds the rate limiter is skipped after a Redis error
+
+# Token bucket refilled continuously at rate tokens/s up to capacity, timed by the Redis clock.
+# Takes a token and returns "0", or returns the seconds until one is available.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+_client: Optional[redis.Redis] = None
+_client_lock = threading.Lock()
+_script = None
+_unavailable_until = 0.0
+
+
+def _available() -> bool:
+    return time.monotonic() >= _unavailable_until
+
+
+def _mark_unavailable(error: Exception) -> None:
+    global _unavailable_until
+    _unavailable_until = time.monotonic() + RETRY_AFTER
+    print(f'Rate limiter unavailable: {error}')
+
+
+def _redis() -> redis.Redis:
+    global _client, _script
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                url = getattr(settings, 'REDIS_URL', None) or os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+                client = redis.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=1)
+                _script = client.register_script(TOKEN_BUCKET_SCRIPT)
+                _client = client
+    return _client
+
+
+def _limits(model: str) -> dict:
+    limits = getattr(settings, 'GEMINI_RATE_LIMITS', DEFAULT_RATE_LIMITS)
+    return limits.get(model) or DEFAULT_RATE_LIMITS.get(model) or {'rpm': 10, 'burst': 5}
+
+
+def _metric(model: str, name: str, amount: int = 1) -> None:
+    """Add to a per-model counter shared by all workers (see gemini_metrics)."""
+    cache = caches[AI_CACHE_ALIAS]
+    key = f'ai:metrics:{model}:{name}'
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        if not cache.add(key, amount, timeout=None):
+            cache.incr(key, amount)
+
+
+def record_metric(model: str, name: str, amount: int = 1) -> None:
+    if not _cache_available():
+        return
+    try:
+        _metric(model, name, amount)
+    except Exception as e:
+        _mark_cache_unavailable(e)
+
+
+def acquire_token(model: str, max_wait: float = MAX_QUEUE_WAIT) -> bool:
+    """
+    Take one request slot for model from the shared token bucket, waiting up to max_wait
+    seconds. Returns False (and counts a rejection) if none frees up in time. If Redis is
+    unavailable the call is let through, and so is every call for RETRY_AFTER seconds after.
+    Calls from a web request should pass REQUEST_QUEUE_WAIT rather than wait for a token.
+    """
+    if not _available():
+        return True
+    limits = _limits(model)
+    rate = limits['rpm'] / 60
+    started = time.monotonic()
+    try:
+        _redis()
+        while True:
+            wait = float(_script(keys=[f'smartapplicant:ai:bucket:{model}'], args=[rate, limits['burst']]))
+            waited = time.monotonic() - started
+            if wait <= 0:
+                if waited:
+                    record_metric(model, 'queue_wait_ms', int(waited * 1000))
+                record_metric(model, 'acquired')
+                return True
+            if waited + wait > max_wait:
+                record_metric(model, 'rejected')
+                return False
+            time.sleep(wait)
+    except redis.RedisError as e:
+        _mark_unavailable(e)
+        return True
+
+
+class CircuitBreaker:
+    """
+    Per-model circuit breaker shared through the AI cache.
+
+    FAILURE_THRESHOLD failures (429/5xx/connection errors) within FAILURE_WINDOW seconds
+    open the circuit: allow() is False for OPEN_SECONDS, so callers route to the fallback
+    model instead of spending requests on an overloaded one. After that one caller at a
+    time is let through as a probe; a success closes the circuit, a failure reopens it.
+    While the AI cache is unavailable (see api.ai_cache) every model is allowed.
+    """
+
+    def __init__(self, threshold: int = FAILURE_THRESHOLD, window: int = FAILURE_WINDOW,
+                 open_seconds: int = OPEN_SECONDS):
+        self.threshold = threshold
+        self.window = window
+        self.open_seconds = open_seconds
+
+    @property
+    def cache(self):
+        return caches[AI_CACHE_ALIAS]
+
+    def allow(self, model: str) -> bool:
+        if not _cache_available():
+            return True
+        try:
+            opened_at = self.cache.get(f'ai:circuit:{model}:opened')
+            if opened_at is None:
+                return True
+            if time.time() - opened_at < self.open_seconds:
+                record_metric(model, 'short_circuited')
+                return False
+            # Half open: a single probe until it reports back (or its slot expires)
+            return self.cache.add(f'ai:circuit:{model}:probe', 1, timeout=self.open_seconds)
+        except Exception as e:
+            _mark_cache_unavailable(e)
+            return True
+
+    def record_success(self, model: str) -> None:
+        if not _cache_available():
+            return
+        try:
+            opened_at = self.cache.get(f'ai:circuit:{model}:opened')
+            if opened_at is not None:
+                record_metric(model, 'open_circuit_ms', int((time.time() - opened_at) * 1000))
+            self.cache.delete_many([f'ai:circuit:{model}:opened', f'ai:circuit:{model}:probe',
+                                    f'ai:circuit:{model}:failures'])
+        except Exception as e:
+            _mark_cache_unavailable(e)
+
+    def record_failure(self, model: str) -> None:
+        record_metric(model, 'failures')
+        if not _cache_available():
+            return
+        opened_key, probe_key, failures_key = (f'ai:circuit:{model}:opened', f'ai:circuit:{model}:probe',
+                                               f'ai:circuit:{model}:failures')
+        try:
+            opened_at = self.cache.get(opened_key)
+            probe_failed = opened_at is not None and self.cache.get(probe_key) is not None
+            if opened_at is not None and not probe_failed:
+                return  # already open; a call that started before it opened
+            failures = 1 if self.cache.add(failures_key, 1, timeout=self.window) else self.cache.incr(failures_key)
+            if failures >= self.threshold or probe_failed:
+                self.cache.set(opened_key, time.time(), timeout=None)
+                self.cache.delete_many([probe_key, failures_key])
+                record_metric(model, 'circuit_opened')
+        except Exception as e:
+            _mark_cache_unavailable(e)
+
+
+CIRCUIT_BREAKER = CircuitBreaker()
+
+
+def admit(model: str, max_wait: float = MAX_QUEUE_WAIT) -> bool:
+    """True if a request may be sent to model now: its circuit is closed and a rate-limit token was taken."""
+    return CIRCUIT_BREAKER.allow(model) and acquire_token(model, max_wait)
+
+
+def report(model: str, status_code: Optional[int]) -> None:
+    """Feed a request's outcome to the circuit breaker; status_code None means a connection error."""
+    if status_code is None or status_code == 429 or status_code >= 500:
+        CIRCUIT_BREAKER.record_failure(model)
+    else:
+        CIRCUIT_BREAKER.record_success(model)
+
+
+def gemini_metrics(models=None) -> dict:
+    """Shared counters per model: acquired, rejected, queue_wait_ms, failures, circuit_opened, ..."""
+    names = ('acquired', 'rejected', 'queue_wait_ms', 'failures', 'circuit_opened',
+             'short_circuited', 'open_circuit_ms')
+    models = models or list(DEFAULT_RATE_LIMITS)
+    keys = {f'ai:metrics:{model}:{name}': (model, name) for model in models for name in names}
+    try:
+        values = caches[AI_CACHE_ALIAS].get_many(list(keys))
+    except Exception as e:
+        return {'status': 0, 'message': str(e)}
+    metrics = {model: dict.fromkeys(names, 0) for model in models}
+    for key, value in values.items():
+        model, name = keys[key]
+        metrics[model][name] = value
+    return metrics
@@ -0,0 +1,134 @@
+from functools import cached_property
+from .resume_parser import ResumeParser
+from .jd_cache import get_jd_analysis
+from .keyword_coverage import keyword_coverage
+from .resources import technical_keywords
+from .ai import match_resume_to_jd_with_ai
+from .utils import (PARSE_STEP_CACHE, parse_resume, analyze_metadata, analyze_education, analyze_skills,
+                    analyze_experience, analyze_certificates, resume_sectional_analysis, match_job_field,
+                    compare_ats_score, calculate_suitability_score)
+
+
+class AnalysisContext:
+    """
+    One resume, optionally with a job description and a target job title, analyzed once.
+
+    Every stage is a cached property: it is computed the first time a view or task asks
+    for it, from the shared parse results, and then reused.
+    Pass analysis (a parse_all() result, e.g. from extract_and_analyze) to skip the parse.
+    """
+
+    def __init__(self, resume_text, job_description='', job_title='', analysis=None):
+        self.resume_text = resume_text
+        self.job_description = job_description
+        self.job_title = job_title
+        if analysis is not None:
+            self.analysis = analysis
+
+    # shared inputs
+    @cached_property
+    def parser(self):
+        return ResumeParser(self.resume_text)
+
+    @cached_property
+    def analysis(self):
+        """parse_all() result for the resume"""
+        return self.parser.parse_all(cache=PARSE_STEP_CACHE)
+
+    @cached_property
+    def jd_analysis(self):
+        """Skills, education, experience_duration and certifications of the job description"""
+        return get_jd_analysis(self.job_description)
+
+    @cached_property
+    def normalized_text(self):
+        return self.resume_text.lower()
+
+    @cached_property
+    def field_match(self):
+        return match_job_field(self.job_title, technical_keywords)
+
+    # resume-only stages
+    @cached_property
+    def parsed_data(self):
+        return parse_resume(self.resume_text, self.analysis)
+
+    @property
+    def ats_score(self):
+        return self.analysis.get('ats_score', 0)
+
+    @cached_property
+    def score_comparison(self):
+        """Percentile of the ATS score; records the score, so it runs at most once per context"""
+        return compare_ats_score(self.ats_score)
+
+    @cached_property
+    def sectional_analysis(self):
+        return resume_sectional_analysis(self.analysis)
+
+    @cached_property
+    def basic_suggestions(self):
+        return list(set(self.analysis.get('errors', [])))
+
+    @cached_property
+    def keyword_coverage(self):
+        return keyword_coverage(self.normalized_text, self.field_match['expected_keywords'], score_cutoff=85)
+
+    @cached_property
+    def metadata(self):
+        return analyze_metadata(self.analysis['metadata'])
+
+    # stages matched against the job description
+    @cached_property
+    def education(self):
+        return analyze_education(self.analysis['education'], self.jd_analysis['education'])
+
+    @cached_property
+    def skills(self):
+        return analyze_skills(self.jd_analysis['skills'], self.normalized_text)
+
+    @cached_property
+    def experience(self):
+        return analyze_experience(self.analysis['experience_duration'], self.jd_analysis['experience_duration'])
+
+    @cached_property
+    def certifications(self):
+        return analyze_certificates(self.analysis['certifications'], self.jd_analysis['certifications'])
+
+    def basic_analysis(self):
+        return {
+            "ats_score": self.ats_score,
+            "score_comparison": self.score_comparison,
+            "sectional_analysis": self.sectional_analysis,
+            "suggestions": self.basic_suggestions
+        }
+
+    def sectional_matching(self):
+        return {
+            section: {
+                "match_percentage": result.get('score', 0),
+                "matched": result.get('matched', []),
+                "missing": result.get('missing', [])
+            }
+            for section, result in (('skills', self.skills), ('education', self.education),
+                                    ('experience', self.experience), ('certifications', self.certifications))
+        }
+
+    def job_matching(self):
+        """Match against the job description computed here, in the shape of match_resume_to_jd_with_ai's answer"""
+        return {
+            "suitability_score": calculate_suitability_score(self.keyword_coverage | {'ats_score': self.ats_score}),
+            "keyword_coverage": self.keyword_coverage,
+            "sectional_matching": self.sectional_matching(),
+            "suggestions": []
+        }
+
+
+def match_resume_with_jd(resume_text, job_description, user, job_title=''):
+    """Analyze resume against a job description."""
+    context = AnalysisContext(resume_text, job_description, job_title)
+    return {
+        "basic_analysis": context.basic_analysis(),
+        # Use AI to analyze the resume against the job description, or match it here if AI gives no answer
+        "job_matching": match_resume_to_jd_with_ai(resume_text, job_description) or context.job_matching()
+    }
@@ -0,0 +1,48 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
+from .lexicon import get_skill_lexicon
+from .resume_parser import ResumeParser
+
+
+def _init_worker():
+    """Load the skill lexicon (and its automata) once per worker process."""
+    get_skill_lexicon()
+
+
+def parse_one(resume_text: str) -> dict:
+    """
+    Parse a single resume and return the parse_all() result.
+
+    Failures come back as {'status': 0, 'message': ...} instead of stopping the batch.
+    """
+    try:
+        return ResumeParser(resume_text or '').parse_all()
+    except Exception as e:
+        return {'status': 0, 'message': str(e)}
+
+
+def parse_many(texts: Iterable[str], workers: Optional[int] = None, max_pending: Optional[int] = None) -> Iterator[dict]:
+    """
+    Parse many resumes across a process pool, yielding results in input order.
+
+    texts is consumed lazily and at most max_pending parses (default: 4 per worker)
+    are in flight at a time, so arbitrarily large backlogs can be streamed.
+    workers=1 parses in the calling process without starting a pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for resume_text in texts:
+            yield parse_one(resume_text)
+        return
+
+    max_pending = max_pending or workers * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        pending = deque()
+        for resume_text in texts:
+            pending.append(executor.submit(parse_one, resume_text))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
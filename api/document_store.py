@@ -0,0 +1,72 @@
+import re
+from typing import Optional, Tuple
+from django.core.cache import caches
+
+# Cache alias configured in settings.CACHES; entries expire after DOCUMENT_TTL seconds.
+DOCUMENT_STORE_ALIAS = 'documents'
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _key(document_key: str) -> str:
+    return f'document:{document_key}'
+
+
+def store_document(document_key: str, data: bytes, filename: str, user_id: Optional[int] = None,
+                   content_type: str = DOCX_CONTENT_TYPE) -> None:
+    """
+    Keep a generated document for download under document_key (the generating task's id).
+
+    Every web node and worker sees the same store, and unclaimed documents simply expire.
+    Only user_id can download the document; one stored without an owner is never served.
+    Errors propagate: a document that was not stored cannot be downloaded.
+    """
+    caches[DOCUMENT_STORE_ALIAS].set(_key(document_key), {
+        'data': data,
+        'filename': filename,
+        'user_id': user_id,
+        'content_type': content_type,
+    })
+
+
+def get_document(document_key: str) -> Optional[dict]:
+    """{'data', 'filename', 'user_id', 'content_type'} for a stored document, or None."""
+    try:
+        return caches[DOCUMENT_STORE_ALIAS].get(_key(document_key))
+    except Exception as e:
+        print(f'Document store unavailable: {e}')
+        return None
+
+
+def delete_document(document_key: str) -> None:
+    try:
+        caches[DOCUMENT_STORE_ALIAS].delete(_key(document_key))
+    except Exception as e:
+        print(f'Document store unavailable: {e}')
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    The (start, end) bytes, end inclusive, of a single-range "Range: bytes=..." header.
+
+    Returns None when the whole document should be sent (no header, several ranges or an
+    invalid one); raises ValueError when the range starts past the end.
+    """
+    match = RANGE_RE.match((header or '').strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError('unsatisfiable range')
+        return max(0, size - length), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None  # invalid, so ignored
+    if start >= size:
+        raise ValueError('unsatisfiable range')
+    return start, min(int(last), size - 1) if last else size - 1
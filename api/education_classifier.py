@@ -0,0 +1,56 @@
+import re
+from typing import Optional, Tuple
+from .keyword_matcher import KeywordMatcher
+from .resources import degree_keywords, institution_keywords
+
+
+class EducationClassifier:
+    """
+    Degree and institution recognizer compiled once from resources.
+
+    Keywords keep their regex meaning from the original inline patterns (an unescaped
+    '.' matches any character), so results are unchanged. Degree/field extraction still
+    prefers the longest keyword, but only keywords whose literal text occurs in the line
+    are tried: a keyword matcher over each keyword's longest dot-free segment picks them
+    out in one scan.
+    """
+
+    def __init__(self, degrees=degree_keywords, institutions=institution_keywords):
+        self.degree_re = re.compile(r'\b(?:' + '|'.join(degrees) + r')\b', re.I)
+        self.institution_re = re.compile(r'\b(?:' + '|'.join(institutions) + r')\b', re.I)
+
+        # Longest keyword first; sorted() is stable, so ties keep resource order
+        ranked = sorted(degrees, key=len, reverse=True)
+        self._degree_field_res = [re.compile(rf'({degree})\s*(in)?\s*([\w &/-]+)') for degree in ranked]
+        anchors = [max(degree.split('.'), key=len) for degree in ranked]
+        self._anchor_ranks = {}
+        for rank, anchor in enumerate(anchors):
+            self._anchor_ranks.setdefault(anchor, []).append(rank)
+        self._anchor_matcher = KeywordMatcher(self._anchor_ranks)
+
+        self.institution_matcher = KeywordMatcher((keyword.lower() for keyword in institutions), ignore_case=True)
+
+    def extract_degree_and_field(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (degree, field) for the longest degree keyword followed by a field, or (None, None)."""
+        ranks = sorted(rank for anchor in self._anchor_matcher.find_keywords(text)
+                       for rank in self._anchor_ranks[anchor])
+        for rank in ranks:
+            match = self._degree_field_res[rank].search(text)  # case sensitive to avoid false positives
+            if match:
+                return match.group(1), match.group(3).strip()
+        return None, None
+
+    def has_institution(self, text: str) -> bool:
+        """True if any institution keyword is a substring of text, ignoring case."""
+        return self.institution_matcher.contains_any(text)
+
+    def is_degree(self, line: str) -> bool:
+        """True if a degree keyword appears in line as a whole word, ignoring case."""
+        return bool(self.degree_re.search(line))
+
+    def is_institution(self, line: str) -> bool:
+        """True if an institution keyword appears in line as a whole word, ignoring case."""
+        return bool(self.institution_re.search(line))
+
+
+EDUCATION_CLASSIFIER = EducationClassifier()
@@ -2,23 +2,30 @@ from docx import Document
 from docx.text.paragraph import Paragraph
 from docx.oxml.ns import qn
 from io import BytesIO
-from .ai import call_gemini
+from .ai import call_gemini, forget_gemini_response
 import json
 import re
 from docx.oxml import OxmlElement
 from docx.shared import Inches, Pt
 from docx.enum.text import WD_TAB_ALIGNMENT
+from docx.enum.style import WD_STYLE_TYPE
 import os
 from auth_user.models import MatchedResumeData
 from docx.oxml import OxmlElement
 from docx.text.paragraph import Paragraph
 from .template_layouts import tp_layouts
+from .template_registry import open_template
+from .placeholder_index import PlaceholderIndex
+from .template_plan import compile_layout, replace_placeholders
+from .document_store import DOCX_CONTENT_TYPE, store_document
+from .pdf_renderer import PDF_CONTENT_TYPE, PdfConversionError, render_pdf
 from django.contrib.auth import get_user_model
 from typing import Dict, List, Union
 
 
 
 User = get_user_model()
+OUTPUT_FORMATS = ('docx', 'pdf')  # 'pdf' renders the finished document with LibreOffice (see api.pdf_renderer)
 
 def insert_paragraph_after(paragraph: Paragraph, text='', style=None):
     """
@@ -200,9 +207,16 @@ class ResumeGenerator:
         ]
     }
 
-    def __init__(self, resume_data=None, filename=None, matching=False, premium=True, user_id=0):
+    def __init__(self, resume_data=None, filename=None, matching=False, premium=True, user_id=0, document_key=None,
+                 output_format='docx'):
         self.filename = filename
+        # Where the populated document is stored for download; the generating task's id
+        self.document_key = document_key or filename
         self.resume_data = resume_data
+        self.user_id = user_id  # owner of the stored document
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.output_format = output_format
         self.user_object = User.objects.filter(id=user_id).first() if user_id != 0 else None
         if not matching:
             if premium:
@@ -409,26 +423,32 @@ class ResumeGenerator:
             response = json.loads(text)
         except Exception as e:
             print(f"Error calling Gemini: {e}")
+            forget_gemini_response(prompt)
             response = {}
         
         return response
 
-    def _insert_bullets(self, doc, anchor_text, items, bullet=True):
-        for i, para in enumerate(doc.paragraphs):
-            if anchor_text in para.text:
-                para.text = para.text.replace(anchor_text, "")
-                if isinstance(items, dict):
-                    for key, value in items.items():
-                        mr = {}
-                        mr[key] = value
-                        # Insert bullet paragraph after the anchor
-                        insert_paragraph_after(para, mr, style='List Bullet')
-                elif isinstance(items, list):
-                    for item in items:
-                        # Insert bullet paragraph starting from the anchor
-                        insert_paragraph_after(para, item, style='List Bullet' if bullet else None)
-                        
-                break
+    def _insert_bullets(self, doc, anchor_text, items, bullet=True, index=None):
+        if index is None:
+            index = PlaceholderIndex(doc)
+        para = index.first(anchor_text)
+        if para is None:
+            return
+        para.text = index.text(para).replace(anchor_text, "")
+        index.refresh(para)
+        inserted = []
+        if isinstance(items, dict):
+            for key, value in items.items():
+                mr = {}
+                mr[key] = value
+                # Insert bullet paragraph after the anchor
+                inserted.append(insert_paragraph_after(para, mr, style='List Bullet'))
+        elif isinstance(items, list):
+            for item in items:
+                # Insert bullet paragraph starting from the anchor
+                inserted.append(insert_paragraph_after(para, item, style='List Bullet' if bullet else None))
+        for new_para in inserted:
+            index.add(new_para)
     
     def __select_template(self, template_id:str=''):
         """Select the appropriate template based on user data."""
@@ -467,7 +487,7 @@ class ResumeGenerator:
                     raise Exception("Failed to populate modern template.")
                 
                 # Clean unused placeholders
-                self._clean_unused_placeholders(this_doc)
+                self._clean_unused_placeholders(this_doc, populator.index)
 
                 # Apply font style to the entire document
                 enforce_font(this_doc, font_name="Arial")
@@ -484,7 +504,7 @@ class ResumeGenerator:
         self.__select_template(template_id)
 
         try:
-            doc = Document(self.template_path)
+            doc = open_template(self.template_path)
             placeholder_cache = {}  # Cache for parsed placeholders
 
             # Process paragraphs
@@ -570,6 +590,7 @@ class ResumeGenerator:
                     
 
             # Process lists
+            index = PlaceholderIndex(doc)
             list_fields = {
                 "{{skills_list}}": self.user_data.get("skills", []),
                 "{{certifications_list}}": self.user_data.get("certifications", []),
@@ -581,12 +602,12 @@ class ResumeGenerator:
                 print(f"Processing list for anchor {anchor} with items: {items}")
                 if items:  # Only process if there are items
                     if anchor == "{{description}}":
-                        self._insert_bullets(doc, anchor, items, bullet=False)
+                        self._insert_bullets(doc, anchor, items, bullet=False, index=index)
                     else:
-                        self._insert_bullets(doc, anchor, items)
+                        self._insert_bullets(doc, anchor, items, index=index)
             
             # Remove unused placeholders
-            self._clean_unused_placeholders(doc)
+            self._clean_unused_placeholders(doc, index)
 
             self.__save_document(doc)
             
@@ -626,7 +647,7 @@ class ResumeGenerator:
                     raise Exception("Failed to populate modern template.")
                 
                 # Clean unused placeholders
-                self._clean_unused_placeholders(this_doc)
+                self._clean_unused_placeholders(this_doc, populator.index)
 
                 # Apply font style to the entire document
                 enforce_font(this_doc, font_name="Arial")
@@ -665,13 +686,10 @@ class ResumeGenerator:
             - Skills must be < 25 characters each
         """
         # helper functions
-        def process_simple_fields(doc):
+        def process_simple_fields(index):
             """Process simple key-value pairs in the document."""
-            for para in doc.paragraphs:
-                if not para.text:
-                    continue
-                    
-                para_text = para.text
+            for para in index.with_placeholders():
+                para_text = index.text(para)
                 modified = False
                 
                 for key, value in self.matching_user_data.items():
@@ -691,11 +709,12 @@ class ResumeGenerator:
                 if modified:
                     para.clear()
                     para.add_run(para_text)
+                    index.refresh(para)
                     if self.matching_user_data.get('name') in para_text:
                         # Apply specific style for name (make the font size 28)
                         self._apply_style_to_run(para, 'name', self.user_data.get('name', ''))
         
-        def process_multi_item_sections(doc):
+        def process_multi_item_sections(doc, index):
             """Process sections with perfectly aligned dates at line ends."""
             
             template_id = self.resume_data.get('template_id')
@@ -790,13 +809,15 @@ class ResumeGenerator:
                     section_paragraphs.extend(item_paragraphs)
                 
                 # Replace placeholder with styled content
+                for p in section_paragraphs:
+                    index.add(p)
                 replace_placeholder_with_styled_content(
-                    doc,
+                    index,
                     config.get('template_placeholder') or config.get('template_anchor'),
                     section_paragraphs
                 )
 
-        def process_bullet_lists(doc):
+        def process_bullet_lists(doc, index):
             """Process simple bullet list sections."""
             list_fields = {
                 "{{skills_list}}": self.matching_user_data.get("skills", []),
@@ -804,25 +825,25 @@ class ResumeGenerator:
 
             for anchor, items in list_fields.items():
                 if items:
-                    self._insert_bullets(doc, anchor, items)
+                    self._insert_bullets(doc, anchor, items, index=index)
 
-        def replace_placeholder_with_styled_content(doc, placeholder, new_paragraphs):
+        def replace_placeholder_with_styled_content(index, placeholder, new_paragraphs):
             """Replace a placeholder with styled paragraphs."""
-            for para in doc.paragraphs:
-                if placeholder in para.text:
-                    # Get the parent element of the paragraph
-                    parent = para._element.getparent()
-                    # Get the index of the paragraph in its parent
-                    index = parent.index(para._element)
-                    
-                    # Remove the placeholder paragraph
-                    parent.remove(para._element)
-                    
-                    # Insert the new paragraphs at the same position
-                    for new_para in reversed(new_paragraphs):
-                        parent.insert(index, new_para._element)
-                    
-                    break
+            para = index.first(placeholder)
+            if para is None:
+                return
+            # Get the parent element of the paragraph
+            parent = para._element.getparent()
+            # Get the index of the paragraph in its parent
+            position = parent.index(para._element)
+
+            # Remove the placeholder paragraph
+            parent.remove(para._element)
+            index.remove(para)
+
+            # Insert the new paragraphs at the same position
+            for new_para in reversed(new_paragraphs):
+                parent.insert(position, new_para._element)
 
         # Early exit checks
         if not self.matching_user_data:
@@ -833,29 +854,28 @@ class ResumeGenerator:
             return ''
 
         try:
-            doc = Document(self.template_path)
+            doc = open_template(self.template_path)
             self._document = doc
+            index = PlaceholderIndex(doc)
 
             # Process simple fields (name, contact info, etc.)
-            process_simple_fields(doc)
+            process_simple_fields(index)
             # print("Simple fields processed successfully.")
             
             # Process multi-item sections
-            process_multi_item_sections(doc)
+            process_multi_item_sections(doc, index)
             # print("Multi-item sections processed successfully.")
             
             # Process bullet lists
-            process_bullet_lists(doc)
+            process_bullet_lists(doc, index)
             # print("Bullet lists processed successfully.")
 
             # Remove unused placeholders
-            self._clean_unused_placeholders(doc)
+            self._clean_unused_placeholders(doc, index)
             # print("Unused placeholders cleaned successfully.")
 
             # Save the document
-            os.makedirs('generated_docs', exist_ok=True)
-            save_path = os.path.join('generated_docs', self.filename)
-            doc.save(save_path)
+            self.__save_document(doc)
             
             return self.filename
             
@@ -863,9 +883,10 @@ class ResumeGenerator:
             print(f"Error populating template: {str(e)}")
             return ''
     
-    def _clean_unused_placeholders(self, doc: Document) -> None:
+    def _clean_unused_placeholders(self, doc: Document, index: PlaceholderIndex = None) -> None:
         """
         Remove all unused placeholders and their associated formatting elements.
+        Pass the document's PlaceholderIndex if population already built one.
         Handles three cases:
         1. Simple inline placeholders (remove placeholder only)
         2. Labeled placeholders (remove label + placeholder)
@@ -890,43 +911,51 @@ class ResumeGenerator:
             ]
         }
 
+        if index is None:
+            index = PlaceholderIndex(doc)
+
         # Process sectional placeholders
         for placeholder in placeholder_groups['sectional']:
-            self._remove_sectional_placeholder(doc, placeholder)
+            self._remove_sectional_placeholder(index, placeholder)
 
          # Process labeled placeholders
         for label, placeholder in placeholder_groups['labeled']:
-            self._remove_labeled_placeholder(doc, label, placeholder)
+            self._remove_labeled_placeholder(index, label, placeholder)
 
         # Process simple placeholders
         for placeholder in placeholder_groups['simple']:
-            self._remove_simple_placeholder(doc, placeholder)
+            self._remove_simple_placeholder(index, placeholder)
 
-    def _remove_simple_placeholder(self, doc: Document, placeholder: str) -> None:
+    def _remove_simple_placeholder(self, index: PlaceholderIndex, placeholder: str) -> None:
         """Remove simple inline placeholders that weren't replaced."""
-        for paragraph in doc.paragraphs:
-            if placeholder in paragraph.text:
-                paragraph.text = paragraph.text.replace(placeholder, "").strip()
-                # Remove paragraph if empty
-                if not paragraph.text:
-                    self._remove_paragraph(paragraph)
+        for paragraph in index.paragraphs(placeholder):
+            paragraph.text = index.text(paragraph).replace(placeholder, "").strip()
+            # Remove paragraph if empty
+            if not paragraph.text:
+                index.remove(paragraph)
+                self._remove_paragraph(paragraph)
+            else:
+                index.refresh(paragraph)
 
-    def _remove_labeled_placeholder(self, doc: Document, label: str, placeholder: str) -> None:
+    def _remove_labeled_placeholder(self, index: PlaceholderIndex, label: str, placeholder: str) -> None:
         """
         Remove placeholders with preceding labels.
         Example: "Git: {{git}}" -> removes entire line when placeholder exists
         """
-        for paragraph in doc.paragraphs:
-            if placeholder in paragraph.text and label in paragraph.text:
+        for paragraph in index.paragraphs(placeholder):
+            text = index.text(paragraph)
+            if label in text:
                 # Check if this is the only content in the paragraph
                 full_pattern = f"{label} {placeholder}"
-                if paragraph.text.strip() == full_pattern:
+                if text.strip() == full_pattern:
+                    index.remove(paragraph)
                     self._remove_paragraph(paragraph)
                 else:
                     # Handle cases where label+placeholder are part of larger text
-                    paragraph.text = paragraph.text.replace(full_pattern, "").strip()
+                    paragraph.text = text.replace(full_pattern, "").strip()
+                    index.refresh(paragraph)
 
-    def _remove_sectional_placeholder(self, doc: Document, placeholder: str) -> None:
+    def _remove_sectional_placeholder(self, index: PlaceholderIndex, placeholder: str) -> None:
         """
         Remove sectional placeholders and their associated header structure.
         Removes:
@@ -934,27 +963,17 @@ class ResumeGenerator:
         - The divider paragraph immediately above it (index-1)
         - The section header paragraph above that (index-2)
         """
-        paragraphs = doc.paragraphs
-        to_remove = set()
-
-        for i, paragraph in enumerate(paragraphs):
-            if placeholder in paragraph.text:
-                # print('sectionl placeholder found:', placeholder)
-                # Always remove the placeholder paragraph
-                to_remove.add(i)
-                
-                # Remove divider paragraph (immediately above)
-                if i > 0:
-                    to_remove.add(i-1)
-                    
-                    # Remove section header (two above)
-                    if i > 1:
-                        to_remove.add(i-2)
+        to_remove = {}
+
+        for paragraph in index.paragraphs(placeholder):
+            # Always remove the placeholder paragraph, the divider immediately above
+            # and the section header two above
+            for p in [paragraph] + index.preceding(paragraph, 2):
+                to_remove[p._p] = p
 
-        # Remove marked paragraphs in reverse order to maintain indices
-        for i in sorted(to_remove, reverse=True):
-            if i < len(paragraphs):
-                self._remove_paragraph(paragraphs[i])
+        for paragraph in to_remove.values():
+            index.remove(paragraph)
+            self._remove_paragraph(paragraph)
 
     def _is_horizontal_rule(self, paragraph: Paragraph) -> bool:
         """More reliable horizontal rule detection."""
@@ -978,10 +997,22 @@ class ResumeGenerator:
         p._p = p._element = None
     
     def __save_document(self, doc: Document) -> None:
-        """Save the populated document to the specified filename."""
-        os.makedirs('generated_docs', exist_ok=True)
-        save_path = os.path.join('generated_docs', self.filename)
-        doc.save(save_path)
+        """
+        Store the populated document under document_key for download (see api.document_store).
+
+        PDF output falls back to the DOCX when it cannot be rendered.
+        """
+        buffer = BytesIO()
+        doc.save(buffer)
+        data, filename, content_type = buffer.getvalue(), self.filename, DOCX_CONTENT_TYPE
+        if self.output_format == 'pdf':
+            try:
+                data = render_pdf(data)
+                filename = os.path.splitext(self.filename)[0] + '.pdf'
+                content_type = PDF_CONTENT_TYPE
+            except PdfConversionError as e:
+                print(f"PDF rendering failed, storing the DOCX instead: {e}")
+        store_document(self.document_key, data, filename, user_id=self.user_id, content_type=content_type)
     
     def _apply_style_to_run(self, para, key, value):
         """Optional styling based on field type."""
@@ -997,8 +1028,10 @@ class ResumeGenerator:
 
 class ColumnAwareTemplatePopulator:
     def __init__(self, template_path: str, layout_config: Dict):
-        self.doc = Document(template_path)
+        self.doc = open_template(template_path)
         self.layout_config = layout_config
+        self.index = PlaceholderIndex(self.doc)
+        self._style_ids = {}  # paragraph style name -> style id in this document
 
     def populate_template(self, user_data: Dict) -> Document:
         self.user_data = user_data
@@ -1007,10 +1040,8 @@ class ColumnAwareTemplatePopulator:
         return self.doc
 
     def _process_inline_fields(self):
-        for para in self.doc.paragraphs:
-            if not para.text:
-                continue
-            text = para.text
+        for para in self.index.with_placeholders():
+            text = self.index.text(para)
             modified = False
 
             if isinstance(self.user_data, dict):
@@ -1033,84 +1064,98 @@ class ColumnAwareTemplatePopulator:
                 if modified:
                     para.clear()
                     para.add_run(text)
+                    self.index.refresh(para)
                     if self.user_data.get('name') in text:
                         # Apply specific style for name (make the font size 28)
                         self._apply_style_to_run(para, 'name', self.user_data.get('name', ''))
 
     def _process_multi_item_sections(self):
-        if isinstance(self.layout_config, dict):
-            for section, config in self.layout_config.items():
-                placeholder = config.get("template_anchor")
-                if not placeholder:
-                    continue
+        """Write each multi-item section by running the layout's precompiled plan (see api.template_plan)."""
+        for section in compile_layout(self.layout_config).sections:
+            items = self.user_data.get(section.name, [])
+            if not items:
+                continue
 
-                items = self.user_data.get(section, [])
-                if not items:
-                    continue
+            para = self.index.first(section.anchor)
+            if para is None:
+                continue
 
-                for para in self.doc.paragraphs:
-                    if placeholder in para.text:
-                        # print(f"Processing section: {section} with placeholder: {placeholder}")
-                        new_paragraphs = []
-                        for item_index, item in enumerate(items if isinstance(items, list) else [items]):
-                            item_paragraphs = []
-
-                            for line_config in config["item_template"]:
-                                new_para = insert_paragraph_after(para, style="List Bullet" if line_config.get("bullet") else None)
-
-                                # Handle list of strings (is_list)
-                                if line_config.get("is_list"):
-                                    key = self._extract_placeholder_key(line_config["text"])
-                                    list_items = item.get(key, []) if isinstance(item, dict) else item
-                                    if isinstance(list_items, list):
-                                        for li in list_items:
-                                            para_style = "List Bullet" if line_config.get("bullet", False) else None
-                                            new_line = insert_paragraph_after(new_para, li, style=para_style)
-
-                                            if line_config.get("bullet"):
-                                                indent_val = line_config.get("indent", 0)
-                                                if indent_val > 0:
-                                                    new_line.paragraph_format.left_indent = Inches(indent_val)
-                                                    new_line.paragraph_format.first_line_indent = Inches(-0.25)
-
-                                            item_paragraphs.append(new_line)
-                                        continue
-
-
-                                # Handle dated line
-                                if line_config.get("type") == "dated_line":
-                                    content = self._replace_placeholders(line_config["content"], item)
-                                    dates = self._replace_placeholders(line_config["dates"], item)
-
-                                    new_para.paragraph_format.tab_stops.add_tab_stop(Inches(6), WD_TAB_ALIGNMENT.RIGHT)
-                                    run = new_para.add_run(content)
-                                    if line_config.get("content_bold"):
-                                        run.bold = True
-                                    new_para.add_run('\t')
-                                    new_para.add_run(dates)
-                                    item_paragraphs.append(new_para)
-                                    continue
-
-                                # Handle string or templated line
-                                if "text" in line_config:
-                                    line = self._replace_placeholders(line_config["text"], item)
-                                    run = new_para.add_run(line)
-                                    if line_config.get("content_bold"):
-                                        run.bold = True
-                                    if line_config.get("italic"):
-                                        run.italic = True
-                                    item_paragraphs.append(new_para)
-
-                            # Optional separator
-                            if item_index < len(items) - 1 and config.get("separator"):
-                                sep_para = insert_paragraph_after(item_paragraphs[-1], config["separator"])
-                                item_paragraphs.append(sep_para)
-
-                            new_paragraphs.extend(item_paragraphs)
-
-                        # Replace original placeholder paragraph
-                        self._replace_placeholder_with_paragraphs(para, new_paragraphs)
-                        break
+            new_paragraphs = []
+            # Paragraphs whose written text has a {{ and so may need indexing
+            to_index = []
+            for item_index, item in enumerate(items if isinstance(items, list) else [items]):
+                item_paragraphs = []
+
+                for line in section.lines:
+                    new_para = self._paragraph_after(para, style=line.style)
+
+                    if line.is_list:
+                        list_items = item.get(line.list_key, []) if isinstance(item, dict) else item
+                        if isinstance(list_items, list):
+                            for li in list_items:
+                                if isinstance(li, str):
+                                    new_line = self._paragraph_after(new_para, li, style=line.style)
+                                    if '{{' in li:
+                                        to_index.append(new_line)
+                                else:
+                                    new_line = insert_paragraph_after(new_para, li, style=line.style)
+                                    to_index.append(new_line)
+                                if line.indent is not None:
+                                    new_line.paragraph_format.left_indent = line.indent
+                                    new_line.paragraph_format.first_line_indent = Inches(-0.25)
+                                item_paragraphs.append(new_line)
+                            continue
+
+                    if line.dated:
+                        content = line.content.render(item)
+                        dates = line.dates.render(item)
+                        new_para.paragraph_format.tab_stops.add_tab_stop(Inches(6), WD_TAB_ALIGNMENT.RIGHT)
+                        run = new_para.add_run(content)
+                        if line.bold:
+                            run.bold = True
+                        new_para.add_run('\t')
+                        new_para.add_run(dates)
+                        if '{{' in content + '\t' + dates:
+                            to_index.append(new_para)
+                        item_paragraphs.append(new_para)
+                        continue
+
+                    if line.text is not None:
+                        text = line.text.render(item)
+                        run = new_para.add_run(text)
+                        if line.bold:
+                            run.bold = True
+                        if line.italic:
+                            run.italic = True
+                        if '{{' in text:
+                            to_index.append(new_para)
+                        item_paragraphs.append(new_para)
+
+                # Optional separator
+                if item_index < len(items) - 1 and section.separator:
+                    sep_para = insert_paragraph_after(item_paragraphs[-1], section.separator)
+                    to_index.append(sep_para)
+                    item_paragraphs.append(sep_para)
+
+                new_paragraphs.extend(item_paragraphs)
+
+            for new_para in to_index:
+                self.index.add(new_para)
+            # Replace original placeholder paragraph
+            self._replace_placeholder_with_paragraphs(para, new_paragraphs)
+
+    def _paragraph_after(self, paragraph: Paragraph, text: str = '', style: str = None) -> Paragraph:
+        """insert_paragraph_after() for plain text, looking each style up once per document."""
+        new_p = OxmlElement('w:p')
+        paragraph._p.addnext(new_p)
+        new_paragraph = Paragraph(new_p, paragraph._parent)
+        if text:
+            new_paragraph.add_run(text)
+        if style:
+            if style not in self._style_ids:
+                self._style_ids[style] = self.doc.part.get_style_id(style, WD_STYLE_TYPE.PARAGRAPH)
+            new_p.style = self._style_ids[style]
+        return new_paragraph
 
     def _process_list_only_sections(self):
         if isinstance(self.layout_config, dict):
@@ -1130,26 +1175,28 @@ class ColumnAwareTemplatePopulator:
                 # We assume only one line_config for flat list sections
                 line_config = config["item_template"][0]
 
-                for para in self.doc.paragraphs:
-                    if placeholder in para.text:
-                        new_paragraphs = []
+                para = self.index.first(placeholder)
+                if para is None:
+                    continue
 
-                        for item in items:
-                            para_style = "List Bullet" if line_config.get("bullet", False) else None
-                            bullet_para = insert_paragraph_after(para, item, style=para_style)
+                new_paragraphs = []
+                for item in items:
+                    para_style = "List Bullet" if line_config.get("bullet", False) else None
+                    bullet_para = insert_paragraph_after(para, item, style=para_style)
 
-                            if line_config.get("bullet"):
-                                indent_val = line_config.get("indent", 0)
-                                if indent_val > 0:
-                                    bullet_para.paragraph_format.left_indent = Inches(indent_val)
-                                    bullet_para.paragraph_format.first_line_indent = Inches(-0.25)
+                    if line_config.get("bullet"):
+                        indent_val = line_config.get("indent", 0)
+                        if indent_val > 0:
+                            bullet_para.paragraph_format.left_indent = Inches(indent_val)
+                            bullet_para.paragraph_format.first_line_indent = Inches(-0.25)
 
-                            new_paragraphs.append(bullet_para)
+                    new_paragraphs.append(bullet_para)
+                    self.index.add(bullet_para)
 
-                        self._replace_placeholder_with_paragraphs(para, new_paragraphs)
-                        break
+                self._replace_placeholder_with_paragraphs(para, new_paragraphs)
 
     def _replace_placeholder_with_paragraphs(self, placeholder_para: Paragraph, new_paragraphs: List[Paragraph]):
+        self.index.remove(placeholder_para)
         parent = placeholder_para._element.getparent()
         index = parent.index(placeholder_para._element)
         parent.remove(placeholder_para._element)
@@ -1166,19 +1213,7 @@ class ColumnAwareTemplatePopulator:
         return match.group(1) if match else ""
 
     def _replace_placeholders(self, text: str, data: Union[Dict, str]) -> str:
-        if isinstance(data, dict):
-            # Find all placeholders in the text
-            matches = re.findall(r"{{(.*?)}}", text)
-            for key in matches:
-                value = data.get(key, "")
-                if isinstance(value, (str, int, float)):
-                    text = text.replace(f"{{{{{key}}}}}", str(value))
-                else:
-                    text = text.replace(f"{{{{{key}}}}}", "")
-        elif isinstance(data, str):
-            # Simple case like skill strings
-            text = text.replace("{{skill}}", data)
-        return text
+        return replace_placeholders(text, data)
     
     def _apply_style_to_run(self, para, key, value):
         """Optional styling based on field type."""
@@ -0,0 +1,91 @@
+import os
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) seconds; callers pass a longer read timeout for slow upstreams like Gemini
+DEFAULT_TIMEOUT = (5, 30)
+POOL_CONNECTIONS = 10  # hosts kept in the pool manager
+POOL_MAXSIZE = 20      # open connections kept per host
+
+
+def _retry() -> Retry:
+    """
+    Retry connection failures for every method, and 429/5xx answers only for idempotent
+    ones: a POST that reached the server (e.g. a paid Gemini generation) is not re-sent.
+    """
+    return Retry(
+        total=3,
+        connect=3,
+        read=2,
+        status=2,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=_retry())
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return this process's shared session, so calls to the same host reuse kept-alive
+    connections. A forked process (e.g. a Celery worker) builds its own on first use.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def request(method: str, url: str, timeout=DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+    """requests.request() through the shared session, always with a timeout."""
+    return get_session().request(method, url, timeout=timeout, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request('GET', url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
+
+
+def connection_stats() -> dict:
+    """
+    Per-host request and connection counts for this process's session; 'reused' is the
+    number of requests served on an already open connection.
+    """
+    if _session is None or _session_pid != os.getpid():
+        return {}
+    stats = {}
+    for adapter in set(_session.adapters.values()):
+        for key in adapter.poolmanager.pools.keys():
+            pool = adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            entry = stats.setdefault(host, {'requests': 0, 'connections': 0, 'reused': 0})
+            entry['requests'] += pool.num_requests
+            entry['connections'] += pool.num_connections
+            entry['reused'] = entry['requests'] - entry['connections']
+    return stats
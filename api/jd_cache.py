@@ -0,0 +1,61 @@
+import hashlib
+from django.core.cache import caches
+from .lexicon import get_skill_lexicon
+from .patterns import WHITESPACE_RE
+from .resume_parser import ResumeParser
+
+# Cache alias configured in settings.CACHES; bump its VERSION to drop entries after parser changes.
+JD_CACHE_ALIAS = 'job_descriptions'
+# The parts of a job description's parse that the resume is matched against
+JD_FIELDS = ('skills', 'education', 'experience_duration', 'certifications')
+
+
+def normalize_job_description(text: str) -> str:
+    """
+    The posting with each line stripped, runs of whitespace within a line collapsed and
+    blank lines dropped, so re-pasted postings map to one entry.
+
+    Line breaks and case are kept: the parser reads line by line and case-sensitively.
+    """
+    lines = (WHITESPACE_RE.sub(' ', line).strip() for line in (text or '').splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def _cache_key(job_description: str) -> str:
+    """
+    SHA-256 of the normalized posting, plus a digest of the skill lexicon files it was
+    parsed with, since new skills change the extracted skills.
+    """
+    digest = hashlib.sha256(normalize_job_description(job_description).encode('utf-8')).hexdigest()
+    lexicon = hashlib.sha256(repr(get_skill_lexicon().signature).encode('utf-8')).hexdigest()[:12]
+    return f"jd:{digest}:{lexicon}"
+
+
+def get_jd_analysis(job_description: str) -> dict:
+    """
+    Return the JD_FIELDS of the parse of the normalized job description, parsing only the
+    first time a posting is seen. The normalized text is what gets parsed, so every
+    posting sharing a cache key gets the same result.
+
+    Cache errors (e.g. Redis unavailable) fall back to parsing, so analyses never fail on them.
+    """
+    key = _cache_key(job_description)
+    try:
+        cached = caches[JD_CACHE_ALIAS].get(key)
+        if cached is not None:
+            return cached
+    except Exception as e:
+        print(f'Job description cache unavailable: {e}')
+        return _parse(job_description)
+
+    analysis = _parse(job_description)
+    try:
+        caches[JD_CACHE_ALIAS].set(key, analysis)
+    except Exception as e:
+        print(f'Job description cache unavailable: {e}')
+    return analysis
+
+
+def _parse(job_description: str) -> dict:
+    parsed = ResumeParser(normalize_job_description(job_description)).parse_all()
+    return {field: parsed[field] for field in JD_FIELDS}
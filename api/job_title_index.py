@@ -0,0 +1,81 @@
+from typing import Dict, List, Optional, Tuple
+from fuzzywuzzy import fuzz, process, utils
+from .caching import LRUCache
+from .resources import job_fields
+
+
+def normalize_title(title: str) -> str:
+    """The form fuzz.token_set_ratio compares inside process.extractOne (lowercase alphanumeric words)."""
+    return utils.full_process(utils.full_process(title), force_ascii=True)
+
+
+class JobTitleIndex:
+    """
+    Known job titles indexed once, answering "which field is this title in?".
+
+    match() returns what process.extractOne(title, titles, scorer=fuzz.token_set_ratio)
+    picked before, mapped to the first field listing that title:
+      - a known title (after normalization) is a dict lookup, precomputed at build time;
+      - token_set_ratio is 100 exactly when one title's words are a subset of the other's,
+        so the first such title is found through the token inverted index;
+      - anything else is scored against every title with the original scorer.
+    Results are memoized per normalized input, since titles repeat across users.
+    """
+
+    def __init__(self, fields: Dict[str, List[str]], memo_size: int = 4096):
+        self.titles: List[str] = []
+        self.field_of: Dict[str, str] = {}  # first field listing each title
+        self._token_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = {}  # token -> title positions, ascending
+
+        for field, titles in fields.items():
+            for title in titles:
+                position = len(self.titles)
+                self.titles.append(title)
+                self.field_of.setdefault(title, field)
+                tokens = set(normalize_title(title).split())
+                self._token_counts.append(len(tokens))
+                for token in tokens:
+                    self._postings.setdefault(token, []).append(position)
+
+        self.memo = LRUCache(memo_size)
+        self._exact = {}
+        for title in self.titles:
+            normalized = normalize_title(title)
+            if normalized not in self._exact:
+                self._exact[normalized] = self._best_title(normalized)
+
+    def _subset_match(self, tokens: set) -> Optional[int]:
+        """Position of the first title whose words contain, or are contained in, tokens."""
+        shared = {}
+        for token in tokens:
+            for position in self._postings.get(token, ()):
+                shared[position] = shared.get(position, 0) + 1
+        matches = [position for position, count in shared.items()
+                   if count == len(tokens) or count == self._token_counts[position]]
+        return min(matches) if matches else None
+
+    def _best_title(self, normalized: str) -> Optional[str]:
+        if not self.titles:
+            return None
+        if not normalized:
+            return self.titles[0]  # every title scores 0; extractOne keeps the first
+        position = self._subset_match(set(normalized.split()))
+        if position is not None:
+            return self.titles[position]
+        best = process.extractOne(normalized, self.titles, scorer=fuzz.token_set_ratio)
+        return best[0] if best else None
+
+    def match(self, title: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (matched job title, field), or (None, None) when there are no titles."""
+        normalized = normalize_title(title or '')
+        matched = self._exact.get(normalized)
+        if matched is None:
+            matched = self.memo.get(normalized)
+            if matched is None:
+                matched = self._best_title(normalized)
+                self.memo.set(normalized, matched)
+        return matched, self.field_of.get(matched)
+
+
+JOB_TITLE_INDEX = JobTitleIndex(job_fields)
@@ -0,0 +1,113 @@
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+from rapidfuzz import fuzz, process
+
+# Lowercase word tokens; '+' and '#' are kept inside tokens so C++ and C# survive
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+MAX_NGRAM = 4
+SCORE_CUTOFF = 85
+
+
+@lru_cache(maxsize=4096)
+def normalize_keyword(keyword: str) -> Tuple[str, int]:
+    """Return (normalized keyword, token count), e.g. 'Node.js' -> ('node js', 2)."""
+    tokens = TOKEN_RE.findall(keyword.lower())
+    return ' '.join(tokens), len(tokens)
+
+
+def trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class KeywordCoverageIndex:
+    """
+    Token index over one text for keyword lookups.
+
+    The text is tokenized once into word n-gram shingles (1..max_ngram words). A keyword
+    is found when its normalized form is a shingle (set lookup) or, failing that, when a
+    shingle with the same number of words scores at least score_cutoff with fuzz.ratio.
+    Fuzzy candidates are bucketed by length, and only the lengths that can reach the
+    cutoff are considered; for longer keywords they are further filtered to shingles
+    sharing enough trigrams with the keyword to possibly reach the cutoff.
+    """
+
+    def __init__(self, text: str, max_ngram: int = MAX_NGRAM):
+        self.tokens = tokens = TOKEN_RE.findall(text.lower())
+        self.max_ngram = max_ngram
+        self.shingles = set()
+        self._by_size: Dict[Tuple[int, int], List[str]] = {}  # (words, chars) -> shingles
+        self._trigram_postings: Dict[str, List[str]] = {}
+
+        for n in range(1, max_ngram + 1):
+            for i in range(len(tokens) - n + 1):
+                shingle = ' '.join(tokens[i:i + n])
+                if shingle not in self.shingles:
+                    self.shingles.add(shingle)
+                    self._by_size.setdefault((n, len(shingle)), []).append(shingle)
+                    for trigram in trigrams(shingle):
+                        self._trigram_postings.setdefault(trigram, []).append(shingle)
+
+    def _fuzzy_candidates(self, keyword: str, words: int, score_cutoff: int) -> List[str]:
+        """Shingles with the keyword's word count that could score fuzz.ratio >= score_cutoff."""
+        # ratio = 2 * matches / (len_a + len_b) and matches <= min(len_a, len_b)
+        length = len(keyword)
+        cutoff = score_cutoff / 100
+        low = max(int(length * cutoff / (2 - cutoff)), 1)
+        high = int(length * (2 - cutoff) / cutoff) + 1
+        sizes = {(words, size) for size in range(low, high + 1) if (words, size) in self._by_size}
+        if not sizes:
+            return []
+
+        # Each insertion or deletion breaks at most 3 of the keyword's trigrams, and
+        # reaching the cutoff allows at most max_edits of them.
+        keyword_trigrams = trigrams(keyword)
+        max_edits = int((1 - cutoff) * (length + high))
+        min_shared = len(keyword_trigrams) - 3 * max_edits
+        if min_shared <= 0:
+            return [shingle for size in sizes for shingle in self._by_size[size]]
+
+        shared = Counter(shingle for trigram in keyword_trigrams
+                         for shingle in self._trigram_postings.get(trigram, ()))
+        return [shingle for shingle, count in shared.items()
+                if count >= min_shared and (words, len(shingle)) in sizes]
+
+    def contains(self, keyword: str, score_cutoff: int = SCORE_CUTOFF) -> bool:
+        normalized, words = normalize_keyword(keyword)
+        if not normalized:
+            return False
+        if normalized in self.shingles:
+            return True
+        if words > self.max_ngram:
+            return False
+        candidates = self._fuzzy_candidates(normalized, words, score_cutoff)
+        return bool(candidates) and process.extractOne(
+            normalized, candidates, scorer=fuzz.ratio, score_cutoff=score_cutoff) is not None
+
+    def match(self, keywords: Iterable[str], score_cutoff: int = SCORE_CUTOFF) -> Tuple[List[str], List[str]]:
+        """Split keywords into (found, missing), keeping their order."""
+        found, missing = [], []
+        for keyword in keywords:
+            (found if self.contains(keyword, score_cutoff) else missing).append(keyword)
+        return found, missing
+
+    def coverage(self, keywords: Iterable[str], score_cutoff: int = SCORE_CUTOFF) -> int:
+        """Percentage (0-100, rounded) of keywords found in the text."""
+        keywords = list(keywords)
+        if not keywords:
+            return 0
+        found = sum(1 for keyword in keywords if self.contains(keyword, score_cutoff))
+        return round((found / len(keywords)) * 100)
+
+
+@lru_cache(maxsize=32)
+def get_keyword_index(text: str) -> KeywordCoverageIndex:
+    """Index for text, shared by the checks of one analysis (coverage, JD skills)."""
+    return KeywordCoverageIndex(text)
+
+
+def keyword_coverage(text: str, expected_keywords: Dict[str, List[str]], score_cutoff: int = SCORE_CUTOFF) -> Dict[str, int]:
+    """Per-category keyword coverage percentages for text, indexing the text once."""
+    index = get_keyword_index(text)
+    return {category: index.coverage(keywords, score_cutoff) for category, keywords in expected_keywords.items()}
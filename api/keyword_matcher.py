@@ -0,0 +1,108 @@
+from collections import deque
+from typing import Iterable, Iterator, List, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordMatcher:
+    """
+    Aho–Corasick automaton over a fixed set of keywords.
+
+    The automaton is compiled once; every search is a single left-to-right pass over
+    the text, however many keywords there are. With ignore_case=True the keywords and
+    the searched text are lowercased, and matches report the keyword as it was given.
+    """
+
+    def __init__(self, patterns: Iterable[str], ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        self.patterns: List[str] = []
+        self._lengths: List[int] = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        seen = set()
+        for pattern in patterns:
+            key = pattern.lower() if ignore_case else pattern
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            self._add(key, len(self.patterns))
+            self.patterns.append(pattern)
+            self._lengths.append(len(key))
+
+        self._link()
+
+    def _add(self, key: str, index: int) -> None:
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state] += (index,)
+
+    def _link(self) -> None:
+        """Compute failure links breadth-first and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0) if state else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def _scan(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end, pattern index) for every keyword occurrence in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                yield i + 1, index
+
+    def find_all(self, text: str, whole_words: bool = False) -> List[Tuple[int, int, str]]:
+        """
+        Return every keyword occurrence as (start, end, keyword), overlaps included.
+
+        Offsets refer to the searched text (lowercased when ignore_case is set). With
+        whole_words=True an occurrence must not touch a word character on either side.
+        """
+        if self.ignore_case:
+            text = text.lower()
+        matches = []
+        for end, index in self._scan(text):
+            start = end - self._lengths[index]
+            if whole_words and (
+                (start > 0 and _is_word_char(text[start - 1]))
+                or (end < len(text) and _is_word_char(text[end]))
+            ):
+                continue
+            matches.append((start, end, self.patterns[index]))
+        return matches
+
+    def find_keywords(self, text: str, whole_words: bool = False) -> set:
+        """Return the set of distinct keywords that occur in text."""
+        return {keyword for _, _, keyword in self.find_all(text, whole_words=whole_words)}
+
+    def contains_any(self, text: str) -> bool:
+        """True if any keyword occurs in text, stopping at the first hit."""
+        if self.ignore_case:
+            text = text.lower()
+        for _ in self._scan(text):
+            return True
+        return False
+
+    def __len__(self):
+        return len(self.patterns)
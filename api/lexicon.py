@@ -0,0 +1,105 @@
+import os
+import json
+import threading
+from types import MappingProxyType
+from typing import Dict, Optional, Tuple
+from .keyword_matcher import KeywordMatcher
+
+# Skill lexicon files, keyed by the category name used in ResumeParser.known_skills.
+# 'tools' currently shares the technical skills file.
+LEXICON_FILES = {
+    'ts': os.path.join('data', 'ts.json'),
+    'soft': os.path.join('data', 'ss.json'),
+    'domain': os.path.join('data', 'dss.json'),
+    'tools': os.path.join('data', 'ts.json'),
+    'cert': os.path.join('data', 'cm.json'),
+}
+
+
+class SkillLexicon:
+    """
+    Read-only view of the skill lexicon files.
+
+    Built once per process and shared by every ResumeParser, so all members are
+    immutable: tuples for the category lists, frozensets for lookups and a
+    read-only mapping for the legacy `known_skills` dict shape. The keyword
+    automata are compiled here too, so they are rebuilt only with the lexicon.
+    """
+    __slots__ = ('categories', 'all', 'all_lower', 'all_lower_set', 'known_skills',
+                 'matcher', 'exact_matcher', 'signature')
+
+    def __init__(self, categories: Dict[str, Tuple[str, ...]], signature: Tuple):
+        all_skills = set()
+        for skills in categories.values():
+            all_skills.update(skills)
+
+        self.categories = MappingProxyType(dict(categories))
+        self.all = tuple(all_skills)
+        self.all_lower = tuple(skill.lower() for skill in self.all)  # aligned with self.all
+        self.all_lower_set = frozenset(self.all_lower)
+        self.known_skills = MappingProxyType({**self.categories, 'all': self.all})
+        self.matcher = KeywordMatcher(self.all, ignore_case=True)  # finds skills in any casing
+        self.exact_matcher = KeywordMatcher(self.all)  # same as `skill in text` for each skill
+        self.signature = signature
+
+    def __setattr__(self, name, value):
+        if hasattr(self, 'signature'):
+            raise AttributeError("SkillLexicon is read-only")
+        object.__setattr__(self, name, value)
+
+    def __len__(self):
+        return len(self.all)
+
+    def __contains__(self, skill: str) -> bool:
+        return skill.lower() in self.all_lower_set
+
+
+_lexicon: Optional[SkillLexicon] = None
+_lexicon_lock = threading.Lock()
+
+
+def _files_signature() -> Tuple:
+    """Return the (path, mtime) pairs of the lexicon files; missing files have mtime None."""
+    signature = []
+    for path in sorted(set(LEXICON_FILES.values())):
+        try:
+            signature.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            signature.append((path, None))
+    return tuple(signature)
+
+
+def _load_json_file(file_path: str) -> Tuple[str, ...]:
+    if os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return tuple(json.load(f))
+    return ()
+
+
+def _build_lexicon(signature: Tuple) -> SkillLexicon:
+    cache = {}  # read each file once even when categories share it
+    categories = {}
+    for category, path in LEXICON_FILES.items():
+        if path not in cache:
+            cache[path] = _load_json_file(path)
+        categories[category] = cache[path]
+    return SkillLexicon(categories, signature)
+
+
+def get_skill_lexicon() -> SkillLexicon:
+    """
+    Return the process-wide skill lexicon.
+
+    The files are read on first use and again only when one of their mtimes changes,
+    so repeated parses in the same worker skip the file I/O and JSON decoding.
+    """
+    global _lexicon
+    signature = _files_signature()
+    lexicon = _lexicon
+    if lexicon is not None and lexicon.signature == signature:
+        return lexicon
+
+    with _lexicon_lock:
+        if _lexicon is None or _lexicon.signature != signature:
+            _lexicon = _build_lexicon(signature)
+        return _lexicon
@@ -0,0 +1,207 @@
+import os
+import re
+import time
+from glob import glob
+from docx import Document
+from django.core.management.base import BaseCommand, CommandError
+from api.resume_parser import ResumeParser
+from fuzzywuzzy import process
+from api.resources import degree_keywords, institution_keywords, technical_keywords
+from api.keyword_coverage import keyword_coverage
+from api.education_classifier import EDUCATION_CLASSIFIER
+from api.section_segmenter import segment_resume
+from api.template_registry import TemplateRegistry
+from api.patterns import (NUMBER_WORDS, MONTH_ABBREVIATIONS, EXPERIENCE_DATE_PATTERNS, EXPERIENCE_DURATION_RE,
+                          words_to_numbers, abbreviate_months)
+
+SAMPLE_RESUME = """JOHN ADEBAYO OKAFOR
+Lagos, Nigeria
+john.okafor@example.com | +234 803 123 4567
+
+PROFESSIONAL SUMMARY
+Backend Developer with five years of experience building scalable APIs with Python and Django.
+
+WORK EXPERIENCE
+Senior Backend Developer, Paystack Ltd    January 2021 - Present
+- Built payment APIs using Python, Django and PostgreSQL for over twenty partner banks
+- Led migration to AWS and Docker
+Software Engineer, Andela    March 2018 - December 2020
+- Developed REST services in Flask
+
+EDUCATION
+BSc in Computer Science    September 2013 - July 2017
+University of Lagos, Lagos State Nigeria
+
+SKILLS
+Programming: Python, JavaScript, SQL
+Tools: Docker, Git, AWS
+
+CERTIFICATIONS
+AWS Certified Cloud Practitioner - Amazon Web Services - Jul 2023
+"""
+
+
+def _inline_words_to_numbers(text):
+    """Previous convert_words_to_numbers: one re.sub per number word."""
+    for word, num in NUMBER_WORDS.items():
+        text = re.sub(rf"\b{word}\b", str(num), text, flags=re.IGNORECASE)
+    return text
+
+
+def _inline_abbreviate_months(text):
+    """Previous month standardization in parse_education: one re.sub per month."""
+    for full, abbr in MONTH_ABBREVIATIONS.items():
+        text = re.sub(rf'\b{full}\b', abbr, text, flags=re.IGNORECASE)
+    return text
+
+
+def _inline_experience_durations(text):
+    """Previous extract_experience_durations: the alternation is joined and looked up on every call."""
+    combined_pattern = re.compile(rf"({'|'.join(EXPERIENCE_DATE_PATTERNS)})$", re.IGNORECASE)
+    return [m.group(1).strip() for m in map(combined_pattern.search, text.splitlines()) if m]
+
+
+def _compiled_experience_durations(text):
+    return [m.group(1).strip() for m in map(EXPERIENCE_DURATION_RE.search, text.splitlines()) if m]
+
+
+def _education_lines(resume_text):
+    span = segment_resume(resume_text).spans['education']
+    return span.text.splitlines() if span else []
+
+
+def _inline_classify_education(resume_text):
+    """Previous parse_education helpers: regexes joined per call, degrees re-sorted per line."""
+    for line in _education_lines(resume_text):
+        re.search(r'\b(?:' + '|'.join(degree_keywords) + r')\b', line, re.I)
+        re.search(r'\b(?:' + '|'.join(institution_keywords) + r')\b', line, re.I)
+        any(keyword.lower() in line.lower() for keyword in institution_keywords)
+        for degree in sorted(degree_keywords, key=len, reverse=True):
+            if re.search(rf'({degree})\s*(in)?\s*([\w &/-]+)', line):
+                break
+
+
+def _compiled_classify_education(resume_text):
+    for line in _education_lines(resume_text):
+        EDUCATION_CLASSIFIER.is_degree(line)
+        EDUCATION_CLASSIFIER.is_institution(line)
+        EDUCATION_CLASSIFIER.has_institution(line)
+        EDUCATION_CLASSIFIER.extract_degree_and_field(line)
+
+
+def _char_scan_keyword_coverage(resume_text, expected_keywords):
+    """Previous calculate_keyword_coverage: extractOne over a string scores every character."""
+    coverage = {}
+    resume_text_lower = resume_text.lower()
+    for category, keywords in expected_keywords.items():
+        found = sum(1 for keyword in keywords
+                    if process.extractOne(keyword.lower(), resume_text_lower, score_cutoff=85))
+        coverage[category] = round((found / len(keywords)) * 100) if keywords else 0
+    return coverage
+
+
+class Command(BaseCommand):
+    help = ("Time parser hot paths on sample resumes (per-resume cost, before and after precompilation), "
+            "or opening the DOCX templates (per-open cost, from disk and from the template registry).")
+
+    targets = ('regex', 'education', 'keywords', 'templates')
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', choices=self.targets)
+        parser.add_argument('--resumes', help="Directory of .txt resumes to time (default: a built-in sample)")
+        parser.add_argument('--iterations', type=int, default=200, help="Passes over the resume set")
+
+    def handle(self, *args, **options):
+        self.iterations = max(1, options['iterations'])
+        if options['target'] != 'templates':
+            self.resumes = self._load_resumes(options.get('resumes'))
+            self.stdout.write(f"{options['target']}: {len(self.resumes)} resume(s) x {self.iterations} iteration(s)")
+        getattr(self, f"bench_{options['target']}")()
+
+    def _load_resumes(self, directory):
+        if not directory:
+            return [SAMPLE_RESUME]
+        if not os.path.isdir(directory):
+            raise CommandError(f"{directory} is not a directory")
+        resumes = []
+        for name in sorted(os.listdir(directory)):
+            if name.endswith('.txt'):
+                with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                    resumes.append(f.read())
+        if not resumes:
+            raise CommandError(f"No .txt resumes found in {directory}")
+        return resumes
+
+    def time_per_resume(self, func):
+        """Return the mean wall time of func(resume_text) in microseconds."""
+        start = time.perf_counter()
+        for _ in range(self.iterations):
+            for resume_text in self.resumes:
+                func(resume_text)
+        elapsed = time.perf_counter() - start
+        return elapsed / (self.iterations * len(self.resumes)) * 1e6
+
+    def time_per_call(self, func, iterations):
+        """Return the mean wall time of func() in microseconds."""
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    def report(self, label, before, after):
+        """Print a before/after row; either column may be None."""
+        def fmt(value):
+            return f"{value:10.1f} us" if value is not None else " " * 13
+        speedup = f"{before / after:6.1f}x" if before and after else ""
+        self.stdout.write(f"  {label:<28}{fmt(before)}{fmt(after)}  {speedup}")
+
+    def header(self):
+        self.stdout.write(f"  {'':<28}{'before':>13}{'after':>13}")
+
+    def bench_regex(self):
+        self.header()
+        for label, before, after in (
+            ('number words', _inline_words_to_numbers, words_to_numbers),
+            ('month names', _inline_abbreviate_months, abbreviate_months),
+            ('experience durations', _inline_experience_durations, _compiled_experience_durations),
+        ):
+            self.report(label, self.time_per_resume(before), self.time_per_resume(after))
+
+        def parse(resume_text):
+            ResumeParser(resume_text).parse_all()
+        self.report('parse_all (current)', None, self.time_per_resume(parse))
+
+    def bench_education(self):
+        self.header()
+        self.report('education line classifier', self.time_per_resume(_inline_classify_education),
+                    self.time_per_resume(_compiled_classify_education))
+
+        def parse(resume_text):
+            ResumeParser(resume_text).parse_education()
+        self.report('init + parse_education', None, self.time_per_resume(parse))
+
+    def bench_keywords(self):
+        self.header()
+        for field, expected_keywords in technical_keywords.items():
+            self.report(f'coverage: {field}',
+                        self.time_per_resume(lambda text: _char_scan_keyword_coverage(text, expected_keywords)),
+                        self.time_per_resume(lambda text: keyword_coverage(text, expected_keywords)))
+
+    def bench_templates(self):
+        # A template open costs milliseconds, so cap the default 200 passes
+        iterations = min(self.iterations, 20)
+        paths = sorted(path for path in glob('templates/*.docx') if not os.path.basename(path).startswith('~$'))
+        if not paths:
+            raise CommandError("No templates found; run from the project root")
+        registry = TemplateRegistry()
+        self.stdout.write(f"templates: {len(paths)} template(s) x {iterations} iteration(s)")
+        self.header()
+        before_total = after_total = 0
+        for path in paths:
+            registry.open(path)  # first load, not timed
+            before = self.time_per_call(lambda: Document(path), iterations)
+            after = self.time_per_call(lambda: registry.open(path), iterations)
+            before_total += before
+            after_total += after
+            self.report(os.path.splitext(os.path.basename(path))[0][:28], before, after)
+        self.report(f'all {len(paths)} templates', before_total, after_total)
@@ -0,0 +1,79 @@
+import json
+import os
+from collections import deque
+from django.core.management.base import BaseCommand, CommandError
+from api.batch import parse_many
+from api.utils import extract_text
+
+RESUME_EXTENSIONS = ('.txt', '.pdf', '.docx')
+
+
+class Command(BaseCommand):
+    help = ("Parse a directory of resumes (.txt/.pdf/.docx) or a JSONL file of resume texts "
+            "and write one JSON line per resume, in input order.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help="Directory of resume files, or a .jsonl file whose lines are "
+                                           "{\"id\": ..., \"text\": ...} objects or plain JSON strings")
+        parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+        parser.add_argument('--output', help="Write JSONL here instead of stdout")
+
+    def handle(self, *args, **options):
+        source = options['source']
+        if os.path.isdir(source):
+            records = self._read_directory(source)
+        elif os.path.isfile(source):
+            records = self._read_jsonl(source)
+        else:
+            raise CommandError(f"{source} does not exist")
+
+        ids = deque()
+
+        def texts():
+            for record_id, text in records:
+                ids.append(record_id)
+                yield text
+
+        out = open(options['output'], 'w', encoding='utf-8') if options.get('output') else self.stdout
+        count = 0
+        try:
+            for result in parse_many(texts(), workers=options.get('workers')):
+                out.write(json.dumps({'id': ids.popleft(), 'result': result}, default=str) + '\n')
+                count += 1
+        finally:
+            if out is not self.stdout:
+                out.close()
+        self.stderr.write(f"Parsed {count} resume(s)")
+
+    def _read_directory(self, directory):
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if not name.lower().endswith(RESUME_EXTENSIONS) or not os.path.isfile(path):
+                continue
+            if name.lower().endswith('.txt'):
+                with open(path, 'r', encoding='utf-8') as f:
+                    yield name, f.read()
+                continue
+            with open(path, 'rb') as f:
+                extracted = extract_text(f.read(), name.lower())
+            if extracted['status'] != 1:
+                self.stderr.write(f"Skipping {name}: {extracted['message']}")
+                continue
+            yield name, extracted['text']
+
+    def _read_jsonl(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise CommandError(f"{path}:{line_number}: invalid JSON ({e})")
+                if isinstance(record, str):
+                    yield line_number, record
+                elif isinstance(record, dict) and isinstance(record.get('text'), str):
+                    yield record.get('id', line_number), record['text']
+                else:
+                    raise CommandError(f"{path}:{line_number}: expected a string or an object with a 'text' field")
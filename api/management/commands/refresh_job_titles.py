@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.models import JobTitle
+from api.ai_async import MAX_CONCURRENCY
+from api.suggestion_utils import get_title_suggestions_for_titles
+
+
+class Command(BaseCommand):
+    help = ("Fetch skills and responsibilities from Gemini for job titles, several prompts at a time, "
+            "and save them.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('titles', nargs='*', help="Job titles to refresh")
+        parser.add_argument('--missing', action='store_true',
+                            help="Refresh every stored job title that has no responsibilities yet")
+        parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENCY, help="Gemini calls in flight")
+        parser.add_argument('--hedge-after', type=float, default=None,
+                            help="Also ask the fallback model when the primary has not answered after this many seconds")
+
+    def handle(self, *args, **options):
+        titles = list(options['titles'])
+        if options['missing']:
+            titles += JobTitle.objects.filter(responsibilities=None).values_list('title', flat=True)
+        titles = list(dict.fromkeys(title.strip() for title in titles if title.strip()))
+        if not titles:
+            raise CommandError("Give job titles or --missing")
+
+        failed = get_title_suggestions_for_titles(titles, max(1, options['concurrency']), options['hedge_after'])
+        self.stdout.write(f"Refreshed {len(titles) - len(failed)} of {len(titles)} job title(s)")
+        for title in failed:
+            self.stderr.write(f"  no usable answer: {title}")
@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-18 00:29
+
+from django.db import migrations, models
+
+
+def seed_buckets(apps, schema_editor):
+    """Create one bucket per score and carry over the scores kept in GeneralData.ats_score."""
+    ATSScoreBucket = apps.get_model('api', 'ATSScoreBucket')
+    GeneralData = apps.get_model('api', 'GeneralData')
+    counts = dict.fromkeys(range(101), 0)
+    general = GeneralData.objects.filter(id=1).first()
+    for score in (general.ats_score or []) if general else []:
+        try:
+            counts[min(max(int(round(float(score))), 0), 100)] += 1
+        except (TypeError, ValueError):
+            continue
+    ATSScoreBucket.objects.bulk_create(
+        [ATSScoreBucket(score=score, count=count) for score, count in counts.items()],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_alter_jobtitle_field_group'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ATSScoreBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(unique=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_buckets, migrations.RunPython.noop),
+    ]
@@ -11,6 +11,14 @@ class GeneralData(models.Model):
     def __str__(self):
         return f"There are currently {self.currently_online} users online."
 
+class ATSScoreBucket(models.Model):
+    """Number of recorded ATS scores per whole score (0-100), used to rank a new score against others"""
+    score = models.PositiveSmallIntegerField(unique=True)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.count} resume(s) scored {self.score}"
+
 class Responsibility(models.Model):
     text = models.TextField(unique=True)
 
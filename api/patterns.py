@@ -0,0 +1,140 @@
+"""
+Precompiled regular expressions shared by the resume parser and the analysis utils.
+
+Everything here is compiled once at import time, so the hot parsing paths only run
+matches. Word lists that used to be applied with one re.sub per word are folded into a
+single alternation and resolved through a lookup table.
+"""
+import re
+from .resources import years_of_experience_map
+
+# --- Generic text clean-up -------------------------------------------------------
+
+WHITESPACE_RE = re.compile(r'\s+')
+DASH_CHARS_RE = re.compile(r'[\u2012\u2013\u2014\u2015–—]')  # en-dash, em-dash, etc.
+DASH_SPACING_RE = re.compile(r'\s*-\s*')
+LINE_EDGES_RE = re.compile(r"^[•\-–\*\s]*|[:\-\s]*$")  # bullets in front, colons/dashes behind
+NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]+")
+
+# --- Contact section -------------------------------------------------------------
+
+EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+VALID_PHONE_RE = re.compile(r'\+\d{10,15}(?: x\d{1,5})?')
+PHONE_CANDIDATE_RE = re.compile(r'(?:\+?\d[\d\s().-]{8,}\d)')
+PHONE_NON_DIGITS_RE = re.compile(r'[^\d+]')
+INTERNATIONAL_PHONE_RE = re.compile(r'\+[1-9]')  # +CC; country codes never start with 0
+LOCATION_RE = re.compile(r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*(?:,\s*[A-Z][a-z]+(?:\s[A-Z][a-z]+)*){0,2}\b')
+
+# Name line, ATS-style: 2 to 4 name parts with an optional suffix
+NAME_RE = re.compile(
+    r'''
+    ^                                                           # Start of line
+    (?:
+        (?:                                                     # A name part can be:
+            [A-ZÀ-ÖØ-Ý]{2,}                                      # 2+ uppercase letters (e.g., AKINRINOLA)
+            | [A-ZÀ-ÖØ-Ý][a-zà-öø-ÿ'’\-]+                        # Proper-case name (e.g., Olamide)
+            | [A-Z]\.?                                           # Single-letter initial with optional dot (e.g., J. or J)
+        )
+        \s+
+    ){1,3}                                                       # 2 to 4 parts total
+    (?:                                                          # Optional last name part (4th)
+        [A-ZÀ-ÖØ-Ý]{2,}
+        | [A-ZÀ-ÖØ-Ý][a-zà-öø-ÿ'’\-]+
+        | [A-Z]\.?
+    )
+    (?:\s+(?:Jr\.?|Sr\.?|II|III|IV|V))?                          # Optional suffix
+    $                                                           # End of line
+    ''',
+    re.VERBOSE
+)
+
+# --- Dates -----------------------------------------------------------------------
+
+# Full month names (and "Sept") to their three-letter abbreviation
+MONTH_ABBREVIATIONS = {
+    'sept': 'Sep',
+    'january': 'Jan', 'february': 'Feb', 'march': 'Mar', 'april': 'Apr',
+    'june': 'Jun', 'july': 'Jul', 'august': 'Aug', 'october': 'Oct',
+    'november': 'Nov', 'december': 'Dec'
+}
+MONTH_NAME_RE = re.compile(r'\b(?:' + '|'.join(MONTH_ABBREVIATIONS) + r')\b', re.IGNORECASE)
+
+
+def abbreviate_months(text: str) -> str:
+    """Replace full month names (and "Sept") with their abbreviation in one pass."""
+    return MONTH_NAME_RE.sub(lambda m: MONTH_ABBREVIATIONS[m.group(0).lower()], text)
+
+
+# Education: a year or month-year, optionally followed by a range end
+EDUCATION_SINGLE_LINE_DATE_RE = re.compile(
+    r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)?\.?\s?\d{4}(?:\s?[-–to]+\s?(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)?\.?\s?\d{4})?',
+    re.IGNORECASE
+)
+EDUCATION_DATE_RE = re.compile(
+    r'((?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|'
+    r'May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|'
+    r'Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)?\.?\s*\d{4}'
+    r'(?:\s*(?:–|-|to)\s*(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|'
+    r'Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|'
+    r'Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)?\.?\s*\d{4})?)',
+    re.IGNORECASE
+)
+TRAILING_SEPARATORS_RE = re.compile(r'[\s,–-]+$')
+IN_SEPARATOR_RE = re.compile(r'\s+in\s+', re.IGNORECASE)
+
+# Experience: a date range at the end of a line
+_RANGE_SEP = r'[-–—]|to'
+_MONTH = r'(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)'
+EXPERIENCE_DATE_PATTERNS = [
+    # Month YYYY to Month YYYY
+    rf'{_MONTH}\s+\d{{4}}\s*(?:{_RANGE_SEP})\s*{_MONTH}\s+\d{{4}}',
+    # Month YYYY to Present/Current/Ongoing
+    rf'{_MONTH}\s+\d{{4}}\s*(?:{_RANGE_SEP})\s*(Present|Current|Ongoing)',
+    # MM/YYYY to MM/YYYY
+    rf'\d{{2}}/\d{{4}}\s*(?:{_RANGE_SEP})\s*\d{{2}}/\d{{4}}',
+    # YYYY to YYYY
+    rf'\b\d{{4}}\s*(?:{_RANGE_SEP})\s*\d{{4}}\b',
+    # YYYY to Present/Current/Ongoing
+    rf'\b\d{{4}}\s*(?:{_RANGE_SEP})\s*(Present|Current|Ongoing|Till date|Till now|Till Present)\b'
+]
+EXPERIENCE_DURATION_RE = re.compile(rf"({'|'.join(EXPERIENCE_DATE_PATTERNS)})$", re.IGNORECASE)
+DATE_RANGE_SEPARATOR_RE = re.compile(r'\s*(?:to|[-–—])\s*', flags=re.IGNORECASE)
+
+# Years of experience stated in a summary, tried in order
+YEARS_OF_EXPERIENCE_RES = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'\b(\d{1,2})\+?\s+(?:years|yrs?)\b',
+        r'\bover\s+(\d{1,2})\s+(?:years|yrs?)\b',
+        r'\bmore than\s+(\d{1,2})\s+(?:years|yrs?)\b',
+        r'\b(?:with|have|has)\s+(\d{1,2})\s+(?:years|yrs?)\b',
+        r'\b(' + '|'.join(years_of_experience_map.keys()) + r')\s+(?:years|yrs?)\b',
+        r'\b(?:\w+\s+)?\((\d{1,2})\)\s+(?:years|yrs?)\b',
+    )
+]
+YEARS_RE = re.compile(r"(\d+)\+?\s*(years|yrs)")
+
+# Certifications: tried in order, first hit wins
+CERTIFICATION_DATE_RES = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4})',  # Month Year
+        r'(\d{1,2}/\d{4})',  # MM/YYYY
+        r'(\b\d{4}\b)',  # YYYY
+        r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\s*(?:-|to)\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4})'  # Date range
+    )
+]
+
+# --- Numbers ---------------------------------------------------------------------
+
+NUMBER_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+    "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40,
+}
+NUMBER_WORDS_RE = re.compile(r'\b(?:' + '|'.join(NUMBER_WORDS) + r')\b', re.IGNORECASE)
+
+
+def words_to_numbers(text: str) -> str:
+    """Replace whole number words (e.g. "five") with digits in one pass."""
+    return NUMBER_WORDS_RE.sub(lambda m: str(NUMBER_WORDS[m.group(0).lower()]), text)
@@ -0,0 +1,238 @@
+import atexit
+import hashlib
+import io
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import zipfile
+from typing import Optional
+from django.conf import settings
+from django.core.cache import caches
+
+# Cache alias configured in settings.CACHES
+PDF_CACHE_ALIAS = 'pdf_renders'
+PDF_CONTENT_TYPE = 'application/pdf'
+START_TIMEOUT = 30  # seconds for a new soffice process to accept connections
+
+
+class PdfConversionError(Exception):
+    pass
+
+
+def document_digest(docx_bytes: bytes) -> str:
+    """
+    SHA-256 of a DOCX's parts (names and contents), so re-saving the same document, which
+    only changes the zip entry timestamps, maps to the same PDF.
+    """
+    digest = hashlib.sha256()
+    try:
+        with zipfile.ZipFile(io.BytesIO(docx_bytes)) as package:
+            for name in sorted(package.namelist()):
+                digest.update(name.encode('utf-8') + b'\0')
+                digest.update(hashlib.sha256(package.read(name)).digest())
+    except zipfile.BadZipFile:
+        digest.update(docx_bytes)
+    return digest.hexdigest()
+
+
+class LibreOfficeWorker:
+    """
+    One long-lived headless soffice process with its own profile, driven over a UNO pipe.
+
+    Starting LibreOffice and initializing a profile takes seconds; a warm process converts
+    a one-page resume in a fraction of that. Needs LibreOffice and its Python UNO bindings
+    (e.g. the python3-uno package) on the worker host.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.jobs = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._desktop = None
+        self._workdir = None
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """Launch soffice and connect to it; every failure is raised as PdfConversionError."""
+        try:
+            self._start()
+        except PdfConversionError:
+            raise
+        except Exception as e:
+            self.stop()
+            raise PdfConversionError(f'Could not start LibreOffice: {e}')
+
+    def _start(self) -> None:
+        try:
+            import uno
+        except ImportError:
+            raise PdfConversionError('LibreOffice UNO bindings (python3-uno) are not installed')
+        self._workdir = tempfile.mkdtemp(prefix=f'{self.name}-')
+        profile = uno.systemPathToFileUrl(os.path.join(self._workdir, 'profile'))
+        pipe = f'{self.name}_{os.getpid()}'
+        try:
+            self._process = subprocess.Popen(
+                [getattr(settings, 'LIBREOFFICE_PATH', 'soffice'), f'-env:UserInstallation={profile}',
+                 '--headless', '--invisible', '--nologo', '--norestore', '--nodefault',
+                 f'--accept=pipe,name={pipe};urp;StarOffice.ComponentContext'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+            )
+        except OSError as e:
+            self.stop()
+            raise PdfConversionError(f'Could not start LibreOffice: {e}')
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext('com.sun.star.bridge.UnoUrlResolver', local)
+        deadline = time.monotonic() + START_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(f'uno:pipe,name={pipe};urp;StarOffice.ComponentContext')
+                break
+            except Exception:
+                if not self.running or time.monotonic() > deadline:
+                    self.stop()
+                    raise PdfConversionError('LibreOffice did not start')
+                time.sleep(0.25)
+        self._desktop = context.ServiceManager.createInstanceWithContext('com.sun.star.frame.Desktop', context)
+
+    def convert(self, docx_bytes: bytes, timeout: float) -> bytes:
+        """Render docx_bytes to PDF; a job running past timeout kills the process."""
+        if not self.running:
+            self.start()
+        try:
+            import uno
+            from com.sun.star.beans import PropertyValue
+        except ImportError as e:
+            raise PdfConversionError(f'LibreOffice UNO bindings are not usable: {e}')
+
+        def prop(name, value):
+            p = PropertyValue()
+            p.Name, p.Value = name, value
+            return p
+
+        source = os.path.join(self._workdir, 'job.docx')
+        target = os.path.join(self._workdir, 'job.pdf')
+        with open(source, 'wb') as f:
+            f.write(docx_bytes)
+        watchdog = threading.Timer(timeout, self.stop)
+        watchdog.start()
+        try:
+            doc = self._desktop.loadComponentFromURL(uno.systemPathToFileUrl(source), '_blank', 0,
+                                                     (prop('Hidden', True),))
+            try:
+                doc.storeToURL(uno.systemPathToFileUrl(target), (prop('FilterName', 'writer_pdf_Export'),))
+            finally:
+                doc.close(True)
+            with open(target, 'rb') as f:
+                pdf = f.read()
+        except Exception as e:
+            if not watchdog.is_alive():
+                raise PdfConversionError(f'PDF conversion timed out after {timeout}s')
+            raise PdfConversionError(f'PDF conversion failed: {e}')
+        finally:
+            watchdog.cancel()
+            for path in (source, target):
+                if os.path.exists(path):
+                    os.remove(path)
+        self.jobs += 1
+        return pdf
+
+    def stop(self) -> None:
+        process, self._process, self._desktop = self._process, None, None
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait(timeout=5)
+        if self._workdir:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+            self._workdir = None
+        self.jobs = 0
+
+
+class ConverterPool:
+    """
+    A fixed set of converter workers shared by the jobs of one process.
+
+    A job waits up to queue_timeout for an idle worker. A worker that fails or times out
+    is stopped and restarted on its next job; one that has done max_jobs conversions is
+    recycled, so LibreOffice memory growth stays bounded.
+    """
+
+    def __init__(self, size: int = 1, max_jobs: int = 100, timeout: float = 60, queue_timeout: float = 30,
+                 worker_factory=LibreOfficeWorker):
+        self.max_jobs = max_jobs
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self._workers = [worker_factory(f'smartapplicant_pdf{i}') for i in range(size)]
+        self._idle = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    def convert(self, docx_bytes: bytes) -> bytes:
+        try:
+            worker = self._idle.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            raise PdfConversionError('All PDF converters are busy')
+        try:
+            return worker.convert(docx_bytes, self.timeout)
+        except Exception:
+            worker.stop()
+            raise
+        finally:
+            if worker.jobs >= self.max_jobs:
+                worker.stop()
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.stop()
+
+
+_pool: Optional[ConverterPool] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConverterPool:
+    """This process's converter pool; a forked Celery worker builds its own on first use."""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = ConverterPool(
+                    size=getattr(settings, 'PDF_CONVERTER_WORKERS', 1),
+                    max_jobs=getattr(settings, 'PDF_WORKER_MAX_JOBS', 100),
+                    timeout=getattr(settings, 'PDF_CONVERSION_TIMEOUT', 60),
+                    queue_timeout=getattr(settings, 'PDF_QUEUE_TIMEOUT', 30),
+                )
+                _pool_pid = pid
+                atexit.register(_pool.close)
+    return _pool
+
+
+def render_pdf(docx_bytes: bytes, pool: Optional[ConverterPool] = None) -> bytes:
+    """
+    The PDF rendering of a DOCX, converted at most once per distinct document (see
+    document_digest). Raises PdfConversionError if it cannot be rendered.
+    """
+    key = f'pdf:{document_digest(docx_bytes)}'
+    try:
+        cached = caches[PDF_CACHE_ALIAS].get(key)
+        if cached is not None:
+            return cached
+    except Exception as e:
+        print(f'PDF cache unavailable: {e}')
+
+    pdf = (pool or get_pool()).convert(docx_bytes)
+    try:
+        caches[PDF_CACHE_ALIAS].set(key, pdf)
+    except Exception as e:
+        print(f'PDF cache unavailable: {e}')
+    return pdf
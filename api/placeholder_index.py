@@ -0,0 +1,91 @@
+import re
+from typing import Dict, Iterable, List, Optional
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+
+PLACEHOLDER_RE = re.compile(r'\{\{[^{}]*\}\}')
+W_P = qn('w:p')
+
+
+class PlaceholderIndex:
+    """
+    Map of '{{token}}' to the body paragraphs (doc.paragraphs) that contain it.
+
+    Built with one pass over the document, so fill and cleanup steps look placeholders
+    up instead of re-reading every paragraph's text once per placeholder. Callers that
+    change a paragraph's text, insert or remove paragraphs report it with refresh(),
+    add() and remove(). Paragraphs detached from the body are dropped on lookup.
+    """
+
+    def __init__(self, doc):
+        self._parent = doc._body
+        self._body = doc.element.body
+        self._texts: Dict[object, str] = {}          # paragraph element -> text, for paragraphs with tokens
+        self._tokens: Dict[str, Dict[object, None]] = {}  # token -> paragraph elements (ordered set)
+        for p in self._body.iterchildren(W_P):
+            self._index(p, Paragraph(p, self._parent).text)
+
+    def _index(self, p, text: str) -> None:
+        tokens = set(PLACEHOLDER_RE.findall(text))
+        if not tokens:
+            return
+        self._texts[p] = text
+        for token in tokens:
+            self._tokens.setdefault(token, {})[p] = None
+
+    def _drop(self, p) -> None:
+        text = self._texts.pop(p, None)
+        if text is None:
+            return
+        for token in set(PLACEHOLDER_RE.findall(text)):
+            elements = self._tokens.get(token)
+            if elements is not None:
+                elements.pop(p, None)
+                if not elements:
+                    del self._tokens[token]
+
+    def _in_document_order(self, elements: Iterable) -> List[Paragraph]:
+        live = [p for p in elements if p.getparent() is self._body]
+        if len(live) > 1:
+            position = {p: i for i, p in enumerate(self._body.iterchildren(W_P))}
+            live.sort(key=position.__getitem__)
+        return [Paragraph(p, self._parent) for p in live]
+
+    def paragraphs(self, token: str) -> List[Paragraph]:
+        """Paragraphs containing token, in document order."""
+        return self._in_document_order(self._tokens.get(token, ()))
+
+    def first(self, token: str) -> Optional[Paragraph]:
+        paragraphs = self.paragraphs(token)
+        return paragraphs[0] if paragraphs else None
+
+    def with_placeholders(self) -> List[Paragraph]:
+        """Every paragraph containing at least one token, in document order."""
+        return self._in_document_order(list(self._texts))
+
+    def text(self, paragraph: Paragraph) -> str:
+        """paragraph.text, from the index when the paragraph has tokens."""
+        text = self._texts.get(paragraph._p)
+        return text if text is not None else paragraph.text
+
+    def refresh(self, paragraph: Paragraph) -> None:
+        """Re-read a paragraph whose text changed, or index a newly inserted one."""
+        self._drop(paragraph._p)
+        self._index(paragraph._p, paragraph.text)
+
+    add = refresh
+
+    def remove(self, paragraph: Paragraph) -> None:
+        self._drop(paragraph._p)
+
+    def preceding(self, paragraph: Paragraph, count: int) -> List[Paragraph]:
+        """Up to count body paragraphs before paragraph, nearest first (tables are skipped, like doc.paragraphs)."""
+        siblings = []
+        for p in paragraph._p.itersiblings(W_P, preceding=True):
+            if len(siblings) == count:
+                break
+            siblings.append(Paragraph(p, self._parent))
+        return siblings
+
+    def __contains__(self, token: str) -> bool:
+        return bool(self.paragraphs(token))
@@ -0,0 +1,90 @@
+import hashlib
+import time
+from typing import Optional
+from django.conf import settings
+from django.core.cache import caches
+from .lexicon import get_skill_lexicon
+
+# Cache alias configured in settings.CACHES; bump its VERSION to drop entries after parser changes.
+RESUME_CACHE_ALIAS = 'resumes'
+HITS_KEY = 'resume:stats:hits'
+MISSES_KEY = 'resume:stats:misses'
+RETRY_AFTER = 30  # seconds the cache is skipped after an error, so uploads don't each wait on a dead Redis
+
+_unavailable_until = 0.0
+
+
+def _available() -> bool:
+    return time.monotonic() >= _unavailable_until
+
+
+def _mark_unavailable(error: Exception) -> None:
+    global _unavailable_until
+    _unavailable_until = time.monotonic() + RETRY_AFTER
+    print(f'Resume cache unavailable: {error}')
+
+
+def file_digest(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def _cache_key(file_bytes: bytes, filename: str) -> str:
+    """
+    Content address of an upload: SHA-256 of the bytes, plus the file type and the
+    extraction budget, since both change the extracted text, and a digest of the skill
+    lexicon files, so an edited lexicon re-parses instead of serving stale skills.
+    """
+    extension = filename.lower().rsplit('.', 1)[-1]
+    max_pages = getattr(settings, 'RESUME_MAX_PDF_PAGES', '')
+    max_chars = getattr(settings, 'RESUME_MAX_TEXT_CHARS', '')
+    lexicon = hashlib.sha256(repr(get_skill_lexicon().signature).encode('utf-8')).hexdigest()[:12]
+    return f"resume:{file_digest(file_bytes)}:{extension}:{max_pages}:{max_chars}:{lexicon}"
+
+
+def _count(key: str) -> None:
+    cache = caches[RESUME_CACHE_ALIAS]
+    try:
+        cache.incr(key)
+    except ValueError:
+        # First event of its kind; another process may have created it in the meantime
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_cached_resume(file_bytes: bytes, filename: str) -> Optional[dict]:
+    """
+    Return {'text': ..., 'analysis': ...} for a previously seen upload, or None.
+
+    Cache errors (e.g. Redis unavailable) count as a miss, so uploads never fail on them,
+    and after one the cache is skipped for RETRY_AFTER seconds.
+    """
+    if not _available():
+        return None
+    try:
+        entry = caches[RESUME_CACHE_ALIAS].get(_cache_key(file_bytes, filename))
+        _count(HITS_KEY if entry is not None else MISSES_KEY)
+        return entry
+    except Exception as e:
+        _mark_unavailable(e)
+        return None
+
+
+def cache_resume(file_bytes: bytes, filename: str, text: str, analysis: dict) -> None:
+    """Store the extracted text and the parse_all() result for an upload."""
+    if not _available():
+        return
+    try:
+        caches[RESUME_CACHE_ALIAS].set(_cache_key(file_bytes, filename), {'text': text, 'analysis': analysis})
+    except Exception as e:
+        _mark_unavailable(e)
+
+
+def resume_cache_stats() -> dict:
+    """Hit and miss counters shared by every process using the cache."""
+    try:
+        counts = caches[RESUME_CACHE_ALIAS].get_many([HITS_KEY, MISSES_KEY])
+    except Exception as e:
+        return {'status': 0, 'message': str(e)}
+    hits, misses = counts.get(HITS_KEY, 0), counts.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': round(hits / total, 4) if total else 0.0}
@@ -1,4 +1,6 @@
 import re
+import copy
+import hashlib
 from datetime import datetime
 from collections import defaultdict
 from dateutil import parser
@@ -10,12 +12,65 @@ from phonenumbers.phonenumberutil import NumberParseException
 from .resources import (supported_country_phonecodes, common_job_titles, career_objective_titles as cot,
                         education_section_titles as est, experience_section_titles as exst, skills_section_titles as sst,
                         certifications_section_titles as cst, other_boundary_section_titles as ost,
-                        years_of_experience_map, degree_keywords, institution_keywords)
+                        years_of_experience_map)
+from .lexicon import get_skill_lexicon
+from .keyword_matcher import KeywordMatcher
+from .caching import LRUCache
+from .education_classifier import EDUCATION_CLASSIFIER
+from .patterns import (EMAIL_RE, VALID_PHONE_RE, NAME_RE, LOCATION_RE, DASH_CHARS_RE, DASH_SPACING_RE,
+                       WHITESPACE_RE, LINE_EDGES_RE, EDUCATION_SINGLE_LINE_DATE_RE, EDUCATION_DATE_RE,
+                       TRAILING_SEPARATORS_RE, IN_SEPARATOR_RE, EXPERIENCE_DURATION_RE, DATE_RANGE_SEPARATOR_RE,
+                       YEARS_OF_EXPERIENCE_RES, CERTIFICATION_DATE_RES, PHONE_CANDIDATE_RE, PHONE_NON_DIGITS_RE,
+                       INTERNATIONAL_PHONE_RE, abbreviate_months)
+from .section_segmenter import segment_resume, HEADED_SECTIONS
 import unicodedata
 
 class SmartPhoneExtractor:
+    # Resolved candidates shared by every extractor, keyed by (raw digits, region order)
+    _resolved = LRUCache(maxsize=4096)
+
     def __init__(self, supported_regions=None):
-        self.supported_regions = supported_regions or  supported_country_phonecodes.keys()
+        self.supported_regions = tuple(supported_regions or supported_country_phonecodes.keys())
+
+    @staticmethod
+    def _candidates(text):
+        """Digit-rich runs (>=9 digits) with everything but digits and '+' removed."""
+        return [PHONE_NON_DIGITS_RE.sub('', c) for c in PHONE_CANDIDATE_RE.findall(text)]
+
+    @staticmethod
+    def _valid_e164(raw, region):
+        try:
+            number_obj = phonenumbers.parse(raw, region)
+        except NumberParseException:
+            return None
+        if phonenumbers.is_valid_number(number_obj):
+            return phonenumbers.format_number(number_obj, phonenumbers.PhoneNumberFormat.E164)
+        return None
+
+    def resolve(self, raw):
+        """
+        Return the E164 form of one cleaned candidate, or the candidate itself if no region validates it.
+
+        - A leading +CC (country codes never start with 0) fixes the region, so parse once
+        - Otherwise try Nigeria first, then the other supported regions in order
+        - Results are memoized across extractors and resumes
+        """
+        key = (raw, self.supported_regions)
+        parsed_number = self._resolved.get(key)
+        if parsed_number is not None:
+            return parsed_number
+
+        if INTERNATIONAL_PHONE_RE.match(raw):
+            parsed_number = self._valid_e164(raw, None)
+        else:
+            for region in ('NG',) + self.supported_regions:
+                parsed_number = self._valid_e164(raw, region)
+                if parsed_number:
+                    break
+
+        parsed_number = parsed_number or raw
+        self._resolved.set(key, parsed_number)
+        return parsed_number
 
     def extract_phone_numbers(self, text):
         """
@@ -24,44 +79,54 @@ class SmartPhoneExtractor:
         - Falls back to other supported regions
         - Preserves unmatched numbers as raw
         """
-        # Step 1: Extract digit-rich candidates (>=9 digits)
-        candidates = candidates = re.findall(r'(?:\+?\d[\d\s().-]{8,}\d)', text) 
-        cleaned_candidates= [re.sub(r'[^\d+]', '', c) for c in candidates] # remove non-digit characters except '+'
-        
-        if not cleaned_candidates:
-            return []
-
-        found_numbers = []
-
-        for raw in cleaned_candidates:
-            parsed_number = None
+        return list(set(self.resolve(raw) for raw in self._candidates(text)))  # remove duplicates
 
-            # Step 2: Try Nigeria first
-            try:
-                number_obj = phonenumbers.parse(raw, 'NG')
-                if phonenumbers.is_valid_number(number_obj):
-                    parsed_number = phonenumbers.format_number(number_obj, phonenumbers.PhoneNumberFormat.E164)
-            except NumberParseException:
-                pass
-
-            # Step 3: If Nigeria failed, try other supported regions
-            if not parsed_number:
-                for region in self.supported_regions:
-                    try:
-                        number_obj = phonenumbers.parse(raw, region)
-                        if phonenumbers.is_valid_number(number_obj):
-                            parsed_number = phonenumbers.format_number(number_obj, phonenumbers.PhoneNumberFormat.E164)
-                            break
-                    except NumberParseException:
-                        continue
-
-            # Step 4: Fallback to raw
-            found_numbers.append(parsed_number or raw)
-
-        return list(set(found_numbers))  # remove duplicates
+    def extract_phone_numbers_bulk(self, texts):
+        """
+        Bulk version of extract_phone_numbers for many texts (e.g. a batch of contact sections).
 
+        Candidates are collected across all texts and each distinct one is resolved once.
+        Returns one list of numbers per input text, in input order.
+        """
+        candidates = [self._candidates(text) for text in texts]
+        resolved = {raw: self.resolve(raw) for raw in set().union(*candidates)} if candidates else {}
+        return [list(set(resolved[raw] for raw in raws)) for raws in candidates]
+
+
+# Lowercased job titles compiled once; parse_metadata uses it to reject name/location candidates.
+JOB_TITLE_MATCHER = KeywordMatcher(title.lower() for title in common_job_titles)
+
+
+# Errors raised while locating resume sections, keyed by (section, problem).
+# 'title' means the section heading is missing, 'content' means the section is empty.
+SECTION_ERRORS = {
+    ('contact', 'content'): "Contact Section - extraction: Your contact information such as your name, email, phone number should all be in the first few lines of your resume before Career Summary, Work Experience, Education, or Skills sections.",
+    ('education', 'title'): "Education Section - Title: Your resume should contain a clearly marked education section. Mark this off with a clearly stated title like: Education, Academic Background, or Academic Qualifications. Should be written in all upper case letters or proper case.",
+    ('education', 'content'): "Education Section - content: Your education should be clearly stated in the Education section of your resume. Ensure it is well-formatted with degrees, institutions, and dates. Follow either a single line format (Degree in Field, Instition, Location, Graduation date. e.g Bachelor of Science in Computer Science, University of Lagos, Lagos State Nigeria, Jan 2020) or a multi-line format (Degree in Field and Graduation date on the first line, Institution and Location on the second line, optional third line to state your class of graduation or CGPA. e.g Bachelor of Science in Computer Science Aug 2020 (on the first line); University of Lagos, Lagos State Nigeria (on the second line); Graduated with First Class Honours (optional, on the third line)). Maintain the same order for all your education entries.",
+    ('experience', 'title'): "Experience Section - title: Your work experience should be clearly stated within your resume. Mark this off with a clearly stated title like: Work Experience, Professional Experience, Employment History, or Career History. Should be written in all upper case letters or proper case. If you have no work experience, you can provide your internship or volunteer experience.",
+    ('experience', 'content'): "Experience Section - content: Provide some infomation about your work history. If you have no work experience, you can provide your internship or volunteer experience. Ensure it is well-formatted with job titles, company names, locations, and dates. Follow a consistent format for all entries.",
+    ('skills', 'title'): "Skills Section - title: Your skills should be listed in the Skills section of your resume. Mark them with a header like 'Skills' or 'Technical Skills'. You can use simple rounded bullet point for each skill. You can group your skills or list them as is (e.g., Python, SQL, Java; or groups like this - Programming: Python, Dart, C++).",
+    ('skills', 'content'): "Skills Section: Your skills should be listed in the Skills section of your resume. Mark them with a header like 'Skills' or 'Technical Skills'. You use simple rounded bullet point for eack skill. You can group your skills or list them as is (e.g., Python, SQL, Java; or groups like this- Programming: Python, Dart, C++).",
+    ('certifications', 'title'): "Certifications Section - title: Your certifications should be clearly stated in the Certifications section of your resume. Mark this off with a clearly stated title like: Certifications, Professional Certifications, or Professional Qualifications. Should be written in all upper case letters or proper case.",
+    ('certifications', 'content'): "Certifications Section - content: Your certifications should be clearly stated in the Certifications section of your resume. Mark this off with a clearly stated title like: Certifications, Professional Certifications, or Professional Qualifications. Should be written in all upper case letters or proper case.",
+    ('career_objective', 'title'): "Career Objective/Summary Section - title: Your career objective should be clearly stated in the first few lines of your resume before Work Experience, Education, or Skills sections. Mark this off with a clearly stated title like: Career Objective, SUMMARY, or Career Profile or just Objective. Should be written in all upper case letters or proper case.",
+    ('career_objective', 'content'): "Career Objective/Summary Section - extraction: Your career objective should be clearly stated in the first few lines of your resume before Work Experience, Education, or Skills sections. Mark this off with a clearly stated title like: Career Objective, SUMMARY, or Career Profile or just Objective. Should be written in all upper case letters or proper case.",
+}
+
+# parse_all steps in order: (method, inputs it reads, parsed_data keys it writes).
+# 'resume_text' stands for the whole text, since parse_skills also scans outside its section,
+# so any edit re-runs parse_skills.
+PARSE_STEPS = (
+    ('parse_metadata', ('contact',), ('metadata',)),
+    ('parse_education', ('education',), ('education',)),
+    ('parse_experience', ('career_objective', 'experience'), ('experience', 'experience_duration')),
+    ('parse_skills', ('skills', 'resume_text'), ('skills',)),
+    ('parse_certifications', ('certifications',), ('certifications',)),
+)
 
 class ResumeParser:
+    _score_log = None  # list of (section, score) deductions while a parse step is being recorded
+
     def __init__(self, resume_text):
         self.resume_text = resume_text
         self.errors = []
@@ -82,6 +147,7 @@ class ResumeParser:
             'skills': [],
             'certifications': []
         }
+        self.lexicon = get_skill_lexicon()
         self.known_skills = self._load_known_skills()
         
     def _subtract_section_scores(self, section, score):
@@ -89,6 +155,8 @@ class ResumeParser:
         Subtracts a score from the sectional scores for a given section.
         If the section does not exist, it does nothing.
         """
+        if self._score_log is not None:
+            self._score_log.append((section, score))
         if section in self.sectional_scores:
             self.sectional_scores[section] -= score
             if self.sectional_scores[section] < 0:
@@ -139,58 +207,36 @@ class ResumeParser:
         return sections
     
     def _identify_sections(self):
-        """Extracts section texts from the resume based on common headings."""
-        sections = {
-            'contact': self.extract_contact_section(),
-            'education': self.extract_education_section(),
-            'experience': self.extract_experience_section(),
-            'skills': self.extract_skills_section(),
-            'certifications': self.extract_certifications_section(),
-            'career_objective': self.extract_career_objective_section()
-        }
-        
+        """Extracts section texts from the resume based on common headings.
+
+        Uses a single pass of the section segmenter and records the same errors and score
+        deductions, in the same order, as the individual extract_*_section methods.
+        """
+        self.section_spans = segment_resume(self.resume_text).spans
+        sections = {}
+
+        for section in ('contact',) + HEADED_SECTIONS:
+            span = self.section_spans[section]
+            if span is None:
+                self.errors.append(SECTION_ERRORS[(section, 'title')])
+                if section != 'career_objective':
+                    self._subtract_section_scores(section, 20)
+                continue
+            if not span.text and not span.inline:
+                self.errors.append(SECTION_ERRORS[(section, 'content')])
+                self._subtract_section_scores(section, 20)
+            sections[section] = span.text
+
         # Clean up empty sections
         return {k: v for k, v in sections.items() if v}
     
     def _load_known_skills(self):
-        """Load all skill data from JSON files and return combined dictionary."""
-        # Define file paths for each skill category
-        #base_path = os.path.dirname(__file__)
-        ts_filepath = os.path.join('data', 'ts.json')
-        soft_filepath = os.path.join('data', 'ss.json')
-        domain_filepath = os.path.join('data', 'dss.json')
-        tools_filepath = os.path.join('data', 'ts.json')
-        cert_filepath = os.path.join('data', 'cm.json')
-        
-        # Initialize dictionary to hold the data
-        skills_dict = {'ts': [], 'soft': [], 'domain': [], 'tools': [], 'cert': [], 'all': []}
-        
-        # Load JSON data
-        def load_json_file(file_path):
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                return []
-        
-        # Load data for each category
-        skills_dict['ts'] = load_json_file(ts_filepath)
-        skills_dict['soft'] = load_json_file(soft_filepath)
-        skills_dict['domain'] = load_json_file(domain_filepath)
-        skills_dict['tools'] = load_json_file(tools_filepath)
-        skills_dict['cert'] = load_json_file(cert_filepath)
-        
-        # Combine all skills into 'all'
-        all_skills = set()
-        all_skills.update(skills_dict['ts'])
-        all_skills.update(skills_dict['soft'])
-        all_skills.update(skills_dict['domain'])
-        all_skills.update(skills_dict['tools'])
-        all_skills.update(skills_dict['cert'])
-        
-        skills_dict['all'] = list(all_skills)  # Convert set back to list
-        
-        return skills_dict
+        """Return the shared, read-only skill lexicon as a {category: skills} mapping.
+
+        The lexicon files are loaded once per process (see api.lexicon) and reloaded
+        only when they change on disk.
+        """
+        return self.lexicon.known_skills
     
     def extract_phone_numbers(self, text, default_country_code='234'):
         """
@@ -250,7 +296,7 @@ class ResumeParser:
             return {}
         
         # Email extraction (unchanged)
-        emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', contact_text)
+        emails = EMAIL_RE.findall(contact_text)
         if emails:
             self.parsed_data['metadata']['email'] = emails[0]
         else:
@@ -261,35 +307,14 @@ class ResumeParser:
         phone_extractor = SmartPhoneExtractor(supported_regions=supported_country_phonecodes.keys())
         phones = phone_extractor.extract_phone_numbers(contact_text)
         if phones:
-            valid_numbers = [number for number in phones if re.fullmatch(r'\+\d{10,15}(?: x\d{1,5})?', number)]
+            valid_numbers = [number for number in phones if VALID_PHONE_RE.fullmatch(number)]
             self.parsed_data['metadata']['phone'] = valid_numbers[0] if valid_numbers else None
         if not self.parsed_data['metadata'].get('phone'):
             self.errors.append('Contact Section - phone: Ensure your phone number is correctly formatted. For best practice, phone number should be within the first three lines in your resume, usually below your name. Use international format: e.g +2341234567890 or 1234567890.')
             self._subtract_section_scores('contact', 6)
         
         
-        # Name extraction - ATS-style rule-based
-        name_pattern = re.compile(
-            r'''
-            ^                                                           # Start of line
-            (?:
-                (?:                                                     # A name part can be:
-                    [A-ZÀ-ÖØ-Ý]{2,}                                      # 2+ uppercase letters (e.g., AKINRINOLA)
-                    | [A-ZÀ-ÖØ-Ý][a-zà-öø-ÿ'’\-]+                        # Proper-case name (e.g., Olamide)
-                    | [A-Z]\.?                                           # Single-letter initial with optional dot (e.g., J. or J)
-                )
-                \s+
-            ){1,3}                                                       # 2 to 4 parts total
-            (?:                                                          # Optional last name part (4th)
-                [A-ZÀ-ÖØ-Ý]{2,}
-                | [A-ZÀ-ÖØ-Ý][a-zà-öø-ÿ'’\-]+
-                | [A-Z]\.?
-            )
-            (?:\s+(?:Jr\.?|Sr\.?|II|III|IV|V))?                          # Optional suffix
-            $                                                           # End of line
-            ''',
-            re.VERBOSE
-        )
+        # Name extraction - ATS-style rule-based (see NAME_RE)
         
         if not self.parsed_data['metadata'].get('name'):
             # Strategy 1: First line that looks like a name
@@ -297,9 +322,9 @@ class ResumeParser:
             for line in first_lines[:3]:
                 line_lower = line.lower()
                 if (
-                    re.fullmatch(name_pattern, line)
-                    and not any(skill in line_lower for skill in self.known_skills['all'])
-                    and not any(title.lower() in line_lower for title in common_job_titles)
+                    NAME_RE.fullmatch(line)
+                    and not self.lexicon.exact_matcher.contains_any(line_lower)
+                    and not JOB_TITLE_MATCHER.contains_any(line_lower)
                 ):
                     self.parsed_data['metadata']['name'] = line.strip()
                     break
@@ -311,10 +336,10 @@ class ResumeParser:
                 if lines:
                     # ensure line does not contain numbers
                     if (
-                        re.fullmatch(name_pattern, line)
+                        NAME_RE.fullmatch(line)
                         and not any(char.isdigit() for char in line)
-                        and not any(skill in line_lower for skill in self.known_skills['all'])
-                        and not any(title.lower() in line_lower for title in common_job_titles)
+                        and not self.lexicon.exact_matcher.contains_any(line_lower)
+                        and not JOB_TITLE_MATCHER.contains_any(line_lower)
                     ):
                         self.parsed_data['metadata']['name'] = lines[-1].strip()
             
@@ -326,20 +351,19 @@ class ResumeParser:
         if not self.parsed_data['metadata'].get('location'):
             # Strategy 1: Common city/state/country patterns
             # location_pattern = r'\b(?:[A-Z][a-z]+\s*,\s*)?(?:[A-Z]{2}|\b[A-Z][a-z]+\b)(?:\s*\d{5})?\b'
-            location_pattern = r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*(?:,\s*[A-Z][a-z]+(?:\s[A-Z][a-z]+)*){0,2}\b'
             contact_lines = [line.strip() for line in contact_text.split('\n') if line.strip()]
             if contact_lines:
                 for line in contact_lines[:5]:
                     line_lower = line.lower()
                     if (
-                        re.search(location_pattern, line)
-                        and not any(skill in line_lower for skill in self.known_skills['all'])
-                        and not any(title.lower() in line_lower for title in common_job_titles)
+                        LOCATION_RE.search(line)
+                        and not self.lexicon.exact_matcher.contains_any(line_lower)
+                        and not JOB_TITLE_MATCHER.contains_any(line_lower)
                     ):
-                        matched = re.findall(location_pattern, line)
+                        matched = LOCATION_RE.findall(line)
                         if matched:
                             self.parsed_data['metadata']['location'] = matched[0].strip()
-                            print(f'Possible location found: {self.parsed_data["metadata"]["location"]}')
+                            # print(f'Possible location found: {self.parsed_data["metadata"]["location"]}')
                             break
             
             # Strategy 2: After "Location:" or "Address:" markers
@@ -376,39 +400,26 @@ class ResumeParser:
             text = text.replace('\t', ' ')
 
             # Replace different dash types with regular dash
-            text = re.sub(r'[\u2012\u2013\u2014\u2015–—]', '-', text)  # en-dash, em-dash, etc.
+            text = DASH_CHARS_RE.sub('-', text)  # en-dash, em-dash, etc.
 
             # Remove multiple spaces and spaces around dashes
-            text = re.sub(r'\s*-\s*', ' - ', text)  # normalize spacing around dash
-            text = re.sub(r'\s+', ' ', text).strip()  # collapse multiple spaces
+            text = DASH_SPACING_RE.sub(' - ', text)  # normalize spacing around dash
+            text = WHITESPACE_RE.sub(' ', text).strip()  # collapse multiple spaces
 
             # Optionally standardize months (e.g., Sept -> Sep)
-            month_map = {
-                'Sept': 'Sep',
-                'January': 'Jan', 'February': 'Feb', 'March': 'Mar', 'April': 'Apr',
-                'June': 'Jun', 'July': 'Jul', 'August': 'Aug', 'October': 'Oct',
-                'November': 'Nov', 'December': 'Dec'
-            }
-            for full, abbr in month_map.items():
-                text = re.sub(rf'\b{full}\b', abbr, text, flags=re.IGNORECASE)
-
-            return text
+            return abbreviate_months(text)
 
         def is_degree_line(line: str) -> bool:
             """Check if a line is likely a degree line using a curated list of degree keywords."""
-            pattern = r'\b(?:' + '|'.join(degree_keywords) + r')\b'
-            return bool(re.search(pattern, line, re.I))
+            return EDUCATION_CLASSIFIER.is_degree(line)
 
         def is_institution_line(line: str) -> bool:
             """Check if a line is likely an institution line."""
-            pattern = r'\b(?:' + '|'.join(institution_keywords) + r')\b'
-            return bool(re.search(pattern, line, re.I))
+            return EDUCATION_CLASSIFIER.is_institution(line)
 
         def is_one_line_education(line: str) -> bool:
             """Check if a line is a one-line education entry."""
-            institution_pattern = r'\b(?:' + '|'.join(institution_keywords) + r')\b'
-            degree_pattern = r'\b(?:' + '|'.join(degree_keywords) + r')\b'
-            return bool(re.search(institution_pattern, line, re.I) and re.search(degree_pattern, line, re.I))
+            return EDUCATION_CLASSIFIER.is_institution(line) and EDUCATION_CLASSIFIER.is_degree(line)
 
         def identify_format(first_line: str) -> str:
             """
@@ -431,34 +442,21 @@ class ResumeParser:
             Handles common single-line formats with possible order reversals (degree, field, institution, date).
             Returns a list of structured dictionaries with keys: degree, field, institution, location, dates, description.
             """
-            date_pattern = re.compile(
-                r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)?\.?\s?\d{4}(?:\s?[-–to]+\s?(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)?\.?\s?\d{4})?',
-                re.IGNORECASE
-            )
-
             def extract_date(text: str) -> Tuple[str, Optional[str]]:
-                match = date_pattern.search(text)
+                match = EDUCATION_SINGLE_LINE_DATE_RE.search(text)
                 if match:
                     return text.replace(match.group(), '').strip(" ,–-"), match.group().strip()
                 return text, None
 
             def extract_degree_and_field(text: str) -> (Tuple[Optional[str], Optional[str]]):
-                for degree in sorted(degree_keywords, key=len, reverse=True):
-                    pattern = rf'({degree})\s*(in)?\s*([\w &/-]+)'
-                    match = re.search(pattern, text)  # case sensitive to avoid false positives
-                    if match:
-                        degree_found = match.group(1)
-                        field = match.group(3).strip()
-                        return degree_found, field
-                return None, None
+                return EDUCATION_CLASSIFIER.extract_degree_and_field(text)
 
             def extract_institution_and_location(text: str) -> Tuple[Optional[str], Optional[str]]:
-                for keyword in institution_keywords:
-                    if keyword.lower() in text.lower():
-                        parts = text.split(',')
-                        institution = parts[0].strip()
-                        location = ','.join(parts[1:]).strip() if len(parts) > 1 else ''
-                        return institution, location
+                if EDUCATION_CLASSIFIER.has_institution(text):
+                    parts = text.split(',')
+                    institution = parts[0].strip()
+                    location = ','.join(parts[1:]).strip() if len(parts) > 1 else ''
+                    return institution, location
                 return None, None
 
             results = []
@@ -534,26 +532,19 @@ class ResumeParser:
                 Returns a tuple of (cleaned_text, extracted_date).
                 """
                 text = normalize_doc_text(text)
-                date_regex = r'((?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|' \
-                            r'May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|' \
-                            r'Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)?\.?\s*\d{4}' \
-                            r'(?:\s*(?:–|-|to)\s*(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|' \
-                            r'Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|' \
-                            r'Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)?\.?\s*\d{4})?)'
-
-                match = re.search(date_regex, text, re.IGNORECASE)
+                match = EDUCATION_DATE_RE.search(text)
                 if match:
                     date = match.group(0).strip('–- ').strip()
                     # Replace only the matched substring
-                    text_without_date = re.sub(re.escape(match.group(0)), '', text, count=1)
-                    text_without_date = re.sub(r'[\s,–-]+$', '', text_without_date).strip()
+                    text_without_date = text.replace(match.group(0), '', 1)
+                    text_without_date = TRAILING_SEPARATORS_RE.sub('', text_without_date).strip()
                     return text_without_date, date
 
                 return text.strip(), None
 
             def extract_field_and_degree(text: str) -> Tuple[str, str]:
                 # Try to split on ' in ' first
-                parts = re.split(r'\s+in\s+', text, flags=re.I)
+                parts = IN_SEPARATOR_RE.split(text)
                 if len(parts) >= 2:
                     degree = parts[0].strip()
                     field = parts[1].strip()
@@ -1009,12 +1000,12 @@ class ResumeParser:
                 # return "\n".join(lines[start_idx + 1:end_idx]).strip() or None
                 base_text = "\n".join(lines[start_idx + 1:end_idx]).strip()
                 if not base_text:
-                    self.errors.append("Skills Section: Your skills should be listed in the Skills section of your resume. Mark them with a header like 'Skills' or 'Technical Skills'. You use simple rounded bullet point for eack skill. You can group your skills or list them as is (e.g., Python, SQL, Java; or groups like this- Programming: Python, Dart, C++).")
+                    self.errors.append(SECTION_ERRORS[('skills', 'content')])
                     self._subtract_section_scores('skills', 20)
                 return base_text
             
         # If no skills section found
-        self.errors.append("Skills Section - title: Your skills should be listed in the Skills section of your resume. Mark them with a header like 'Skills' or 'Technical Skills'. You can use simple rounded bullet point for each skill. You can group your skills or list them as is (e.g., Python, SQL, Java; or groups like this - Programming: Python, Dart, C++).")
+        self.errors.append(SECTION_ERRORS[('skills', 'title')])
         self._subtract_section_scores('skills', 20)
         return None
 
@@ -1047,7 +1038,7 @@ class ResumeParser:
                 break
 
         if start_idx is None:
-            self.errors.append("Education Section - Title: Your resume should contain a clearly marked education section. Mark this off with a clearly stated title like: Education, Academic Background, or Academic Qualifications. Should be written in all upper case letters or proper case.")
+            self.errors.append(SECTION_ERRORS[('education', 'title')])
             self._subtract_section_scores('education', 20)
             return None
 
@@ -1061,7 +1052,7 @@ class ResumeParser:
         # Return content below the header
         base_text = "\n".join(lines[start_idx + 1:end_idx]).strip()
         if not base_text:
-            self.errors.append("Education Section - content: Your education should be clearly stated in the Education section of your resume. Ensure it is well-formatted with degrees, institutions, and dates. Follow either a single line format (Degree in Field, Instition, Location, Graduation date. e.g Bachelor of Science in Computer Science, University of Lagos, Lagos State Nigeria, Jan 2020) or a multi-line format (Degree in Field and Graduation date on the first line, Institution and Location on the second line, optional third line to state your class of graduation or CGPA. e.g Bachelor of Science in Computer Science Aug 2020 (on the first line); University of Lagos, Lagos State Nigeria (on the second line); Graduated with First Class Honours (optional, on the third line)). Maintain the same order for all your education entries.")
+            self.errors.append(SECTION_ERRORS[('education', 'content')])
             self._subtract_section_scores('education', 20)
         return base_text
         
@@ -1094,7 +1085,7 @@ class ResumeParser:
                 break
 
         if start_idx is None:
-            self.errors.append("Certifications Section - title: Your certifications should be clearly stated in the Certifications section of your resume. Mark this off with a clearly stated title like: Certifications, Professional Certifications, or Professional Qualifications. Should be written in all upper case letters or proper case.")
+            self.errors.append(SECTION_ERRORS[('certifications', 'title')])
             self._subtract_section_scores('certifications', 20)
             return None
 
@@ -1108,7 +1099,7 @@ class ResumeParser:
         # Return content below the header
         base_text = "\n".join(lines[start_idx + 1:end_idx]).strip() or None
         if not base_text:
-            self.errors.append("Certifications Section - content: Your certifications should be clearly stated in the Certifications section of your resume. Mark this off with a clearly stated title like: Certifications, Professional Certifications, or Professional Qualifications. Should be written in all upper case letters or proper case.")
+            self.errors.append(SECTION_ERRORS[('certifications', 'content')])
             self._subtract_section_scores('certifications', 20)
         return base_text
 
@@ -1135,7 +1126,7 @@ class ResumeParser:
 
         base_text = "\n".join(lines[:end_idx]).strip() or None
         if not base_text:
-            self.errors.append("Contact Section - extraction: Your contact information such as your name, email, phone number should all be in the first few lines of your resume before Career Summary, Work Experience, Education, or Skills sections.")
+            self.errors.append(SECTION_ERRORS[('contact', 'content')])
             self._subtract_section_scores('contact', 20)
         return base_text
 
@@ -1168,7 +1159,7 @@ class ResumeParser:
                 break
 
         if start_idx is None:
-            self.errors.append("Career Objective/Summary Section - title: Your career objective should be clearly stated in the first few lines of your resume before Work Experience, Education, or Skills sections. Mark this off with a clearly stated title like: Career Objective, SUMMARY, or Career Profile or just Objective. Should be written in all upper case letters or proper case.")
+            self.errors.append(SECTION_ERRORS[('career_objective', 'title')])
             return None
 
         # Find the end (next known section header)
@@ -1182,7 +1173,7 @@ class ResumeParser:
         # return "\n".join(lines[start_idx + 1:end_idx]).strip() or None
         base_text = "\n".join(lines[start_idx + 1:end_idx]).strip() or None
         if not base_text:
-            self.errors.append("Career Objective/Summary Section - extraction: Your career objective should be clearly stated in the first few lines of your resume before Work Experience, Education, or Skills sections. Mark this off with a clearly stated title like: Career Objective, SUMMARY, or Career Profile or just Objective. Should be written in all upper case letters or proper case.")
+            self.errors.append(SECTION_ERRORS[('career_objective', 'content')])
             self._subtract_section_scores('career_objective', 20)
         return base_text
 
@@ -1216,7 +1207,7 @@ class ResumeParser:
                 break
 
         if start_idx is None:
-            self.errors.append("Experience Section - title: Your work experience should be clearly stated within your resume. Mark this off with a clearly stated title like: Work Experience, Professional Experience, Employment History, or Career History. Should be written in all upper case letters or proper case. If you have no work experience, you can provide your internship or volunteer experience.")
+            self.errors.append(SECTION_ERRORS[('experience', 'title')])
             self._subtract_section_scores('experience', 20)
             return None
 
@@ -1231,7 +1222,7 @@ class ResumeParser:
         # return "\n".join(lines[start_idx + 1:end_idx]).strip() or None
         base_text = "\n".join(lines[start_idx + 1:end_idx]).strip() or None
         if not base_text:
-            self.errors.append("Experience Section - content: Provide some infomation about your work history. If you have no work experience, you can provide your internship or volunteer experience. Ensure it is well-formatted with job titles, company names, locations, and dates. Follow a consistent format for all entries.")
+            self.errors.append(SECTION_ERRORS[('experience', 'content')])
             self._subtract_section_scores('experience', 20)
         return base_text
     
@@ -1243,17 +1234,8 @@ class ResumeParser:
             if not text:
                 return None
             
-            patterns = [
-                r'\b(\d{1,2})\+?\s+(?:years|yrs?)\b',
-                r'\bover\s+(\d{1,2})\s+(?:years|yrs?)\b',
-                r'\bmore than\s+(\d{1,2})\s+(?:years|yrs?)\b',
-                r'\b(?:with|have|has)\s+(\d{1,2})\s+(?:years|yrs?)\b',
-                r'\b(' + '|'.join(years_of_experience_map.keys()) + r')\s+(?:years|yrs?)\b',
-                r'\b(?:\w+\s+)?\((\d{1,2})\)\s+(?:years|yrs?)\b',
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
+            for pattern in YEARS_OF_EXPERIENCE_RES:
+                match = pattern.search(text)
                 if match:
                     value = match.group(1).lower()
                     if value.isdigit():
@@ -1269,31 +1251,9 @@ class ResumeParser:
 
             lines = [line.strip() for line in text.splitlines() if line.strip()]
 
-            # Separator: hyphen, en dash, em dash, or "to" (case-insensitive, with optional spaces)
-            sep = r'[-–—]|to'
-
-            # Month variants (short and full)
-            month = r'(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)'
-
-            # Patterns
-            date_patterns = [
-                # Month YYYY to Month YYYY
-                rf'{month}\s+\d{{4}}\s*(?:{sep})\s*{month}\s+\d{{4}}',
-                # Month YYYY to Present/Current/Ongoing
-                rf'{month}\s+\d{{4}}\s*(?:{sep})\s*(Present|Current|Ongoing)',
-                # MM/YYYY to MM/YYYY
-                rf'\d{{2}}/\d{{4}}\s*(?:{sep})\s*\d{{2}}/\d{{4}}',
-                # YYYY to YYYY
-                rf'\b\d{{4}}\s*(?:{sep})\s*\d{{4}}\b',
-                # YYYY to Present/Current/Ongoing
-                rf'\b\d{{4}}\s*(?:{sep})\s*(Present|Current|Ongoing|Till date|Till now|Till Present)\b'
-            ]
-
-            combined_pattern = re.compile(rf"({'|'.join(date_patterns)})$", re.IGNORECASE)
-
             matched_durations = []
             for line in lines:
-                match = combined_pattern.search(line)
+                match = EXPERIENCE_DURATION_RE.search(line)
                 if match:
                     matched_durations.append(match.group(1).strip())
 
@@ -1303,14 +1263,12 @@ class ResumeParser:
             if not durations:
                 return []
 
-            # Match common separators: hyphen, en dash, em dash, or "to" (with optional spaces)
-            separator_pattern = re.compile(r'\s*(?:to|[-–—])\s*', flags=re.IGNORECASE)
-
             # Flat list to collect all individual date components
             split_dates = []
             
             for duration in durations:
-                parts = separator_pattern.split(duration)
+                # Split on hyphen, en dash, em dash, or "to" (with optional spaces)
+                parts = DATE_RANGE_SEPARATOR_RE.split(duration)
                 # Keep only non-empty trimmed parts
                 for part in parts:
                     clean_part = part.strip()
@@ -1492,7 +1450,6 @@ class ResumeParser:
     def parse_skills(self):
         """Extract skills from resume text"""
         skills_text = self.sections.get('skills', '')
-        known_skills = self.known_skills['all']  # Use all known skills
         found_skills = set()
 
         if not skills_text:
@@ -1601,11 +1558,9 @@ class ResumeParser:
         # 2. Then search other parts of the resume for known skills
         resume_text = self.resume_text.lower().replace(skills_text, '')  # Exclude skills section text
 
-        for skill in known_skills:
-            # Create a regex pattern that matches the whole word
-            pattern = r'(?<!\w)' + re.escape(skill.lower()) + r'(?!\w)'
-            if re.search(pattern, resume_text, re.IGNORECASE):
-                found_skills.add(skill.title())
+        # One automaton pass finds every known skill that stands as a whole word
+        for skill in self.lexicon.matcher.find_keywords(resume_text, whole_words=True):
+            found_skills.add(skill.title())
         
         # Return sorted skills, case-insensitive
         self.parsed_data['skills'] = sorted(found_skills, key=lambda x: x.lower())
@@ -1672,8 +1627,8 @@ class ResumeParser:
         def normalize_text(text: str) -> str:
             """Normalize text for consistent parsing"""
             # Standardize dashes and spacing
-            text = re.sub(r'[\u2012\u2013\u2014\u2015–—]', ' - ', text)  # All dash types to hyphen
-            text = re.sub(r'\s+', ' ', text).strip()  # Collapse whitespace
+            text = DASH_CHARS_RE.sub(' - ', text)  # All dash types to hyphen
+            text = WHITESPACE_RE.sub(' ', text).strip()  # Collapse whitespace
             return text
         
         def extract_date(text: str, lone=False) -> Tuple[str, Optional[str]]: 
@@ -1681,15 +1636,8 @@ class ResumeParser:
             
             If lone is True, expect the text to contain only the date. Otherwise, return None as date.
             """
-            date_patterns = [
-                r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4})',  # Month Year
-                r'(\d{1,2}/\d{4})',  # MM/YYYY
-                r'(\b\d{4}\b)',  # YYYY
-                r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\s*(?:-|to)\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4})'  # Date range
-            ]
-
-            for pattern in date_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
+            for pattern in CERTIFICATION_DATE_RES:
+                match = pattern.search(text)
                 if match:
                     date = match.group(1)
 
@@ -1842,13 +1790,57 @@ class ResumeParser:
         #print(f'Parsed certifications: {certifications}')
         return certifications 
     
-    def parse_all(self):
-        """Parse all sections of the resume"""
-        self.parse_metadata()
-        self.parse_education()
-        self.parse_experience()
-        self.parse_skills()
-        self.parse_certifications()
+    def section_fingerprint(self, section: str) -> str:
+        """SHA-256 of a section's text ('resume_text' fingerprints the whole resume)."""
+        text = self.resume_text if section == 'resume_text' else self.sections.get(section, '')
+        return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def _run_parse_step(self, method: str, inputs: Tuple[str, ...], outputs: Tuple[str, ...], cache) -> None:
+        """
+        Run one parse step, or replay its recorded effects from cache when its inputs are unchanged.
+
+        A step's effects are the parsed_data keys it writes, the errors it appends and the
+        score deductions it makes; deductions are replayed through _subtract_section_scores
+        so the zero floor applies exactly as it did originally.
+        """
+        key = (method, self.lexicon.signature) + tuple(self.section_fingerprint(name) for name in inputs)
+        cached = cache.get(key)
+        if cached is not None:
+            parsed, errors, deductions = copy.deepcopy(cached)
+            self.parsed_data.update(parsed)
+            self.errors.extend(errors)
+            for section, score in deductions:
+                self._subtract_section_scores(section, score)
+            return
+
+        errors_before = len(self.errors)
+        self._score_log = []
+        try:
+            getattr(self, method)()
+            deductions = self._score_log
+        finally:
+            self._score_log = None
+        parsed = {name: self.parsed_data[name] for name in outputs}
+        cache.set(key, copy.deepcopy((parsed, self.errors[errors_before:], deductions)))
+
+    def parse_all(self, cache=None):
+        """
+        Parse all sections of the resume.
+
+        With a cache (see api.caching.LRUCache), each step is keyed by the fingerprints of
+        the sections it reads, so re-parsing the same resume replays every step and an
+        edited one re-runs only the steps whose sections changed. parse_skills reads the
+        whole text, so it re-runs on any edit.
+        """
+        if cache is None:
+            self.parse_metadata()
+            self.parse_education()
+            self.parse_experience()
+            self.parse_skills()
+            self.parse_certifications()
+        else:
+            for method, inputs, outputs in PARSE_STEPS:
+                self._run_parse_step(method, inputs, outputs, cache)
         self.parsed_data['ats_score'] = self.get_ats_score()
         self.parsed_data['errors'] = self.errors
         return self.parsed_data
@@ -1857,4 +1849,4 @@ class ResumeParser:
     @staticmethod
     def normalize_line(line: str) -> str:
         # Remove common prefixes and suffixes (like bullets, colons) and normalize casing
-        return re.sub(r"^[•\-–\*\s]*|[:\-\s]*$", "", line.strip()).lower()
\ No newline at end of file
+        return LINE_EDGES_RE.sub("", line.strip()).lower()
\ No newline at end of file
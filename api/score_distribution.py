@@ -0,0 +1,45 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+from .models import ATSScoreBucket
+
+MIN_SCORE = 0
+MAX_SCORE = 100
+
+
+def to_bucket(score) -> int:
+    """Whole score clamped to MIN_SCORE..MAX_SCORE."""
+    return min(max(int(round(float(score))), MIN_SCORE), MAX_SCORE)
+
+
+def record_score(score) -> None:
+    """
+    Add one score to the distribution.
+
+    A single UPDATE ... SET count = count + 1 on the score's bucket, so concurrent writers
+    never overwrite each other; the bucket row is created only if it is missing.
+    """
+    bucket = to_bucket(score)
+    if ATSScoreBucket.objects.filter(score=bucket).update(count=F('count') + 1):
+        return
+    try:
+        with transaction.atomic():
+            ATSScoreBucket.objects.create(score=bucket, count=1)
+    except IntegrityError:
+        # Created by a concurrent writer in the meantime
+        ATSScoreBucket.objects.filter(score=bucket).update(count=F('count') + 1)
+
+
+def percentile_rank(score):
+    """
+    Percentage (0-100) of recorded scores lower than score, or None if nothing is recorded.
+
+    One aggregate over at most MAX_SCORE - MIN_SCORE + 1 bucket rows, however many
+    scores have been recorded.
+    """
+    totals = ATSScoreBucket.objects.aggregate(
+        total=Sum('count'),
+        below=Sum('count', filter=Q(score__lt=to_bucket(score))),
+    )
+    if not totals['total']:
+        return None
+    return int((totals['below'] or 0) / totals['total'] * 100)
@@ -0,0 +1,102 @@
+from typing import Dict, List, NamedTuple, Optional
+from .resources import (career_objective_titles as cot, education_section_titles as est,
+                        experience_section_titles as exst, skills_section_titles as sst,
+                        certifications_section_titles as cst, other_boundary_section_titles as ost)
+from .patterns import LINE_EDGES_RE
+
+# Sections with a heading, in the order ResumeParser reports them. 'other' only acts as a boundary.
+SECTION_TITLES = {
+    'education': est,
+    'experience': exst,
+    'skills': sst,
+    'certifications': cst,
+    'career_objective': cot,
+    'other': ost,
+}
+
+HEADED_SECTIONS = ('education', 'experience', 'skills', 'certifications', 'career_objective')
+
+def _build_heading_index() -> Dict[str, frozenset]:
+    """Map every normalized heading to the set of sections that list it (some titles are shared)."""
+    index = {}
+    for section, titles in SECTION_TITLES.items():
+        for title in titles:
+            index.setdefault(title.lower(), set()).add(section)
+    return {title: frozenset(sections) for title, sections in index.items()}
+
+
+HEADING_INDEX = _build_heading_index()
+SKILLS_HEADINGS = frozenset(title.lower() for title in sst)
+
+
+def normalize_line(line: str) -> str:
+    """Strip bullets, trailing colons/dashes and casing from a line (same rule as ResumeParser.normalize_line)."""
+    return LINE_EDGES_RE.sub("", line.strip()).lower()
+
+
+class SectionSpan(NamedTuple):
+    header: Optional[int]  # index of the heading line, None for the contact block
+    start: int             # first content line
+    end: int               # one past the last content line
+    text: str              # content lines joined with newlines and stripped
+    inline: bool = False   # skills given on the heading line itself, e.g. "Skills: Python, SQL"
+
+
+class SegmentedResume(NamedTuple):
+    lines: List[str]
+    spans: Dict[str, Optional[SectionSpan]]
+
+
+def segment_resume(resume_text: str) -> SegmentedResume:
+    """
+    Split resume text into section spans in a single pass over its lines.
+
+    Each non-empty line is normalized once and looked up in HEADING_INDEX. A section
+    starts at the first line listed under its own titles and ends at the next line
+    listed under any other section's titles. The contact block runs from the top to
+    the first heading of any kind. Sections without a heading map to None.
+    """
+    lines = [line.strip() for line in resume_text.splitlines() if line.strip()]
+    starts = {}
+    ends = {}
+    inline_skills = None
+    contact_end = None
+
+    for i, line in enumerate(lines):
+        owners = HEADING_INDEX.get(normalize_line(line))
+
+        if owners:
+            if contact_end is None:
+                contact_end = i
+            # Close every open section this heading belongs to someone else
+            for section, start in starts.items():
+                if section not in ends and i > start and owners - {section}:
+                    ends[section] = i
+
+        # "Skills: Python, SQL" counts as the skills section when no heading came earlier
+        if 'skills' not in starts and ':' in line:
+            label = line.lower().partition(':')[0]
+            if label in SKILLS_HEADINGS:
+                starts['skills'] = ends['skills'] = i
+                inline_skills = line.split(":", 1)[1].strip()
+
+        if owners:
+            for section in owners:
+                if section not in starts and section != 'other':
+                    starts[section] = i
+
+    spans = {}
+    end = len(lines) if contact_end is None else contact_end
+    spans['contact'] = SectionSpan(None, 0, end, "\n".join(lines[:end]).strip())
+
+    for section in HEADED_SECTIONS:
+        if section not in starts:
+            spans[section] = None
+        elif section == 'skills' and inline_skills is not None:
+            spans[section] = SectionSpan(starts[section], starts[section], starts[section] + 1, inline_skills, inline=True)
+        else:
+            start = starts[section]
+            end = ends.get(section, len(lines))
+            spans[section] = SectionSpan(start, start + 1, end, "\n".join(lines[start + 1:end]).strip())
+
+    return SegmentedResume(lines, spans)
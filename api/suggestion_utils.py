@@ -1,7 +1,8 @@
 from django.db import transaction
 from .models import JobTitle, Skill, Responsibility
 # from .utils import normalize_title
-from .ai import get_structured_data_from_gemini
+from .ai import get_structured_data_from_gemini, parse_structured_response, forget_gemini_response
+from .ai_async import gather_prompts, MAX_CONCURRENCY
 from .serializers import JobTitleSerializer
 
 @transaction.atomic
@@ -818,8 +819,8 @@ def get_suggestions_for_all_job_titles():
     }
     return suggestions, skills
 
-def get_title_suggestions_from_gemini(jt: str):
-    """This function gets job title suggestions from Gemini API."""
+def title_suggestion_prompt(jt: str) -> str:
+    """Prompt asking Gemini for the field group, skills and responsibilities of a job title."""
     field_groups = [choice[0] for choice in JobTitle._meta.get_field("field_group").choices]
 
     prompt = f"""
@@ -842,11 +843,35 @@ def get_title_suggestions_from_gemini(jt: str):
                 }}
                 5. Provide at least 20 relevant skills and 20 relevant responsibilities suggsetions for a resume builder (fewer only if not possible).
             """
-    response = get_structured_data_from_gemini(prompt)
+    return prompt
+
+def get_title_suggestions_from_gemini(jt: str):
+    """This function gets job title suggestions from Gemini API."""
+    response = get_structured_data_from_gemini(title_suggestion_prompt(jt))
     if response:
         add_sample_suggestions([response])
     return get_suggestions_for_all_job_titles()
 
+def get_title_suggestions_for_titles(titles: list, max_concurrency: int = MAX_CONCURRENCY, hedge_after=None):
+    """
+    Fetch suggestions for many job titles at once, with up to max_concurrency Gemini calls
+    in flight, and save the valid ones. Returns the titles that got no usable answer.
+    """
+    prompts = [title_suggestion_prompt(jt) for jt in titles]
+    failed = []
+    for jt, prompt, text in zip(titles, prompts, gather_prompts(prompts, max_concurrency, hedge_after)):
+        try:
+            response = parse_structured_response(text)
+        except ValueError as e:
+            print(f'Error parsing Gemini response for {jt}: {e}')
+            forget_gemini_response(prompt)
+            response = None
+        if response:
+            add_sample_suggestions([response])
+        else:
+            failed.append(jt)
+    return failed
+
 def get_skill_suggestion_from_gemini(skill: str, job_title: str):
     """This function gets skill suggestions from Gemini API."""
     prompt = f"""
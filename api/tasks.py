@@ -1,8 +1,9 @@
 from celery import shared_task
 import time
 from .utils import *
+from .analysis import match_resume_with_jd
 from .file_generator import ResumeGenerator
-from .suggestion_utils import get_title_suggestions_from_gemini, get_skill_suggestion_from_gemini
+from .suggestion_utils import get_title_suggestions_from_gemini, get_skill_suggestion_from_gemini, get_title_suggestions_for_titles
 
 @shared_task
 def mock_heavy_parsing(file_data, filename):
@@ -30,27 +31,31 @@ def async_match_resume_with_jd(resume_text, job_description, user, job_title):
 
     return analysis_result
 
-@shared_task
-def async_generate_resume(resume_data: dict = {}, filename: str = '', user_id=0):
+# The resume tasks return the key to download the document with (the task id), or '' on failure
+@shared_task(bind=True)
+def async_generate_resume(self, resume_data: dict = {}, filename: str = '', user_id=0, output_format='docx'):
     """Simulate resume generation for free users"""
-    generator = ResumeGenerator(resume_data, filename, matching=False, premium=False, user_id=user_id)
+    generator = ResumeGenerator(resume_data, filename, matching=False, premium=False, user_id=user_id,
+                                document_key=self.request.id, output_format=output_format)
     file_name = generator.populate_template()
-    return file_name
+    return generator.document_key if file_name else ''
 
-@shared_task
-def async_generate_premium_resume(resume_data: dict = {}, filename: str = '', user_id=0):
+@shared_task(bind=True)
+def async_generate_premium_resume(self, resume_data: dict = {}, filename: str = '', user_id=0, output_format='docx'):
     """Simulate resume generation for premium users"""
-    generator = ResumeGenerator(resume_data, filename, matching=False, premium=True, user_id=user_id)
+    generator = ResumeGenerator(resume_data, filename, matching=False, premium=True, user_id=user_id,
+                                document_key=self.request.id, output_format=output_format)
     file_name = generator.populate_premium_template()
-    return file_name
+    return generator.document_key if file_name else ''
 
 
-@shared_task
-def async_generate_matching_resume(resume_data: dict = {}, filename: str = '', user_id=0):
+@shared_task(bind=True)
+def async_generate_matching_resume(self, resume_data: dict = {}, filename: str = '', user_id=0, output_format='docx'):
     """Simulate resume generation"""
-    generator = ResumeGenerator(resume_data, filename, matching=True, premium=True, user_id=user_id)
+    generator = ResumeGenerator(resume_data, filename, matching=True, premium=True, user_id=user_id,
+                                document_key=self.request.id, output_format=output_format)
     file_name = generator.populate_matching_template(resume_data['template_id'])
-    return file_name
+    return generator.document_key if file_name else ''
 
 @shared_task
 def async_process_new_jt_suggestion(new_title: str):
@@ -61,6 +66,11 @@ def async_process_new_jt_suggestion(new_title: str):
         'skills': skills
     }
 
+@shared_task
+def async_refresh_job_title_suggestions(titles: list):
+    """Populate many job titles in the database, with concurrent Gemini calls"""
+    return {'failed': get_title_suggestions_for_titles(titles)}
+
 @shared_task
 def async_process_new_skill_suggestion(new_skill: str, job_title: str):
     """Populate skills in the database"""
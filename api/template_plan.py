@@ -0,0 +1,115 @@
+import re
+import threading
+from typing import Dict, List, Optional, Union
+from docx.shared import Inches
+
+PLACEHOLDER_KEY_RE = re.compile(r"{{(.*?)}}")
+LIST_KEY_RE = re.compile(r"\{\{(\w+)\}\}")
+BULLET_STYLE = "List Bullet"
+
+
+def replace_placeholders(text: str, data: Union[Dict, str]) -> str:
+    """Fill {{key}} placeholders in a layout line from an item: dict values, or the item itself for {{skill}}."""
+    if isinstance(data, dict):
+        # Find all placeholders in the text
+        matches = PLACEHOLDER_KEY_RE.findall(text)
+        for key in matches:
+            value = data.get(key, "")
+            if isinstance(value, (str, int, float)):
+                text = text.replace(f"{{{{{key}}}}}", str(value))
+            else:
+                text = text.replace(f"{{{{{key}}}}}", "")
+    elif isinstance(data, str):
+        # Simple case like skill strings
+        text = text.replace("{{skill}}", data)
+    return text
+
+
+class TextTemplate:
+    """
+    A layout line split once into literal and {{key}} segments.
+
+    render() gives the same string as replace_placeholders(); the segments are joined
+    directly unless a brace in the line or in a value could make the sequential
+    replacements interact, in which case it falls back to replace_placeholders().
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        parts = PLACEHOLDER_KEY_RE.split(text)
+        self.literals = parts[0::2]
+        self.keys = parts[1::2]
+        self.plain = not any('{' in part or '}' in part for part in parts)
+
+    def render(self, data: Union[Dict, str]) -> str:
+        if isinstance(data, dict):
+            if not self.keys:
+                return self.text
+            values = []
+            for key in self.keys:
+                value = data.get(key, "")
+                values.append(str(value) if isinstance(value, (str, int, float)) else "")
+            if not self.plain or any('{' in value or '}' in value for value in values):
+                return replace_placeholders(self.text, data)
+            out = [self.literals[0]]
+            for value, literal in zip(values, self.literals[1:]):
+                out.append(value)
+                out.append(literal)
+            return ''.join(out)
+        if isinstance(data, str):
+            return self.text.replace("{{skill}}", data)
+        return self.text
+
+
+class LinePlan:
+    """One item_template entry with its style, list and formatting decisions made up front."""
+
+    def __init__(self, config: Dict):
+        bullet = bool(config.get("bullet"))
+        self.style: Optional[str] = BULLET_STYLE if bullet else None
+        self.is_list = bool(config.get("is_list"))
+        self.list_key = ""
+        if self.is_list:
+            match = LIST_KEY_RE.search(config["text"])
+            self.list_key = match.group(1) if match else ""
+        indent = config.get("indent", 0)
+        self.indent = Inches(indent) if bullet and indent > 0 else None
+        self.dated = config.get("type") == "dated_line"
+        self.content = TextTemplate(config["content"]) if self.dated else None
+        self.dates = TextTemplate(config["dates"]) if self.dated else None
+        self.text = TextTemplate(config["text"]) if "text" in config else None
+        self.bold = bool(config.get("content_bold"))
+        self.italic = bool(config.get("italic"))
+
+
+class SectionPlan:
+    def __init__(self, name: str, config: Dict):
+        self.name = name
+        self.anchor = config["template_anchor"]
+        self.lines = [LinePlan(line) for line in config["item_template"]]
+        self.separator = config.get("separator")
+
+
+class LayoutPlan:
+    """A tp_layouts entry compiled for ColumnAwareTemplatePopulator: its sections, in layout order."""
+
+    def __init__(self, layout: Dict):
+        self.sections: List[SectionPlan] = []
+        if isinstance(layout, dict):
+            for name, config in layout.items():
+                if config.get("template_anchor"):
+                    self.sections.append(SectionPlan(name, config))
+
+
+_plans = {}  # id(layout) -> (layout, LayoutPlan)
+_plans_lock = threading.Lock()
+
+
+def compile_layout(layout: Dict) -> LayoutPlan:
+    """The plan for a layout, compiled on first use; layouts are module constants, so plans live for the process."""
+    entry = _plans.get(id(layout))
+    if entry is None or entry[0] is not layout:
+        plan = LayoutPlan(layout)
+        with _plans_lock:
+            _plans[id(layout)] = entry = (layout, plan)
+    return entry[1]
@@ -0,0 +1,55 @@
+import copy
+import os
+import threading
+from docx import Document
+
+
+class TemplateRegistry:
+    """
+    Per-process store of parsed DOCX templates.
+
+    Each template is parsed once (the large style parts make that the expensive step) and
+    every open() hands out a deep copy, which callers are free to modify and save. A
+    template is re-read when its file's mtime or size changes, e.g. after a deploy.
+    """
+
+    def __init__(self):
+        self._entries = {}  # absolute path -> ((mtime_ns, size), parsed Document)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def _master(self, path: str):
+        path = os.path.abspath(path)
+        info = os.stat(path)
+        stamp = (info.st_mtime_ns, info.st_size)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == stamp:
+            self.hits += 1
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != stamp:
+                entry = (stamp, Document(path))
+                self._entries[path] = entry
+                self.loads += 1
+        return entry[1]
+
+    def open(self, path: str):
+        """A private copy of the template at path, like Document(path)."""
+        return copy.deepcopy(self._master(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.loads = 0
+
+    def stats(self) -> dict:
+        return {'templates': len(self._entries), 'hits': self.hits, 'loads': self.loads}
+
+
+TEMPLATE_REGISTRY = TemplateRegistry()
+
+
+def open_template(path: str):
+    return TEMPLATE_REGISTRY.open(path)
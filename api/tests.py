@@ -1,3 +1,1126 @@
-from django.test import TestCase
-
-# Create your tests here.
+import asyncio
+import io
+import os
+import random
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import skipUnless
+import httpx
+import requests
+import phonenumbers
+import redis
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+from docx import Document
+from docx.enum.text import WD_TAB_ALIGNMENT
+from docx.shared import Inches
+from types import SimpleNamespace
+from django.core.cache import caches
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from .resume_parser import ResumeParser, SmartPhoneExtractor
+from .caching import LRUCache
+from .keyword_coverage import keyword_coverage, KeywordCoverageIndex
+from .section_segmenter import segment_resume
+from .job_title_index import JobTitleIndex
+from .analysis import AnalysisContext, match_resume_with_jd
+from . import analysis
+from .jd_cache import get_jd_analysis, normalize_job_description, JD_CACHE_ALIAS
+from . import jd_cache
+from .ai import GEMINI_MODEL, GEMINI_FALLBACK_MODEL
+from .ai_cache import cached_completion, AI_CACHE_ALIAS
+from . import ai_cache
+from .ai_async import AsyncGeminiClient
+from .template_registry import TemplateRegistry
+from .placeholder_index import PlaceholderIndex
+from .file_generator import ResumeGenerator, ColumnAwareTemplatePopulator, insert_paragraph_after
+from .template_layouts import tp_layouts
+from .document_store import DOCUMENT_STORE_ALIAS, store_document, parse_range
+from .views import ResumeDownloadView
+from auth_user.views import ResumeGeneratorView, ResumeMatchAndGenerateView
+from .ai_limits import CircuitBreaker, gemini_metrics
+from . import ai_limits
+from .pdf_renderer import PDF_CACHE_ALIAS, ConverterPool, LibreOfficeWorker, PdfConversionError, document_digest, render_pdf
+from . import resources
+from .text_extraction import iter_pdf_text
+from .education_classifier import EDUCATION_CLASSIFIER
+from .resources import degree_keywords, institution_keywords
+from .utils import extract_text, extract_and_analyze
+from .resume_cache import RESUME_CACHE_ALIAS, resume_cache_stats
+from . import resume_cache
+from . import http_client
+from .patterns import MONTH_ABBREVIATIONS, NUMBER_WORDS, abbreviate_months, words_to_numbers
+from .models import ATSScoreBucket
+from .keyword_matcher import KeywordMatcher
+from . import lexicon
+from .lexicon import get_skill_lexicon
+from .batch import parse_many, parse_one
+from .score_distribution import percentile_rank, record_score
+
+SAMPLE_RESUMES = [
+    """JOHN ADEBAYO OKAFOR
+Lagos, Nigeria
+john.okafor@example.com | +234 803 123 4567
+
+PROFESSIONAL SUMMARY
+Backend Developer with 5+ years of experience building scalable APIs with Python and Django.
+
+WORK EXPERIENCE
+Senior Backend Developer, Paystack Ltd    Jan 2021 - Present
+Software Engineer, Andela    Mar 2018 - Dec 2020
+
+EDUCATION
+BSc in Computer Science    Sep 2013 - Jul 2017
+University of Lagos, Lagos State Nigeria
+
+SKILLS
+Programming: Python, JavaScript, SQL
+
+CERTIFICATIONS
+AWS Certified Cloud Practitioner - Amazon Web Services - Jul 2023
+""",
+    """Mary Jane Watson
+maryjane@mail.com
+Objective
+Summary of Qualifications
+Seeking a role as a Data Analyst.
+Technical Skills:
+• Excel
+Licenses and Certifications
+Education
+References
+""",
+    "Chika Obi\nProfile\nA nurse.\nSkills: Patient care, Triage\nSkills\nEducation\nNothing here",
+    "Some random text with no headings at all\nCall me on 08031234567",
+    "",
+]
+
+
+def legacy_sections(resume_text):
+    """Run the original per-section extractors and return (sections, errors, sectional_scores)."""
+    parser = ResumeParser.__new__(ResumeParser)
+    parser.resume_text = resume_text
+    parser.errors = []
+    parser.sectional_scores = {
+        'contact': 20, 'education': 20, 'experience': 20,
+        'skills': 20, 'certifications': 20, 'career_objective': 0
+    }
+    sections = {
+        'contact': parser.extract_contact_section(),
+        'education': parser.extract_education_section(),
+        'experience': parser.extract_experience_section(),
+        'skills': parser.extract_skills_section(),
+        'certifications': parser.extract_certifications_section(),
+        'career_objective': parser.extract_career_objective_section()
+    }
+    return {k: v for k, v in sections.items() if v}, parser.errors, parser.sectional_scores
+
+
+class SectionSegmenterParityTest(SimpleTestCase):
+    """The single-pass segmenter must match the six extract_*_section scans exactly."""
+
+    def assert_parity(self, resume_text):
+        parser = ResumeParser(resume_text)
+        sections, errors, scores = legacy_sections(resume_text)
+        self.assertEqual(parser.sections, sections)
+        self.assertEqual(parser.errors, errors)
+        self.assertEqual(parser.sectional_scores, scores)
+
+    def test_sample_resumes(self):
+        for resume_text in SAMPLE_RESUMES:
+            with self.subTest(resume_text=resume_text[:40]):
+                self.assert_parity(resume_text)
+
+    def test_generated_resumes(self):
+        titles = (resources.career_objective_titles + resources.education_section_titles
+                  + resources.experience_section_titles + resources.skills_section_titles
+                  + resources.certifications_section_titles + resources.other_boundary_section_titles)
+        filler = ["John Doe", "john@x.com", "Python, SQL", "BSc in CS, University of Lagos - 2019",
+                  "   ", "Worked at X 2019 - 2020", "- bullet item", "Lagos, Nigeria"]
+        rng = random.Random(7)
+
+        def decorate(title):
+            title = rng.choice([title, title.upper(), title.lower()])
+            return rng.choice(["", "• ", "- ", "* "]) + title + rng.choice(["", ":", " -", " :"])
+
+        for _ in range(500):
+            lines = []
+            for _ in range(rng.randint(0, 20)):
+                roll = rng.random()
+                if roll < 0.35:
+                    lines.append(decorate(rng.choice(titles)))
+                elif roll < 0.45:
+                    lines.append(rng.choice(resources.skills_section_titles) + rng.choice([":", ": Python, SQL", " : Go"]))
+                else:
+                    lines.append(rng.choice(filler))
+            resume_text = "\n".join(lines)
+            with self.subTest(resume_text=resume_text):
+                self.assert_parity(resume_text)
+
+    def test_spans_point_at_lines(self):
+        segmented = segment_resume(SAMPLE_RESUMES[0])
+        span = segmented.spans['education']
+        self.assertEqual(segmented.lines[span.header], 'EDUCATION')
+        self.assertEqual(segmented.lines[span.start:span.end], [
+            'BSc in Computer Science    Sep 2013 - Jul 2017',
+            'University of Lagos, Lagos State Nigeria',
+        ])
+        self.assertTrue(segmented.spans['skills'] is not None)
+
+
+class IncrementalParseTest(SimpleTestCase):
+    """parse_all(cache=...) must return what a full parse returns, re-running only changed steps."""
+
+    def test_cached_parse_matches_full_parse(self):
+        cache = LRUCache()
+        edited = SAMPLE_RESUMES[0].replace('Jul 2023', 'Aug 2024')
+        for resume_text in SAMPLE_RESUMES + [edited, SAMPLE_RESUMES[0]]:
+            with self.subTest(resume_text=resume_text[:40]):
+                self.assertEqual(ResumeParser(resume_text).parse_all(cache=cache),
+                                 ResumeParser(resume_text).parse_all())
+
+    def test_only_changed_steps_rerun(self):
+        cache = LRUCache()
+        ResumeParser(SAMPLE_RESUMES[0]).parse_all(cache=cache)
+        misses = cache.misses
+        ResumeParser(SAMPLE_RESUMES[0]).parse_all(cache=cache)  # re-analysis replays every step
+        self.assertEqual(cache.misses, misses)
+        ResumeParser(SAMPLE_RESUMES[0].replace('Jul 2023', 'Aug 2024')).parse_all(cache=cache)
+        # certifications changed, and parse_skills reads the whole resume text
+        self.assertEqual(cache.misses - misses, 2)
+
+
+class KeywordCoverageTest(SimpleTestCase):
+    """Keywords are matched against resume words, exactly or with small typos."""
+
+    def test_exact_and_fuzzy_matches(self):
+        text = "Built CI/CD pipelines on Kubernets with Node.js and C++; strong project managment."
+        coverage = keyword_coverage(text, {
+            'Tools': ['CI/CD', 'Kubernetes', 'node.js', 'C++'],
+            'Soft Skills': ['Project Management', 'Leadership'],
+            'Empty': [],
+        })
+        self.assertEqual(coverage, {'Tools': 100, 'Soft Skills': 50, 'Empty': 0})
+
+    def test_short_keywords_need_whole_words(self):
+        coverage = keyword_coverage("Worked in a rural region", {'Languages': ['R', 'C#', 'Go']})
+        self.assertEqual(coverage, {'Languages': 0})
+
+    def test_match_splits_jd_skills(self):
+        index = KeywordCoverageIndex("Skills: Python, Djano, PostgreSQL, Amazon Web Services")
+        found, missing = index.match(['Django', 'Python', 'Amazon Web Service', 'Kubernetes'])
+        self.assertEqual(found, ['Django', 'Python', 'Amazon Web Service'])
+        self.assertEqual(missing, ['Kubernetes'])
+
+
+class JobTitleIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = JobTitleIndex({
+            'technology': ['Software Engineer', 'Data Analyst'],
+            'engineering': ['Civil Engineer', 'Software Engineer'],
+        })
+
+    def test_known_and_subset_titles(self):
+        self.assertEqual(self.index.match('software-engineer'), ('Software Engineer', 'technology'))
+        self.assertEqual(self.index.match('Senior Civil Engineer'), ('Civil Engineer', 'engineering'))
+        self.assertEqual(self.index.match('Engineer'), ('Software Engineer', 'technology'))
+
+    def test_novel_titles_are_memoized(self):
+        self.assertEqual(self.index.match('Data Analist'), ('Data Analyst', 'technology'))
+        self.assertEqual(self.index.match('DATA ANALIST'), ('Data Analyst', 'technology'))
+        self.assertEqual(self.index.memo.stats()['hits'], 1)
+
+
+class AnalysisContextTest(SimpleTestCase):
+    def test_stages_share_one_parse(self):
+        with redirect_stdout(io.StringIO()):
+            context = AnalysisContext(SAMPLE_RESUMES[0], job_description=SAMPLE_RESUMES[1], job_title='Backend Developer')
+            expected = ResumeParser(SAMPLE_RESUMES[0]).parse_all()
+            self.assertEqual(context.analysis, expected)
+            self.assertIs(context.analysis, context.parser.parsed_data)
+            self.assertEqual(context.sectional_analysis['metadata'], context.metadata['score'])
+            self.assertIs(context.skills, context.skills)
+
+    def test_given_analysis_skips_the_parse(self):
+        analysis = {'metadata': {'name': 'Ada'}, 'skills': [], 'experience': [], 'education': [],
+                    'certifications': [], 'experience_duration': None, 'errors': ['x', 'x'], 'ats_score': 40}
+        context = AnalysisContext('Ada', analysis=analysis)
+        self.assertEqual(context.parsed_data['ats_score'], 40)
+        self.assertEqual(context.basic_suggestions, ['x'])
+        self.assertNotIn('parser', context.__dict__)
+
+
+class MatchResumeWithJDTest(TestCase):
+    def test_falls_back_to_the_local_job_match(self):
+        self.addCleanup(setattr, analysis, 'match_resume_to_jd_with_ai', analysis.match_resume_to_jd_with_ai)
+        analysis.match_resume_to_jd_with_ai = lambda resume_text, job_description: ''  # Gemini gave no answer
+        with redirect_stdout(io.StringIO()):
+            result = match_resume_with_jd(SAMPLE_RESUMES[0], SAMPLE_RESUMES[0], None, 'Backend Developer')
+        job_matching = result['job_matching']
+        self.assertEqual(set(job_matching), {'suitability_score', 'keyword_coverage', 'sectional_matching', 'suggestions'})
+        self.assertEqual(set(job_matching['sectional_matching']), {'skills', 'education', 'experience', 'certifications'})
+        self.assertEqual(job_matching['sectional_matching']['skills']['match_percentage'], 100)
+
+
+@override_settings(CACHES={JD_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class JobDescriptionCacheTest(SimpleTestCase):
+    def test_repeated_postings_are_parsed_once(self):
+        posting = SAMPLE_RESUMES[0]
+        with redirect_stdout(io.StringIO()):
+            first = get_jd_analysis(posting)
+            expected = ResumeParser(normalize_job_description(posting)).parse_all()
+        self.assertEqual(set(first), {'skills', 'education', 'experience_duration', 'certifications'})
+        self.assertEqual(first['skills'], expected['skills'])
+        self.assertTrue(first['skills'])
+
+        reindented = '  ' + posting.replace('\n', ' \n\n  ').replace(' ', '\t ')
+        self.addCleanup(setattr, jd_cache, '_parse', jd_cache._parse)
+        jd_cache._parse = None  # served from the cache, nothing parsed
+        self.assertEqual(get_jd_analysis(reindented), first)
+
+    def test_line_breaks_and_case_are_part_of_the_key(self):
+        posting = SAMPLE_RESUMES[0]
+        variants = [posting, posting.replace('\n', ' '), posting.upper()]
+        keys = {normalize_job_description(variant) for variant in variants}
+        self.assertEqual(len(keys), 3)
+        with redirect_stdout(io.StringIO()):
+            for variant in variants:
+                expected = ResumeParser(normalize_job_description(variant)).parse_all()
+                analysis = get_jd_analysis(variant)
+                self.assertEqual(analysis['skills'], expected['skills'])
+                self.assertEqual(analysis['certifications'], expected['certifications'])
+
+
+@override_settings(CACHES={AI_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AIResponseCacheTest(SimpleTestCase):
+    def setUp(self):
+        ai_cache._unavailable_until = 0.0
+        self.addCleanup(setattr, ai_cache, '_unavailable_until', 0.0)
+
+    def test_concurrent_identical_prompts_share_one_call(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'answer'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            cached_completion('model', 'prompt', compute, poll_interval=0.01))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['answer'] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cached_completion('model', 'prompt', compute), 'answer')
+        self.assertEqual(len(calls), 1)
+
+    def test_failed_calls_are_not_cached(self):
+        responses = iter(['', 'answer'])
+        self.assertEqual(cached_completion('model', 'other prompt', lambda: next(responses)), '')
+        self.assertEqual(cached_completion('model', 'other prompt', lambda: next(responses)), 'answer')
+
+    @override_settings(CACHES={AI_CACHE_ALIAS: {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:1/0',
+        'OPTIONS': {'socket_connect_timeout': 1, 'socket_timeout': 1},
+    }})
+    def test_unavailable_cache_is_tried_once(self):
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(cached_completion('model', 'prompt', lambda: 'answer'), 'answer')
+        self.assertIn('AI response cache unavailable', output.getvalue())
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(cached_completion('model', 'prompt', lambda: 'answer'), 'answer')
+        self.assertEqual(output.getvalue(), '')
+
+
+@override_settings(CACHES={AI_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CircuitBreakerTest(SimpleTestCase):
+    def setUp(self):
+        ai_cache._unavailable_until = 0.0
+        self.addCleanup(setattr, ai_cache, '_unavailable_until', 0.0)
+
+    def test_opens_after_threshold_and_probes_once(self):
+        breaker = CircuitBreaker(threshold=3, window=60, open_seconds=0.2)
+        for _ in range(2):
+            breaker.record_failure('model')
+        self.assertTrue(breaker.allow('model'))
+        breaker.record_failure('model')
+        self.assertFalse(breaker.allow('model'))
+
+        time.sleep(0.25)
+        self.assertTrue(breaker.allow('model'))   # the probe
+        self.assertFalse(breaker.allow('model'))  # everyone else waits for it
+        breaker.record_failure('model')
+        self.assertFalse(breaker.allow('model'))
+
+        time.sleep(0.25)
+        self.assertTrue(breaker.allow('model'))
+        breaker.record_success('model')
+        self.assertTrue(breaker.allow('model'))
+        self.assertTrue(breaker.allow('model'))
+        metrics = gemini_metrics(['model'])['model']
+        self.assertEqual(metrics['circuit_opened'], 2)
+        self.assertEqual(metrics['failures'], 4)
+
+
+@skipUnless(fakeredis, 'fakeredis[lua] is not installed')
+class TokenBucketTest(SimpleTestCase):
+    """Runs TOKEN_BUCKET_SCRIPT on fakeredis's embedded Lua interpreter."""
+
+    def setUp(self):
+        client = fakeredis.FakeRedis()
+        previous = ai_limits._client, ai_limits._script
+        ai_limits._client, ai_limits._script = client, client.register_script(ai_limits.TOKEN_BUCKET_SCRIPT)
+        self.addCleanup(setattr, ai_limits, '_script', previous[1])
+        self.addCleanup(setattr, ai_limits, '_client', previous[0])
+        self.redis = client
+        ai_limits._unavailable_until = ai_cache._unavailable_until = 0.0
+        self.addCleanup(setattr, ai_limits, '_unavailable_until', 0.0)
+        self.addCleanup(setattr, ai_cache, '_unavailable_until', 0.0)
+
+    @override_settings(CACHES={AI_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                       GEMINI_RATE_LIMITS={'model': {'rpm': 600, 'burst': 3}})
+    def test_burst_then_refill(self):
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual([ai_limits.acquire_token('model', max_wait=0) for _ in range(4)],
+                             [True, True, True, False])
+            started = time.monotonic()
+            self.assertTrue(ai_limits.acquire_token('model', max_wait=1))  # waits for the 10/s refill
+        self.assertGreater(time.monotonic() - started, 0.05)
+        self.assertLessEqual(self.redis.ttl('smartapplicant:ai:bucket:model'), 2)
+        metrics = gemini_metrics(['model'])['model']
+        self.assertEqual((metrics['acquired'], metrics['rejected']), (4, 1))
+        self.assertGreater(metrics['queue_wait_ms'], 0)
+
+    def test_unavailable_redis_is_tried_once(self):
+        calls = []
+
+        def down(**kwargs):
+            calls.append(1)
+            raise redis.ConnectionError('connection refused')
+        ai_limits._script = down
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertTrue(ai_limits.acquire_token('model', max_wait=0))
+            self.assertTrue(ai_limits.acquire_token('model', max_wait=0))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(output.getvalue().count('Rate limiter unavailable'), 1)
+
+
+class FakeGeminiClient(AsyncGeminiClient):
+    """
+    Answers '<model>:<prompt>' after a delay; 'slow' prompts are slow, 'bad' ones 404 and
+    'down' ones fail to connect on the primary model.
+    """
+    in_flight = peak = 0
+
+    async def _request(self, model, prompt):
+        FakeGeminiClient.in_flight += 1
+        FakeGeminiClient.peak = max(FakeGeminiClient.peak, FakeGeminiClient.in_flight)
+        try:
+            primary = model == self.model
+            await asyncio.sleep(0.5 if primary and prompt.startswith('slow') else 0.02)
+            request = httpx.Request('POST', 'https://gemini.test')
+            if primary and prompt.startswith('bad'):
+                return httpx.Response(404, request=request)
+            if primary and prompt.startswith('down'):
+                raise httpx.ConnectError('connection refused', request=request)
+            return httpx.Response(200, request=request,
+                                  json={'candidates': [{'content': {'parts': [{'text': f'{model}:{prompt}'}]}}]})
+        finally:
+            FakeGeminiClient.in_flight -= 1
+
+
+@override_settings(CACHES={AI_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                   GEMINI_RATE_LIMITS={model: {'rpm': 60000, 'burst': 1000}
+                                       for model in (GEMINI_MODEL, GEMINI_FALLBACK_MODEL)})
+class AsyncGeminiClientTest(SimpleTestCase):
+    def setUp(self):
+        ai_cache._unavailable_until = 0.0
+        self.addCleanup(setattr, ai_cache, '_unavailable_until', 0.0)
+
+    def gather(self, prompts, **kwargs):
+        async def run():
+            async with FakeGeminiClient(api_key='test', **kwargs) as client:
+                return await client.gather(prompts)
+        with redirect_stdout(io.StringIO()):
+            return asyncio.run(run())
+
+    def test_bounded_concurrency_and_fallback(self):
+        FakeGeminiClient.peak = 0
+        answers = self.gather([f'p{i}' for i in range(8)] + ['bad'], max_concurrency=3)
+        self.assertEqual(answers[:8], [f'{FakeGeminiClient("test").model}:p{i}' for i in range(8)])
+        self.assertEqual(answers[8], f'{FakeGeminiClient("test").fallback_model}:bad')
+        self.assertEqual(FakeGeminiClient.peak, 3)
+
+    def test_connection_error_falls_back(self):
+        client = FakeGeminiClient('test')
+        self.assertEqual(self.gather(['down']), [f'{client.fallback_model}:down'])
+        self.assertEqual(gemini_metrics([client.model])[client.model]['failures'], 1)
+
+    def test_hedged_request_takes_the_first_answer(self):
+        client = FakeGeminiClient('test')
+        self.assertEqual(self.gather(['slow'], hedge_after=0.05), [f'{client.fallback_model}:slow'])
+        self.assertEqual(self.gather(['slow']), [f'{client.model}:slow'])
+
+
+class TemplateRegistryTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'template.docx')
+        shutil.copy('templates/modern.docx', self.path)
+
+    def saved(self, doc):
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+
+    def test_copies_match_the_file_and_are_independent(self):
+        registry = TemplateRegistry()
+        first = registry.open(self.path)
+        self.assertEqual(self.saved(first), self.saved(Document(self.path)))
+        first.paragraphs[0].text = 'changed'
+        self.assertNotEqual(registry.open(self.path).paragraphs[0].text, 'changed')
+        self.assertEqual(registry.stats(), {'templates': 1, 'hits': 1, 'loads': 1})
+
+    def test_changed_file_is_reloaded(self):
+        registry = TemplateRegistry()
+        registry.open(self.path)
+        doc = Document(self.path)
+        doc.paragraphs[0].text = 'redesigned'
+        doc.save(self.path)
+        os.utime(self.path, ns=(time.time_ns() + 10**9,) * 2)
+        self.assertEqual(registry.open(self.path).paragraphs[0].text, 'redesigned')
+        self.assertEqual(registry.stats()['loads'], 2)
+
+
+class PlaceholderIndexTest(SimpleTestCase):
+    def document(self, *texts):
+        doc = Document()
+        for text in texts:
+            doc.add_paragraph(text)
+        return doc
+
+    def test_index_follows_edits(self):
+        doc = self.document('Jane {{name}}', 'Skills', '{{skills_list}}', 'no placeholders')
+        index = PlaceholderIndex(doc)
+        self.assertEqual([p.text for p in index.with_placeholders()], ['Jane {{name}}', '{{skills_list}}'])
+
+        generator = ResumeGenerator.__new__(ResumeGenerator)
+        generator._insert_bullets(doc, '{{skills_list}}', ['Python', 'Uses {{name}} too'], index=index)
+        self.assertNotIn('{{skills_list}}', index)
+        self.assertEqual([p.text for p in index.paragraphs('{{name}}')], ['Jane {{name}}', 'Uses {{name}} too'])
+
+    def test_cleanup_matches_paragraph_scan(self):
+        doc = self.document('Jane {{name}}', 'Git: {{git}}', 'PROJECTS', '-----', '{{project_section}}',
+                            'City {{city}}, {{state}}', 'Portfolio: {{portfolio}} | Lagos', 'SKILLS', '', '{{skills_section}}')
+        ResumeGenerator.__new__(ResumeGenerator)._clean_unused_placeholders(doc)
+        self.assertEqual([p.text for p in doc.paragraphs], ['Jane', 'City ,', '| Lagos'])
+
+
+class InterpretingTemplatePopulator(ColumnAwareTemplatePopulator):
+    """Reference implementation: interprets layout_config line by line instead of running its plan."""
+
+    def _process_multi_item_sections(self):
+        if isinstance(self.layout_config, dict):
+            for section, config in self.layout_config.items():
+                placeholder = config.get("template_anchor")
+                if not placeholder:
+                    continue
+
+                items = self.user_data.get(section, [])
+                if not items:
+                    continue
+
+                para = self.index.first(placeholder)
+                if para is None:
+                    continue
+
+                new_paragraphs = []
+                for item_index, item in enumerate(items if isinstance(items, list) else [items]):
+                    item_paragraphs = []
+
+                    for line_config in config["item_template"]:
+                        new_para = insert_paragraph_after(para, style="List Bullet" if line_config.get("bullet") else None)
+
+                        # Handle list of strings (is_list)
+                        if line_config.get("is_list"):
+                            key = self._extract_placeholder_key(line_config["text"])
+                            list_items = item.get(key, []) if isinstance(item, dict) else item
+                            if isinstance(list_items, list):
+                                for li in list_items:
+                                    para_style = "List Bullet" if line_config.get("bullet", False) else None
+                                    new_line = insert_paragraph_after(new_para, li, style=para_style)
+
+                                    if line_config.get("bullet"):
+                                        indent_val = line_config.get("indent", 0)
+                                        if indent_val > 0:
+                                            new_line.paragraph_format.left_indent = Inches(indent_val)
+                                            new_line.paragraph_format.first_line_indent = Inches(-0.25)
+
+                                    item_paragraphs.append(new_line)
+                                continue
+
+                        # Handle dated line
+                        if line_config.get("type") == "dated_line":
+                            content = self._replace_placeholders(line_config["content"], item)
+                            dates = self._replace_placeholders(line_config["dates"], item)
+
+                            new_para.paragraph_format.tab_stops.add_tab_stop(Inches(6), WD_TAB_ALIGNMENT.RIGHT)
+                            run = new_para.add_run(content)
+                            if line_config.get("content_bold"):
+                                run.bold = True
+                            new_para.add_run('\t')
+                            new_para.add_run(dates)
+                            item_paragraphs.append(new_para)
+                            continue
+
+                        # Handle string or templated line
+                        if "text" in line_config:
+                            line = self._replace_placeholders(line_config["text"], item)
+                            run = new_para.add_run(line)
+                            if line_config.get("content_bold"):
+                                run.bold = True
+                            if line_config.get("italic"):
+                                run.italic = True
+                            item_paragraphs.append(new_para)
+
+                    # Optional separator
+                    if item_index < len(items) - 1 and config.get("separator"):
+                        sep_para = insert_paragraph_after(item_paragraphs[-1], config["separator"])
+                        item_paragraphs.append(sep_para)
+
+                    new_paragraphs.extend(item_paragraphs)
+
+                for new_para in new_paragraphs:
+                    self.index.add(new_para)
+                # Replace original placeholder paragraph
+                self._replace_placeholder_with_paragraphs(para, new_paragraphs)
+
+
+class CompiledTemplatePlanTest(SimpleTestCase):
+    experience = {
+        'position': 'Engineer', 'company': 'Acme', 'experience_duration': '2020 - 2023',
+        'description': ['Built {{things}}', 'Shipped'], 'achievements': ['Cut costs by 20%'],
+    }
+    payloads = [
+        {
+            'name': 'Ada', 'email': 'ada@example.com', 'skills': ['Python', 'Go', {'Cloud': ['AWS', 'GCP']}],
+            'education': [{'degree': 'BSc', 'graduation_date': 2019, 'institution': 'Unilag', 'location': 'Lagos',
+                           'description': None}],
+            'experience': [experience, dict(experience, company='{{company}} & {sons}', achievements='none')],
+            'certification': [{'cert_name': 'AWS', 'cert_issuer': 'Amazon', 'issue_date': 2.5}],
+            'project': {'title': 'Monitor', 'date': '2023', 'technologies': 'python', 'description': 'one line'},
+        },
+        {
+            'name': 'Bo', 'experience': experience, 'experience_continuation': [experience, experience],
+            'certifications': [{'cert_name': 'CKA'}, {}], 'skills': 'Python',
+        },
+    ]
+
+    def parts(self, template, populator_class, payload):
+        with redirect_stdout(io.StringIO()):
+            populator = populator_class(f'templates/{template}.docx', tp_layouts[template])
+            doc = populator.populate_template(payload)
+            ResumeGenerator.__new__(ResumeGenerator)._clean_unused_placeholders(doc, populator.index)
+        return {str(part.partname): part.blob for part in doc.part.package.iter_parts()}
+
+    def test_plan_matches_interpreter_byte_for_byte(self):
+        for template in ('modern', 'modern_premium'):
+            for payload in self.payloads:
+                with self.subTest(template=template, name=payload['name']):
+                    self.assertEqual(self.parts(template, ColumnAwareTemplatePopulator, payload),
+                                     self.parts(template, InterpretingTemplatePopulator, payload))
+
+
+class OutputFormatTest(SimpleTestCase):
+    def post(self, view, data):
+        request = APIRequestFactory().post('/api/resumes/', data, format='json')
+        force_authenticate(request, user=SimpleNamespace(id=7, username='ada', is_authenticated=True))
+        return view.as_view()(request)
+
+    def test_unknown_formats_are_rejected(self):
+        for view in (ResumeGeneratorView, ResumeMatchAndGenerateView):
+            with self.subTest(view=view.__name__):
+                response = self.post(view, {'output_format': 'odt', 'resume_id': 1})
+                self.assertEqual(response.status_code, 400)
+        with self.assertRaises(ValueError):
+            ResumeGenerator({'job_description': ''}, 'cv.docx', matching=True, output_format='odt')
+
+
+@override_settings(CACHES={DOCUMENT_STORE_ALIAS: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class DocumentDownloadTest(SimpleTestCase):
+    data = bytes(range(256)) * 1000
+
+    def download(self, key, user_id=7, **headers):
+        request = APIRequestFactory().get(f'/api/download/{key}/', **headers)
+        force_authenticate(request, user=SimpleNamespace(id=user_id, is_authenticated=True))
+        return ResumeDownloadView.as_view()(request, file_name=key)
+
+    def test_parse_range(self):
+        self.assertIsNone(parse_range(None, 100))
+        self.assertIsNone(parse_range('bytes=0-1,5-9', 100))
+        self.assertIsNone(parse_range('bytes=9-5', 100))
+        self.assertEqual(parse_range('bytes=10-', 100), (10, 99))
+        self.assertEqual(parse_range('bytes=10-500', 100), (10, 99))
+        self.assertEqual(parse_range('bytes=-30', 100), (70, 99))
+        with self.assertRaises(ValueError):
+            parse_range('bytes=100-', 100)
+
+    def test_full_and_ranged_downloads(self):
+        store_document('task-1', self.data, 'ada_resume.docx', user_id=7)
+
+        response = self.download('task-1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], str(len(self.data)))
+        self.assertIn('ada_resume.docx', response['Content-Disposition'])
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+
+        response = self.download('task-1', HTTP_RANGE='bytes=100000-')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100000-{len(self.data) - 1}/{len(self.data)}')
+        self.assertEqual(b''.join(response.streaming_content), self.data[100000:])
+
+        self.assertEqual(self.download('task-1', HTTP_RANGE=f'bytes={len(self.data)}-').status_code, 416)
+        self.assertEqual(self.download('task-1', user_id=8).status_code, 404)
+        self.assertEqual(self.download('task-2').status_code, 404)
+
+    def test_documents_without_an_owner_are_not_served(self):
+        store_document('task-3', self.data, 'resume.docx', user_id=None)
+        self.assertEqual(self.download('task-3').status_code, 404)
+
+
+class FakeConverter:
+    """Stands in for a LibreOfficeWorker: records conversions and stops."""
+
+    def __init__(self, name):
+        self.name = name
+        self.jobs = 0
+        self.stops = 0
+        self.converted = []
+
+    def convert(self, docx_bytes, timeout):
+        if docx_bytes == b'broken':
+            raise PdfConversionError('cannot render')
+        self.converted.append(docx_bytes)
+        self.jobs += 1
+        return b'%PDF-' + document_digest(docx_bytes).encode()
+
+    def stop(self):
+        self.stops += 1
+        self.jobs = 0
+
+
+@override_settings(CACHES={PDF_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PdfRendererTest(SimpleTestCase):
+    def setUp(self):
+        caches[PDF_CACHE_ALIAS].clear()
+
+    @staticmethod
+    def docx(text):
+        doc = Document()
+        doc.add_paragraph(text)
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+
+    def test_digest_ignores_zip_timestamps(self):
+        first = self.docx('Ada Lovelace')
+        second = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(first)) as source, zipfile.ZipFile(second, 'w') as target:
+            for info in source.infolist():
+                target.writestr(zipfile.ZipInfo(info.filename, date_time=(2001, 1, 1, 0, 0, 0)), source.read(info))
+        second = second.getvalue()
+        self.assertNotEqual(first, second)
+        self.assertEqual(document_digest(first), document_digest(second))
+        self.assertNotEqual(document_digest(first), document_digest(self.docx('Grace Hopper')))
+
+    def test_renders_each_document_once_and_recycles_workers(self):
+        pool = ConverterPool(size=1, max_jobs=2, worker_factory=FakeConverter)
+        worker = pool._workers[0]
+        ada, grace = self.docx('Ada Lovelace'), self.docx('Grace Hopper')
+
+        self.assertEqual(render_pdf(ada, pool), render_pdf(ada, pool))
+        self.assertEqual(worker.converted, [ada])
+        render_pdf(grace, pool)
+        self.assertEqual(worker.stops, 1)  # recycled after max_jobs
+
+        with self.assertRaises(PdfConversionError):
+            render_pdf(b'broken', pool)
+        self.assertEqual(worker.stops, 2)
+        render_pdf(self.docx('Alan Turing'), pool)  # the worker is back in the pool
+
+    def test_start_failures_become_conversion_errors(self):
+        class BrokenInstall(LibreOfficeWorker):
+            def _start(self):
+                self._workdir = tempfile.mkdtemp()
+                raise RuntimeError('com.sun.star.uno.RuntimeException')
+
+        pool = ConverterPool(size=1, worker_factory=BrokenInstall)
+        with self.assertRaisesMessage(PdfConversionError, 'Could not start LibreOffice'):
+            render_pdf(self.docx('Ada Lovelace'), pool)
+        self.assertIsNone(pool._workers[0]._workdir)  # cleaned up
+
+
+def make_pdf(pages):
+    """A minimal PDF with one line of Helvetica text per page ('' for a blank page)."""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None,
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in pages:
+        stream = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET' if text else ''
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'
+    out, offsets = b'%PDF-1.4\n', []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    out += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode()
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return out
+
+
+class TextExtractionTest(SimpleTestCase):
+    pdf = make_pdf(['Ada Lovelace', '', 'Analytical Engine notes', 'Bernoulli numbers'])
+
+    def test_page_and_character_budget(self):
+        self.assertEqual(list(iter_pdf_text(self.pdf)),
+                         ['Ada Lovelace', 'Analytical Engine notes', 'Bernoulli numbers'])
+        self.assertEqual(list(iter_pdf_text(self.pdf, max_pages=3)), ['Ada Lovelace', 'Analytical Engine notes'])
+        self.assertEqual(list(iter_pdf_text(self.pdf, max_chars=22)), ['Ada Lovelace', 'Analytical'])
+        self.assertEqual(list(iter_pdf_text(self.pdf, max_chars=12)), ['Ada Lovelace'])
+        self.assertEqual(list(iter_pdf_text(self.pdf, max_chars=0)), [])
+
+    @override_settings(RESUME_MAX_PDF_PAGES=3, RESUME_MAX_TEXT_CHARS=20)
+    def test_extract_text_applies_the_settings_budget(self):
+        self.assertEqual(extract_text(self.pdf, 'cv.pdf')['text'], 'Ada Lovelace Analytic')
+        doc = Document()
+        doc.add_paragraph('x' * 100)
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        self.assertEqual(len(extract_text(buffer.getvalue(), 'cv.docx')['text']), 20)
+
+
+class EducationClassifierTest(SimpleTestCase):
+    lines = [
+        'BSc in Computer Science    Sep 2013 - Jul 2017',
+        'University of Lagos, Lagos State Nigeria',
+        'B.Sc. Computer Science, University of Ibadan, 2019',
+        'HND in Accountancy - Yaba College of Technology',
+        'Master of Science in Data Analytics',
+        'PhD Chemistry, Imperial College London',
+        'Federal Polytechnic Nekede, Owerri',
+        'Associate of Arts',
+        'bsc computer science',
+        'Basketball team captain',
+        'Obafemi Awolowo University 2010 - 2014',
+        '',
+    ]
+
+    @staticmethod
+    def inline(line):
+        """The original inline parse_education checks."""
+        degree, field = None, None
+        for keyword in sorted(degree_keywords, key=len, reverse=True):
+            match = re.search(rf'({keyword})\s*(in)?\s*([\w &/-]+)', line)
+            if match:
+                degree, field = match.group(1), match.group(3).strip()
+                break
+        return (bool(re.search(r'\b(?:' + '|'.join(degree_keywords) + r')\b', line, re.I)),
+                bool(re.search(r'\b(?:' + '|'.join(institution_keywords) + r')\b', line, re.I)),
+                any(keyword.lower() in line.lower() for keyword in institution_keywords),
+                (degree, field))
+
+    def test_matches_the_inline_checks(self):
+        lines = self.lines + list(degree_keywords) + [f'{keyword} in Law' for keyword in degree_keywords]
+        for line in lines:
+            with self.subTest(line=line):
+                self.assertEqual((EDUCATION_CLASSIFIER.is_degree(line), EDUCATION_CLASSIFIER.is_institution(line),
+                                  EDUCATION_CLASSIFIER.has_institution(line),
+                                  EDUCATION_CLASSIFIER.extract_degree_and_field(line)),
+                                 self.inline(line))
+
+    def test_degree_and_field(self):
+        self.assertEqual(EDUCATION_CLASSIFIER.extract_degree_and_field('Master of Science in Data Analytics'),
+                         ('Master of Science', 'Data Analytics'))
+        self.assertEqual(EDUCATION_CLASSIFIER.extract_degree_and_field('Basketball team captain'), (None, None))
+
+
+@override_settings(CACHES={RESUME_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ResumeCacheTest(SimpleTestCase):
+    upload = make_pdf(['Ada Lovelace', 'SKILLS', 'Python, Django'])
+
+    def setUp(self):
+        caches[RESUME_CACHE_ALIAS].clear()
+        resume_cache._unavailable_until = 0.0
+        self.addCleanup(setattr, resume_cache, '_unavailable_until', 0.0)
+
+    def analyze(self):
+        with redirect_stdout(io.StringIO()) as output:
+            result = extract_and_analyze(self.upload, 'cv.pdf')
+        self.assertEqual(result['status'], 1)
+        return result, output.getvalue()
+
+    def test_miss_then_hit(self):
+        first, _ = self.analyze()
+        second, _ = self.analyze()
+        self.assertEqual((second['text'], second['analysis']), (first['text'], first['analysis']))
+        self.assertEqual(resume_cache_stats(), {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+    def test_lexicon_change_is_a_miss(self):
+        self.analyze()
+        self.addCleanup(setattr, lexicon, '_files_signature', lexicon._files_signature)
+        lexicon._files_signature = lambda: (('edited', 1),)
+        self.analyze()
+        self.assertEqual(resume_cache_stats()['misses'], 2)  # parsed again against the new lexicon
+
+    @override_settings(CACHES={RESUME_CACHE_ALIAS: {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:1/0',
+        'OPTIONS': {'socket_connect_timeout': 1, 'socket_timeout': 1},
+    }})
+    def test_unavailable_cache_is_tried_once(self):
+        first, output = self.analyze()
+        self.assertIn('Resume cache unavailable', output)
+        second, output = self.analyze()
+        self.assertNotIn('Resume cache unavailable', output)
+        self.assertEqual(second['analysis'], first['analysis'])
+
+
+class ScoreDistributionTest(TestCase):
+    def test_record_score_increments_buckets(self):
+        for score in (72.4, 72, 71.6, 130, -5):
+            record_score(score)
+        counts = dict(ATSScoreBucket.objects.values_list('score', 'count'))
+        self.assertEqual(counts[72], 3)
+        self.assertEqual((counts[100], counts[0]), (1, 1))
+
+    def test_percentile_rank(self):
+        self.assertIsNone(percentile_rank(50))
+        for score in (10, 20, 20, 90):
+            record_score(score)
+        self.assertEqual(percentile_rank(0), 0)
+        self.assertEqual(percentile_rank(10), 0)
+        self.assertEqual(percentile_rank(20), 25)
+        self.assertEqual(percentile_rank(21), 75)
+        self.assertEqual(percentile_rank(100), 100)
+
+
+class ATSScoreBucketMigrationTest(TransactionTestCase):
+    before = [('api', '0004_alter_jobtitle_field_group')]
+    after = [('api', '0005_atsscorebucket')]
+
+    def test_buckets_are_seeded_from_general_data(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        GeneralData = executor.loader.project_state(self.before).apps.get_model('api', 'GeneralData')
+        GeneralData.objects.create(id=1, ats_score=[40, 40.4, 99.6, 150, -3, 'n/a', None],
+                                   registered_users=0, premium_users=0, currently_online=0)
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        ATSScoreBucket = executor.loader.project_state(self.after).apps.get_model('api', 'ATSScoreBucket')
+        counts = dict(ATSScoreBucket.objects.values_list('score', 'count'))
+        self.assertEqual(len(counts), 101)
+        self.assertEqual((counts[40], counts[100], counts[0], counts[50]), (2, 2, 1, 0))
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+
+class KeywordMatcherTest(SimpleTestCase):
+    def test_overlapping_keywords(self):
+        matcher = KeywordMatcher(['java', 'javascript', 'script', 'ava'])
+        self.assertEqual(sorted(matcher.find_all('javascript')),
+                         [(0, 4, 'java'), (0, 10, 'javascript'), (1, 4, 'ava'), (4, 10, 'script')])
+        self.assertEqual(matcher.find_keywords('javascript', whole_words=True), {'javascript'})
+
+    def test_whole_words(self):
+        matcher = KeywordMatcher(['c', 'c++', 'go', 'node.js'])
+        self.assertEqual(matcher.find_keywords('c++, go and node.js', whole_words=True), {'c', 'c++', 'go', 'node.js'})
+        self.assertEqual(matcher.find_keywords('cargo good_job nodejs', whole_words=True), set())
+        self.assertEqual(matcher.find_keywords('cargo'), {'c', 'go'})
+
+    def test_case_folding(self):
+        matcher = KeywordMatcher(['PostgreSQL', 'AWS', 'aws'], ignore_case=True)
+        self.assertEqual(len(matcher), 2)
+        self.assertEqual(matcher.find_keywords('postgresql on Aws'), {'PostgreSQL', 'AWS'})
+        self.assertTrue(matcher.contains_any('POSTGRESQL'))
+        self.assertFalse(KeywordMatcher(['AWS']).contains_any('aws'))
+        self.assertFalse(matcher.contains_any('mysql'))
+
+    def test_matches_the_per_skill_regex(self):
+        lexicon = get_skill_lexicon()
+        for text in SAMPLE_RESUMES + ['Tools: C++, C#, .NET, Node.js, REST APIs, scikit-learn; CI/CD']:
+            with self.subTest(text=text[:30]):
+                expected = {skill for skill, skill_lower in zip(lexicon.all, lexicon.all_lower)
+                            if re.search(r'(?<!\w)' + re.escape(skill_lower) + r'(?!\w)', text, re.IGNORECASE)}
+                found = lexicon.matcher.find_keywords(text, whole_words=True)
+                self.assertEqual({skill.lower() for skill in found}, {skill.lower() for skill in expected})
+
+
+class BatchParseTest(SimpleTestCase):
+    texts = SAMPLE_RESUMES * 3
+
+    def test_results_keep_input_order(self):
+        with redirect_stdout(io.StringIO()) as output:
+            expected = [parse_one(text) for text in self.texts]
+        self.assertEqual(output.getvalue(), '')  # nothing but the results goes to stdout
+        self.assertEqual(list(parse_many(self.texts, workers=2, max_pending=3)), expected)
+        self.assertEqual(list(parse_many(self.texts, workers=1)), expected)
+
+    def test_input_is_consumed_within_the_pending_window(self):
+        consumed = []
+
+        def texts():
+            for text in self.texts:
+                consumed.append(text)
+                yield text
+
+        for produced, _ in enumerate(parse_many(texts(), workers=2, max_pending=3), 1):
+            self.assertLessEqual(len(consumed) - produced, 2)
+        self.assertEqual(produced, len(self.texts))
+
+
+class PhoneExtractorTest(SimpleTestCase):
+    texts = [
+        'Call +234 803 123 4567 or 0803 123 4567',
+        'UK: +44 7911 123456 | US: (202) 555-0143',
+        'Ref 123456789012 and +1 202 555 0143',
+        'no numbers here',
+    ]
+
+    @staticmethod
+    def region_loop(raw, regions):
+        """The original resolution: every supported region in turn, Nigeria first."""
+        for region in ('NG',) + tuple(regions):
+            try:
+                number = phonenumbers.parse(raw, region)
+            except phonenumbers.NumberParseException:
+                continue
+            if phonenumbers.is_valid_number(number):
+                return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+        return raw
+
+    def test_resolve_matches_the_region_loop(self):
+        extractor = SmartPhoneExtractor()
+        for raw in ('+2348031234567', '08031234567', '+447911123456', '2025550143', '+12025550143',
+                    '123456789012', '+0123456789'):
+            with self.subTest(raw=raw):
+                self.assertEqual(extractor.resolve(raw), self.region_loop(raw, extractor.supported_regions))
+
+    def test_country_code_fixes_the_region(self):
+        self.assertEqual(SmartPhoneExtractor(['US']).resolve('+447911123456'), '+447911123456')
+
+    def test_resolutions_are_memoized(self):
+        extractor = SmartPhoneExtractor()
+        key = ('08031234568', extractor.supported_regions)
+        self.assertIsNone(SmartPhoneExtractor._resolved.get(key))
+        number = extractor.resolve('08031234568')
+        self.assertEqual(SmartPhoneExtractor._resolved.get(key), number)
+        self.assertEqual(SmartPhoneExtractor().resolve('08031234568'), number)
+
+    def test_bulk_matches_single(self):
+        extractor = SmartPhoneExtractor()
+        self.assertEqual([sorted(numbers) for numbers in extractor.extract_phone_numbers_bulk(self.texts)],
+                         [sorted(extractor.extract_phone_numbers(text)) for text in self.texts])
+        self.assertEqual(extractor.extract_phone_numbers_bulk([]), [])
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Counts requests per method; /busy answers 503 and /drop closes the connection without answering."""
+    counts = {}
+
+    def handle_any(self):
+        FlakyHandler.counts[self.command] = FlakyHandler.counts.get(self.command, 0) + 1
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.path == '/drop':
+            self.close_connection = True
+            return
+        self.send_response(503 if self.path == '/busy' else 200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = do_POST = handle_any
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpClientTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        FlakyHandler.counts = {}
+
+    def test_session_is_rebuilt_after_fork(self):
+        session = http_client.get_session()
+        self.assertIs(http_client.get_session(), session)
+        http_client._session_pid = -1  # as seen from a forked child
+        self.assertIsNot(http_client.get_session(), session)
+        self.assertEqual(http_client._session_pid, os.getpid())
+
+    def test_status_errors_retry_get_only(self):
+        self.assertEqual(http_client.get(f'{self.url}/busy').status_code, 503)
+        self.assertEqual(http_client.post(f'{self.url}/busy', json={}).status_code, 503)
+        self.assertEqual(FlakyHandler.counts, {'GET': 3, 'POST': 1})
+
+    def test_read_errors_retry_get_only(self):
+        with self.assertRaises(requests.ConnectionError), self.assertLogs('urllib3', 'WARNING') as logs:
+            http_client.get(f'{self.url}/drop')
+        self.assertEqual(len(logs.records), 2)
+        with self.assertRaises(requests.ConnectionError):
+            http_client.post(f'{self.url}/drop', json={})
+        self.assertEqual(FlakyHandler.counts, {'GET': 3, 'POST': 1})
+
+
+class PatternRegistryTest(SimpleTestCase):
+    texts = SAMPLE_RESUMES + [
+        'Over FIVE years, Twenty-one projects; someone tenth often one1 nine_',
+        'January 2020 - Sept 2021, september, AUGUST, Marching, June-July, sept.',
+    ]
+
+    def test_single_pass_matches_the_replace_loops(self):
+        for text in self.texts:
+            with self.subTest(text=text[:30]):
+                expected = text
+                for word, num in NUMBER_WORDS.items():
+                    expected = re.sub(rf"\b{word}\b", str(num), expected, flags=re.IGNORECASE)
+                self.assertEqual(words_to_numbers(text), expected)
+
+                expected = text
+                for full, abbr in MONTH_ABBREVIATIONS.items():
+                    expected = re.sub(rf'\b{full}\b', abbr, expected, flags=re.IGNORECASE)
+                self.assertEqual(abbreviate_months(text), expected)
+
+    def test_examples(self):
+        self.assertEqual(words_to_numbers('Over FIVE years, someone'), 'Over 5 years, someone')
+        self.assertEqual(abbreviate_months('January 2020 - Sept 2021'), 'Jan 2020 - Sep 2021')
@@ -0,0 +1,30 @@
+import io
+from typing import Iterator
+import PyPDF2
+
+# Defaults for a single upload; callers can pass their own limits.
+MAX_PDF_PAGES = 10
+MAX_TEXT_CHARS = 60000
+
+
+def iter_pdf_text(file_bytes: bytes, max_pages: int = MAX_PDF_PAGES,
+                  max_chars: int = MAX_TEXT_CHARS) -> Iterator[str]:
+    """
+    Yield the text of each non-empty PDF page, in order, within a page and character budget.
+
+    Only the first max_pages pages are read, and extract_text() runs once per page. Once
+    max_chars characters have been yielded the last page is cut short and the remaining
+    pages are never extracted.
+    """
+    reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
+    remaining = max_chars
+    for page in reader.pages[:max_pages]:
+        text = page.extract_text() or ''
+        if not text:
+            continue
+        if len(text) >= remaining:
+            if remaining > 0:
+                yield text[:remaining]
+            return
+        remaining -= len(text)
+        yield text
@@ -1,12 +1,24 @@
 import docx2txt
-import PyPDF2
 import io
 import re, unicodedata
 from .resume_parser import ResumeParser
+from .caching import LRUCache
+from .keyword_coverage import keyword_coverage, get_keyword_index
+from .job_title_index import JOB_TITLE_INDEX
+from .score_distribution import percentile_rank, record_score
+from .resume_cache import get_cached_resume, cache_resume
+from .text_extraction import iter_pdf_text, MAX_PDF_PAGES, MAX_TEXT_CHARS
+from .patterns import NON_ALNUM_RE, WHITESPACE_RE, YEARS_RE, words_to_numbers
 from .resources import job_fields, technical_keywords, higher_degree_keywords, lower_degree_keywords
 from fuzzywuzzy import process, fuzz
-from api.models import GeneralData
-from .ai import get_improvement_suggestions, match_resume_to_jd_with_ai
+from django.conf import settings
+
+
+# Per-step parse results keyed by section fingerprints, shared by the upload and analysis
+# paths: re-analyzing a resume (e.g. against another job title) replays every step, and an
+# edited resume re-runs only the steps whose sections changed, plus parse_skills, which
+# reads the whole text (see ResumeParser.parse_all).
+PARSE_STEP_CACHE = LRUCache(maxsize=4096)
 
 
 def get_similarity_score(text1, text2):
@@ -15,68 +27,59 @@ def get_similarity_score(text1, text2):
 
 def compare_ats_score(resume_score):
     """This function compares the ATS score of the resume with that of other user's resumes."""
-    # update general stat data
-    gen_obj, created = GeneralData.objects.get_or_create(
-        id = 1,
-        defaults= {
-            "ats_score": [resume_score],
-            "premium_users": 0,
-            "registered_users": 1,
-            "currently_online": 0
-        }
-    )
-    score = 100
-    ats_scores = set()
-    if not created:
-        # check if ats score is empty
-        if gen_obj.ats_score:
-            ats_scores = set(gen_obj.ats_score.copy())
-            lower_scores = [x for x in ats_scores if x < resume_score]
-            if not lower_scores:
-                score = 0
-            else:
-                score = int(len(lower_scores)/len(ats_scores)*100)
-    ats_scores.add(resume_score)
-    gen_obj.ats_score = list(ats_scores)
-    gen_obj.save()
+    # rank against the scores recorded so far, then record this one (see api/score_distribution.py)
+    score = percentile_rank(resume_score)
+    if score is None:
+        score = 100  # first recorded score
+    record_score(resume_score)
     return score
 
 def normalize_title(title: str) -> str:
     """Normalize job title for consistent matching."""
     t = title.strip().lower() # Lowercase and trim whitespace
     t = unicodedata.normalize("NFKD", t) # Normalize unicode characters
-    t = re.sub(r"[^a-z0-9\s]+", " ", t) # Remove special characters
-    t = re.sub(r"\s+", " ", t) # Collapse multiple spaces
+    t = NON_ALNUM_RE.sub(" ", t) # Remove special characters
+    t = WHITESPACE_RE.sub(" ", t) # Collapse multiple spaces
     return t
 
 def convert_words_to_numbers(text):
-    number_words = {
-        "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
-        "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
-        "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
-        "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
-        "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40,
-    }
-    for word, num in number_words.items():
-        text = re.sub(rf"\b{word}\b", str(num), text, flags=re.IGNORECASE)
-    return text
+    return words_to_numbers(text)
 
 def extract_text(file_bytes, filename):
-    """Extract text from PDF/DOCX in memory"""
+    """Extract text from PDF/DOCX in memory, within the page and character budget from settings"""
+    max_pages = getattr(settings, 'RESUME_MAX_PDF_PAGES', MAX_PDF_PAGES)
+    max_chars = getattr(settings, 'RESUME_MAX_TEXT_CHARS', MAX_TEXT_CHARS)
     try:
         if filename.endswith('.pdf'):
-            with io.BytesIO(file_bytes) as pdf_buffer:
-                reader = PyPDF2.PdfReader(pdf_buffer)
-                text = " ".join([page.extract_text() for page in reader.pages if page.extract_text()])
+            text = " ".join(iter_pdf_text(file_bytes, max_pages=max_pages, max_chars=max_chars))
         elif filename.endswith('.docx'):
             with io.BytesIO(file_bytes) as docx_buffer:
-                text = docx2txt.process(docx_buffer)
+                text = docx2txt.process(docx_buffer)[:max_chars]
         else:
             raise Exception("Unsupported file type (only PDF/DOCX)")
         return {'status': 1, 'text': text, 'message': 'success'}
     except Exception as e:
         return {'status': 0, 'message': str(e)}
 
+def extract_and_analyze(file_bytes, filename):
+    """
+    Extract text from an upload and run the resume parser on it.
+
+    Results are cached by the SHA-256 of the file (see api.resume_cache), so a re-uploaded
+    file skips both the PDF/DOCX extraction and the parse. On success the returned dict
+    also carries 'analysis', the parse_all() result, for parse_resume().
+    """
+    cached = get_cached_resume(file_bytes, filename)
+    if cached:
+        return {'status': 1, 'text': cached['text'], 'analysis': cached['analysis'], 'message': 'success'}
+
+    result = extract_text(file_bytes, filename)
+    if result['status'] == 0:
+        return result
+    result['analysis'] = ResumeParser(result['text']).parse_all(cache=PARSE_STEP_CACHE)
+    cache_resume(file_bytes, filename, result['text'], result['analysis'])
+    return result
+
 def calculate_ats_score(data):
     """Calculate ATS score based on number of required sections that has values in data"""
     required_sections = ['experience', 'education', 'skills', 'certifications', 'name', 'email', 'phone']
@@ -262,7 +265,7 @@ def parse_resume(resume_text:str, resume_analysis_results:dict=None):
 
     if not resume_analysis_results:
         rar = ResumeParser(resume_text)
-        resume_analysis_results = rar.parse_all()
+        resume_analysis_results = rar.parse_all(cache=PARSE_STEP_CACHE)
 
     return {
         "name": resume_analysis_results['metadata'].get('name', ''),
@@ -374,11 +377,7 @@ def analyze_skills(jd_analysis_data:list, resume_text:str):
 
 
     if len(jd_analysis_data) > 0:
-        for skill in jd_skills:
-            if process.extractOne(skill, resume_text, score_cutoff=85):
-                result_data.append(skill)
-            else:
-                missing_data.append(skill)
+        result_data, missing_data = get_keyword_index(resume_text).match(jd_skills, score_cutoff=85)
         
         # compute the score
         result_data_count = len(result_data)
@@ -396,8 +395,8 @@ def analyze_skills(jd_analysis_data:list, resume_text:str):
 def analyze_experience(resume_analysis_data, jd_analysis_data):
     """Checks relevant experience from the analysis results."""
     #print(f"JD Experience data: {jd_analysis_data}, Resume Experience data: {resume_analysis_data}")
-    jd_experience = re.search(r"(\d+)\+?\s*(years|yrs)", str(jd_analysis_data))
-    resume_experience = re.search(r"(\d+)\+?\s*(years|yrs)", str(resume_analysis_data))
+    jd_experience = YEARS_RE.search(str(jd_analysis_data))
+    resume_experience = YEARS_RE.search(str(resume_analysis_data))
     #print(f"JD Experience: {jd_experience}, Resume Experience: {resume_experience}")
 
     if not jd_experience:
@@ -555,28 +554,16 @@ def resume_sectional_analysis(parsed_data, known_skills=[]):
     
 def match_job_field(input_title, field_keywords):
     """Find the best-matching field for any job title"""
-    # Flatten all job titles across fields
-    all_titles = []
-    for field, titles in job_fields.items():
-        all_titles.extend([(title, field) for title in titles])
-    
-    # Extract just the titles for matching
-    title_strings = [title for title, _ in all_titles]
-    
-    # Get best match (returns tuple: (matched_title, score, index))
-    best_match = process.extractOne(input_title, title_strings, scorer=fuzz.token_set_ratio)
-    
-    if best_match:
-        matched_title = best_match[0]
-        # Retrieve the field for the matched title
-        for title, field in all_titles:
-            if title == matched_title:
-                return {
-                    "input_title": input_title,
-                    "matched_job_title": matched_title,
-                    "field": field,
-                    "expected_keywords": field_keywords[field]
-                }
+    # Known titles and repeated inputs are answered from the index; see JobTitleIndex
+    matched_title, field = JOB_TITLE_INDEX.match(input_title)
+
+    if matched_title:
+        return {
+            "input_title": input_title,
+            "matched_job_title": matched_title,
+            "field": field,
+            "expected_keywords": field_keywords[field]
+        }
     
     # Fallback for unknown titles
     return {
@@ -587,127 +574,5 @@ def match_job_field(input_title, field_keywords):
     }
 
 def calculate_keyword_coverage(resume_text, expected_keywords):
-    """Test resume against field-specific keywords"""
-    coverage = {}
-    resume_text_lower = resume_text.lower()
-    
-    for category, keywords in expected_keywords.items():
-        found = 0
-        for keyword in keywords:
-            # if keyword.lower() in resume_text_lower:
-            if process.extractOne(keyword.lower(), resume_text_lower, score_cutoff=85):
-                found += 1
-        coverage[category] = round((found / len(keywords)) * 100) if keywords else 0
-    
-    return coverage
-
-def analyze_resume_with_jd(resume_text, job_description, user, job_title=''):
-    """Analyze resume against a job description."""
-    try:
-        #print(f'Analyzing resume: {resume_text}')
-        rar = ResumeParser(resume_text)
-        resume_analysis_results = rar.parse_all()
-        jd_ar = ResumeParser(job_description)
-        jd_analysis_results = jd_ar.parse_all()
-
-        field_matcher = match_job_field(job_title, technical_keywords)
-        kw_data = calculate_keyword_coverage(resume_text, field_matcher['expected_keywords'])
-
-        # Parse resume text
-        resume_data = parse_resume(resume_text, resume_analysis_results)
-        
-        sectional_analysis_data = resume_sectional_analysis(resume_analysis_results, rar.known_skills['all'])
-
-        basic_suggestions = list(set(resume_analysis_results.get('errors', []))) # get_basic_improvement_suggestion(sectional_analysis_data)
-
-        analyzed_data = {
-            'metadata': analyze_metadata(resume_analysis_results['metadata']),
-            'education': analyze_education(resume_analysis_results['education'], jd_analysis_results['education']),
-            'skills': analyze_skills(jd_analysis_results['skills'], resume_text),
-            'experience': analyze_experience(resume_analysis_results['experience_duration'], jd_analysis_results['experience_duration']),
-            'certifications': analyze_certificates(resume_analysis_results['certifications'], jd_analysis_results['certifications'])
-        }
-        
-        keyword_coverage = {
-                    "Experience Level": analyzed_data['experience'].get('score',0),
-                    "Education Requirements": analyzed_data['education'].get('score',0)
-                }
-        # kw_data.update(keyword_coverage)
-        ats_score = resume_analysis_results.get('ats_score', 0) # calculate_ats_score(resume_data)
-        suggestions = get_improvement_suggestions(resume_text, user.id, job_description)
-        if suggestions == '':
-            suggestions = []
-        else:
-            suggestions = [part.strip() for part in suggestions.split(';') if part.strip()]
-            #print(suggestions)
-        analysis_results = {
-            "basic_analysis": {
-                "ats_score": ats_score,
-                "score_comparison": compare_ats_score(ats_score),
-                "sectional_analysis": sectional_analysis_data,
-                "suggestions": basic_suggestions
-            },
-            "job_matching": {
-                "suitability_score": calculate_suitability_score(kw_data | {'ats_score': ats_score}),
-                "keyword_coverage": kw_data,
-                "sectional_matching": {
-                    "skills": {
-                        "match_percentage": analyzed_data['skills'].get('score',0),
-                        "matched": analyzed_data['skills'].get('matched',[]),
-                        "missing": analyzed_data['skills'].get('missing',[])
-                    },
-                    "education": {
-                        "match_percentage": analyzed_data['education'].get('score',0),
-                        "matched": analyzed_data['education'].get('matched',[]),
-                        "missing": analyzed_data['education'].get('missing',[])
-                    },
-                    "experience": {
-                        "match_percentage": analyzed_data['experience'].get('score',0),
-                        "matched": analyzed_data['experience'].get('matched',[]),
-                        "missing": analyzed_data['experience'].get('missing',[])
-                    },
-                    "certifications": {
-                        "match_percentage": analyzed_data['certifications'].get('score',0),
-                        "matched": analyzed_data['certifications'].get('matched',[]),
-                        "missing": analyzed_data['certifications'].get('missing',[])
-                    }
-                },
-            
-                "suggestions": suggestions
-            }
-        }
-        return analysis_results
-    except Exception as e:
-        print(e)
-        raise Exception(str(e))
-
-def match_resume_with_jd(resume_text, job_description, user, job_title=''):
-    """Analyze resume against a job description."""
-
-    # Parse resume text with manual ATS-like detection 
-    rar = ResumeParser(resume_text)
-    resume_analysis_results = rar.parse_all()
-
-    # Analyze different sections of the resume
-    sectional_analysis_data = resume_sectional_analysis(resume_analysis_results, rar.known_skills['all'])
-
-    # Get suggestions based on sectional analysis results
-    # basic_suggestions = get_basic_improvement_suggestion(sectional_analysis_data)
-    basic_suggestions = list(set(resume_analysis_results.get('errors', [])))
-
-    # 
-    # resume_data = parse_resume(resume_text, resume_analysis_results)
-    ats_score = resume_analysis_results.get('ats_score', 0) # calculate_ats_score(resume_data)
-    
-    # Use AI to analyze the resume against the job description
-    response = match_resume_to_jd_with_ai(resume_text, job_description)
-    job_matching = response
-    
-    return {
-            "basic_analysis": {
-                "ats_score": ats_score,
-                "score_comparison": compare_ats_score(ats_score),
-                "sectional_analysis": sectional_analysis_data,
-                "suggestions": basic_suggestions
-            },
-            "job_matching": job_matching        }
\ No newline at end of file
+    """Test resume against field-specific keywords (exact or >= 85 fuzzy match on resume word n-grams)"""
+    return keyword_coverage(resume_text, expected_keywords, score_cutoff=85)
@@ -7,12 +7,16 @@ from .serializers import JobTitleSerializer
 from celery.result import AsyncResult
 from auth_user.serializers import UserSerializer
 # from auth_user.models import PGRequest, Order, Subscription, SubscriptionType
-from .utils import extract_text, calculate_ats_score, parse_resume
+from .utils import extract_and_analyze
+from .analysis import AnalysisContext
 from .suggestion_utils import get_suggestions_for_all_job_titles
 from .tasks import (async_extract_and_score, async_process_new_jt_suggestion, async_process_new_skill_suggestion)
 from .analytics import RevenueAnalytics
-import os
-from django.http import FileResponse, Http404
+from .document_store import get_document, parse_range
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
 
 class ResumeParseView(APIView):
@@ -39,17 +43,14 @@ class ResumeParseView(APIView):
                     'required_sections': None
                 }
             else:
-                result = extract_text(file_bytes, file.name)
+                result = extract_and_analyze(file_bytes, file.name)
                 if result['status'] == 0:
                     raise Exception(result['message'])
                 
                 text = result['text']
 
                 # parse resume text to get data 
-                parsed_data = parse_resume(text)
-
-                # Calculate ATS optimization score with the parsed data
-                ats_score = calculate_ats_score(parsed_data)
+                parsed_data = AnalysisContext(text, analysis=result['analysis']).parsed_data
                 res_status = 1
                 # print(f'parsed_data: {parsed_data}')
                 data = {
@@ -116,38 +117,44 @@ class StatsAPIView(APIView):
             )
         
 class ResumeDownloadView(APIView):
+    """
+    Stream a generated document from the document store. file_name is the key the
+    generation task returned; documents expire after DOCUMENT_TTL instead of being
+    deleted on first download, so interrupted downloads can resume with a Range request.
+    """
     permission_classes = [IsAuthenticated]
     def get(self, request, file_name):
         # authorize user
-        file_path = os.path.join('generated_docs', file_name)
         user = request.user
         if not user.is_authenticated:
             return Response({'status': 0, 'message': 'Unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
-        
-        if not os.path.exists(file_path):
+
+        document = get_document(file_name)
+        # Only the user who generated a document may download it; owner-less ones are never served
+        if document is None or document.get('user_id') is None or document['user_id'] != user.id:
             raise Http404("File not found.")
 
-        # Serve file as a response
-        response = FileResponse(
-            open(file_path, 'rb'),
-            content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            filename=os.path.basename(file_path),
-            as_attachment=True
+        data = memoryview(document['data'])
+        size = len(data)
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+        except ValueError:
+            response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        start, end = byte_range or (0, size - 1)
+        body = data[start:end + 1]
+        response = StreamingHttpResponse(
+            (bytes(body[i:i + DOWNLOAD_CHUNK_SIZE]) for i in range(0, len(body), DOWNLOAD_CHUNK_SIZE)),
+            content_type=document['content_type'],
+            status=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
         )
-
-        # After file is served, delete it (after response is closed)
-        def delete_file(response):
-            try:
-                os.remove(file_path)
-                # print(f"Deleted file: {file_path}")
-            except Exception as e:
-                print(f"Failed to delete file: {e}")
-
-        response.close = lambda old_close=response.close: (
-            old_close(),
-            delete_file(response)
-        )[0]  # Ensure original close() is called first
-
+        response['Content-Length'] = str(len(body))
+        response['Accept-Ranges'] = 'bytes'
+        response['Content-Disposition'] = content_disposition_header(True, document['filename'])
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
         return response
         
 # view for fetching analytics data
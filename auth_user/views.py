@@ -8,9 +8,12 @@ from django.contrib.auth.hashers import make_password
 from .serializers import UserSerializer
 from django.db.models import Q
 from api.utils import *
+from api.analysis import AnalysisContext
+from api import http_client
 from api.resources import technical_keywords
 from api.tasks import *
 from api.models import GeneralData
+from api.file_generator import OUTPUT_FORMATS
 from api.email_service import EmailService
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
@@ -203,41 +206,24 @@ class ResumeUploadView(generics.GenericAPIView):
                     'required_sections': None
                 }
             else:
-                result = extract_text(file_bytes, file.name)
+                result = extract_and_analyze(file_bytes, file.name)
                 if result['status'] == 0:
                     raise Exception(result['message'])
                 
                 text = result['text']
 
-                # parse resume text to get data
-                parsed_data = parse_resume(text)
-
-                # Calculate ATS optimization score with the parsed data
-                ats_score = parsed_data.get('ats_score', 0)  # calculate_ats_score(parsed_data)
-                kw = match_job_field(title, technical_keywords)
-                # kw_data = get_keyword_coverage(text, expected_kw)
-                kw_data = calculate_keyword_coverage(text, kw.get('expected_keywords', {}))
-                metadata = {
-                    "name": parsed_data.get('name', ''),
-                    "email": parsed_data.get('email', ''),
-                    "phone": parsed_data.get('phone', '')
-                }
-                sectional_input = {
-                    "metadata": metadata,
-                    "certifications": parsed_data.get('certificates', []),
-                    "experience_duration": parsed_data.get('experience', ''),
-                    "skills": parsed_data.get('skills', []),
-                    "education": parsed_data.get('education', []),
-                }
-                sectional_analysis_data = resume_sectional_analysis(sectional_input)
+                # every stage below reads the same parse results and token index
+                context = AnalysisContext(text, job_title=title, analysis=result['analysis'])
+                parsed_data = context.parsed_data
+                ats_score = context.ats_score
 
                 analytics = {}
                 analytics['ats_score'] = ats_score
                 analytics['parsed_data'] = parsed_data
                 analytics['suggestions'] = parsed_data.get('errors', [])  # get_suggestions_for_resume(parsed_data, kw_data)
-                analytics['score_comparison'] = compare_ats_score(ats_score)
-                analytics['keyword_coverage'] = kw_data
-                analytics['sectional_analysis'] = sectional_analysis_data
+                analytics['score_comparison'] = context.score_comparison
+                analytics['keyword_coverage'] = context.keyword_coverage
+                analytics['sectional_analysis'] = context.sectional_analysis
                 analytics['score_rating'] = get_resume_score_rating(ats_score)
 
                 mr = {}
@@ -494,6 +480,10 @@ class ResumeGeneratorView(generics.GenericAPIView):
         try:
             user = request.user
             resume_data = request.data
+            output_format = request.data.get('output_format', 'docx')
+            if output_format not in OUTPUT_FORMATS:
+                return Response({'status': 0, 'message': f"output_format must be one of: {', '.join(OUTPUT_FORMATS)}"},
+                                status=status.HTTP_400_BAD_REQUEST)
             filename = f"{user.username}_resume.docx"
             serialized_user = self.get_serializer(user).data
 
@@ -501,9 +491,9 @@ class ResumeGeneratorView(generics.GenericAPIView):
             if len(resume_data.get('experiences', [])) > 1 or len(resume_data.get('education', [])) > 1 or len(resume_data.get('certifications', [])) > 1 or len(resume_data.get('project', [])) > 1:
                 if serialized_user.get('account_type', 'basic') != 'premium' and user.resume_credits <= 0:
                     raise Exception('You must be a premium user to generate a multi-section resume. Please purchase resume credits or subscribe to our premium service.')
-                task = async_generate_premium_resume.delay(resume_data, filename, user.id)
+                task = async_generate_premium_resume.delay(resume_data, filename, user.id, output_format)
             else:
-                task = async_generate_resume.delay(resume_data, filename, user.id)
+                task = async_generate_resume.delay(resume_data, filename, user.id, output_format)
 
             return Response({
                 'status': 1,
@@ -525,6 +515,10 @@ class ResumeMatchAndGenerateView(generics.GenericAPIView):
         try:
             user = request.user
             resume_data = request.data
+            output_format = request.data.get('output_format', 'docx')
+            if output_format not in OUTPUT_FORMATS:
+                return Response({'status': 0, 'message': f"output_format must be one of: {', '.join(OUTPUT_FORMATS)}"},
+                                status=status.HTTP_400_BAD_REQUEST)
 
             # authenticate the user
             if not user.is_authenticated:
@@ -544,7 +538,7 @@ class ResumeMatchAndGenerateView(generics.GenericAPIView):
 
             # Generate the new resume
             filename = f"{user.username}_matched_resume.docx"
-            task = async_generate_matching_resume.delay(resume_data, filename, user.id)
+            task = async_generate_matching_resume.delay(resume_data, filename, user.id, output_format)
             print(f'task with id: {task.id} has been created for resume matching and generation.')
 
             return Response({
@@ -789,7 +783,8 @@ class PremiumServiceOrderVerificationView(generics.GenericAPIView):
             "Content-Type": "application/json"
         }
 
-        response = requests.get(url, headers=headers)
+        # pooled session with connect/read timeouts and retries (see api.http_client)
+        response = http_client.get(url, headers=headers)
 
         data = {
                     "status": False,